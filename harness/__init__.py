@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Shared test harness for the Level 2 data-driven suites
+Browser management, waits and reporting helpers used across features
+"""
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Failure artifact capture
+When a test fails, capture() grabs the evidence from the browser right away - screenshot,
+DOM, console log, current URL and the page's network requests - and hands it to a
+background writer thread, so compressing and writing the files overlaps the next test.
+Passing tests never call it and pay nothing.
+
+    except AssertionError as e:
+        artifacts.capture(self, self.driver, str(e), config.TEST_CONFIG)
+
+Files go to reports/<screenshot_dir>/<stamp>-<test id>/ (screenshot.png, dom.html.gz,
+console.json.gz, network.json.gz, meta.json); only the newest KEEP_CAPTURES folders
+are kept. ARTIFACTS=off disables capture, ARTIFACTS_DIR overrides the folder.
+"""
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+from harness import timing
+
+# ========== ARTIFACT SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENABLED_ENV = "ARTIFACTS"
+DIR_ENV = "ARTIFACTS_DIR"
+KEEP_ENV = "ARTIFACTS_KEEP"
+DEFAULT_SETTINGS = {"screenshot_on_failure": True, "screenshot_dir": "screenshots"}
+KEEP_CAPTURES = 100
+
+# Requests the page made, from the Resource Timing API (leaves Chrome's logs untouched)
+NETWORK_SCRIPT = """
+return performance.getEntriesByType('resource').map(function (e) {
+    return {url: e.name, type: e.initiatorType, duration: Math.round(e.duration),
+            bytes: e.transferSize, status: e.responseStatus};
+});
+"""
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def enabled(settings=None):
+    if (os.environ.get(ENABLED_ENV) or "on").lower() in ("off", "0", "false", "no"):
+        return False
+    return bool((settings or DEFAULT_SETTINGS).get("screenshot_on_failure", True))
+
+
+def artifact_root(settings=None):
+    directory = (settings or DEFAULT_SETTINGS).get("screenshot_dir") or DEFAULT_SETTINGS["screenshot_dir"]
+    return os.environ.get(DIR_ENV) or os.path.join(PROJECT_ROOT, "reports", directory)
+
+
+def _grab(read, default=None):
+    """One piece of evidence; a dead browser must not hide the original failure"""
+    try:
+        return read()
+    except (WebDriverException, ValueError):
+        return default
+
+
+def capture(test, driver, reason="", settings=None):
+    """Collect failure evidence now and queue it for writing
+
+    Returns the screenshot path, also set as test.screenshot_path and on the running
+    test's timing, where harness/results.py picks it up.
+    """
+    if driver is None or not enabled(settings):
+        return None
+    name = re.sub(r"[^\w.-]+", "_", test.id())[-120:]
+    folder = os.path.join(artifact_root(settings), f"{datetime.now():%Y%m%d-%H%M%S-%f}-{name}")
+    evidence = {
+        "meta": {
+            "test_id": test.id(),
+            "row_id": getattr(test, "current_test_id", None),
+            "reason": reason,
+            "url": _grab(lambda: driver.current_url),
+            "title": _grab(lambda: driver.title),
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "screenshot": _grab(driver.get_screenshot_as_png),
+        "dom": _grab(lambda: driver.page_source),
+        "console": _grab(lambda: driver.get_log("browser"), []),
+        "network": _grab(lambda: driver.execute_script(NETWORK_SCRIPT), []),
+    }
+    _start_writer()
+    _queue.put((folder, evidence))
+    test.screenshot_path = os.path.join(folder, "screenshot.png") if evidence["screenshot"] else None
+    running = timing.current()
+    if running is not None:
+        running.screenshot = test.screenshot_path
+    return test.screenshot_path
+
+
+def write(folder, evidence):
+    """Write one capture: PNG as is, text artifacts gzip-compressed"""
+    os.makedirs(folder, exist_ok=True)
+    if evidence["screenshot"]:
+        with open(os.path.join(folder, "screenshot.png"), "wb") as f:
+            f.write(evidence["screenshot"])
+    if evidence["dom"] is not None:
+        with gzip.open(os.path.join(folder, "dom.html.gz"), "wt", encoding="utf-8") as f:
+            f.write(evidence["dom"])
+    for key in ("console", "network"):
+        with gzip.open(os.path.join(folder, f"{key}.json.gz"), "wt", encoding="utf-8") as f:
+            json.dump(evidence[key], f, ensure_ascii=False)
+    with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(evidence["meta"], f, indent=2, ensure_ascii=False)
+
+
+def prune(root, keep=None):
+    """Delete all but the newest `keep` capture folders"""
+    keep = int(os.environ.get(KEEP_ENV, keep or KEEP_CAPTURES))
+    if not os.path.isdir(root):
+        return
+    folders = sorted(entry.path for entry in os.scandir(root) if entry.is_dir())
+    for folder in folders[:max(0, len(folders) - keep)]:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _write_loop():
+    while True:
+        item = _queue.get()
+        try:
+            if item is None:
+                return
+            folder, evidence = item
+            try:
+                write(folder, evidence)
+                prune(os.path.dirname(folder))
+            except OSError as e:
+                print(f"[artifacts] could not write {folder}: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="artifact-writer", daemon=True)
+            _writer.start()
+
+
+def flush():
+    """Wait until every queued capture is on disk"""
+    if _writer is not None:
+        _queue.join()
+
+
+atexit.register(flush)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Row batching on a shared precondition page
+Many rows start on the same page (the saucedemo login form, the change-password form,
+the search page's price filter) and most of them stay there - a rejected login or
+password leaves the form on screen. A PageBatch lets such rows run back to back on the
+loaded page: what the previous row left (messages, field values) is reset and the page
+is only loaded again when the last row left it. group() orders a CSV's rows so the ones
+that leave the page run last.
+
+    batch = batching.PageBatch(BASE_URL, LOCATORS['username_field'], reset=self.reset_form)
+    if not batch.reuse(self.driver):
+        self.driver.get(BASE_URL)
+
+ROW_BATCHING=off loads the page for every row (row order stays grouped).
+"""
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+from harness import elements
+from harness.locators import normalize
+from harness.snapshot import FIND_ALL_FUNCTION
+
+# ========== BATCHING SETTINGS ==========
+ENABLED_ENV = "ROW_BATCHING"
+
+# Empty inputs through the native setter plus an input event, so frameworks that keep
+# their own copy of the value (React on saucedemo) see the change - element.clear() doesn't
+CLEAR_FIELDS_SCRIPT = """
+var specs = arguments[0];
+""" + FIND_ALL_FUNCTION + """
+var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+specs.forEach(function (spec) {
+    findAll(spec[0], spec[1]).forEach(function (field) {
+        setter.call(field, '');
+        field.dispatchEvent(new Event('input', {bubbles: true}));
+        field.dispatchEvent(new Event('change', {bubbles: true}));
+    });
+});
+"""
+
+REMOVE_SCRIPT = """
+var specs = arguments[0];
+""" + FIND_ALL_FUNCTION + """
+specs.forEach(function (spec) {
+    findAll(spec[0], spec[1]).forEach(function (node) { node.remove(); });
+});
+"""
+
+
+def enabled(configured=True):
+    if (os.environ.get(ENABLED_ENV) or "on").lower() in ("off", "0", "false", "no"):
+        return False
+    return bool(configured)
+
+
+def group(rows, leaves_page):
+    """Rows that keep the page first, then the ones that leave it, each in CSV order"""
+    rows = list(rows)
+    return [row for row in rows if not leaves_page(row)] + [row for row in rows if leaves_page(row)]
+
+
+def clear_fields(driver, locators):
+    """Empty the given inputs in one round trip"""
+    driver.execute_script(CLEAR_FIELDS_SCRIPT, [list(normalize(locator)) for locator in locators])
+
+
+def remove_elements(driver, locators):
+    """Remove server-rendered leftovers (alerts, field errors) in one round trip
+
+    Not for framework-managed nodes - React pages must close their messages themselves.
+    """
+    driver.execute_script(REMOVE_SCRIPT, [list(normalize(locator)) for locator in locators])
+
+
+class PageBatch:
+    """Precondition page kept loaded across consecutive rows"""
+
+    def __init__(self, url, marker, reset=None, enabled=True):
+        self.url = url
+        self.marker = marker          # locator only the precondition page has
+        self.reset = reset            # reset(driver): clear what the previous row left
+        self.enabled = enabled
+        self.loads = 0
+        self.reuses = 0
+
+    def is_loaded(self, driver):
+        return driver.current_url.startswith(self.url) and elements.is_present(driver, self.marker)
+
+    def reuse(self, driver):
+        """True if the page is still loaded and was reset; False when the caller has to load it"""
+        if self.enabled:
+            try:
+                if self.is_loaded(driver):
+                    if self.reset is not None:
+                        self.reset(driver)
+                    self.reuses += 1
+                    return True
+            except WebDriverException:
+                pass  # a broken page is simply loaded again
+        self.loads += 1
+        return False
+
+    def summary(self):
+        rows = self.loads + self.reuses
+        return f"Page loads: {self.loads} for {rows} rows ({self.reuses} run on the already loaded page)"
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio WebDriver BiDi client for concurrent multi-tab checks
+Selenium's client blocks: one browser does one thing at a time. Over BiDi every
+command names the tab (browsing context) it is for, so one Chrome can load and read
+several tabs at once. Read-only suites fan their CSV rows out across the tabs:
+
+    async with await bidi.AsyncBrowser.start(profile) as chrome:
+        tabs = await chrome.tabs(bidi.tab_count(4))
+        outcomes = await bidi.fan_out(tabs, rows, check_row)
+
+The browser is started through harness/browser.py (same profiles) with the
+webSocketUrl capability. Selenium's own BiDi socket (websocket_connection) is a
+blocking client on a thread, so the socket here is a small RFC 6455 client on asyncio
+streams (ws:// and wss://, handshake checked against Sec-WebSocket-Accept) and nothing
+beyond selenium is needed. ASYNC_TABS overrides the tab count.
+"""
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import os
+import struct
+import time
+import urllib.parse
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from harness import browser, timeouts
+from harness.locators import normalize
+from harness.snapshot import SNAPSHOT_SCRIPT
+
+# ========== BIDI SETTINGS ==========
+TABS_ENV = "ASYNC_TABS"
+DEFAULT_TABS = 4
+COMMAND_TIMEOUT = 60
+POLL_INTERVAL = 0.1
+MAX_OBJECT_DEPTH = 6
+
+# WebSocket opcodes
+TEXT, CLOSE, PING, PONG = 0x1, 0x8, 0x9, 0xA
+HANDSHAKE_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"    # RFC 6455, section 1.3
+
+Outcome = collections.namedtuple("Outcome", "row value error duration")
+
+
+class BiDiError(WebDriverException):
+    """Error answer to a BiDi command, or a script exception"""
+
+
+def tab_count(configured=None):
+    """Tabs per browser: ASYNC_TABS env var, then the suite config, then DEFAULT_TABS"""
+    count = int(os.environ.get(TABS_ENV) or configured or DEFAULT_TABS)
+    if count < 1:
+        raise ValueError(f"Tab count must be at least 1, got {count}")
+    return count
+
+
+def _frame(opcode, payload):
+    """One client frame; clients must mask their payload"""
+    size = len(payload)
+    if size < 126:
+        header = struct.pack("!BB", 0x80 | opcode, 0x80 | size)
+    elif size < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, size)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, size)
+    mask = os.urandom(4)
+    if size:
+        key = int.from_bytes((mask * (size // 4 + 1))[:size], "big")
+        payload = (int.from_bytes(payload, "big") ^ key).to_bytes(size, "big")
+    return header + mask + payload
+
+
+def accept_key(key):
+    """Sec-WebSocket-Accept a server must answer to a Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1((key + HANDSHAKE_GUID).encode()).digest()).decode()
+
+
+def deserialize(value):
+    """BiDi remote value -> Python (primitives, arrays and plain objects)"""
+    kind = value.get("type")
+    if kind in ("undefined", "null"):
+        return None
+    if kind == "number" and isinstance(value["value"], str):
+        return float(value["value"].replace("Infinity", "inf"))
+    if kind in ("string", "number", "boolean", "bigint"):
+        return value["value"]
+    if kind in ("array", "set"):
+        return [deserialize(item) for item in value.get("value", [])]
+    if kind in ("object", "map"):
+        return {key if isinstance(key, str) else deserialize(key): deserialize(item)
+                for key, item in value.get("value", [])}
+    return value
+
+
+class Connection:
+    """One BiDi WebSocket; commands from any task are matched to answers by ID"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending = {}
+        self._closed = False
+        self._read_task = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def open(cls, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("ws", "wss"):
+            raise ValueError(f"Not a WebSocket URL: {url}")
+        secure = parts.scheme == "wss"
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, parts.port or (443 if secure else 80), ssl=True if secure else None)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        await writer.drain()
+        status = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if status.split(b" ")[1:2] != [b"101"]:
+            writer.close()
+            raise BiDiError(f"WebSocket handshake with {url} failed: {status.decode().strip()}")
+        if headers.get("sec-websocket-accept") != accept_key(key):
+            writer.close()
+            raise BiDiError(f"WebSocket handshake with {url} failed: wrong Sec-WebSocket-Accept")
+        return cls(reader, writer)
+
+    async def send(self, method, params=None):
+        """Send a command and wait for its result"""
+        if self._closed:
+            raise BiDiError(f"Connection closed, cannot send {method}")
+        self._next_id += 1
+        command_id = self._next_id
+        answer = self._pending[command_id] = asyncio.get_running_loop().create_future()
+        message = {"id": command_id, "method": method, "params": params or {}}
+        self._writer.write(_frame(TEXT, json.dumps(message).encode()))
+        await self._writer.drain()
+        try:
+            response = await asyncio.wait_for(answer, COMMAND_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"No answer to {method} after {COMMAND_TIMEOUT}s") from None
+        finally:
+            self._pending.pop(command_id, None)
+        if response.get("type") == "error":
+            raise BiDiError(f"{method}: {response.get('error')} - {response.get('message')}")
+        return response.get("result", {})
+
+    async def _read_message(self):
+        chunks = []
+        while True:
+            first, second = await self._reader.readexactly(2)
+            if second & 0x80:
+                raise BiDiError("Masked frame from the server")  # RFC 6455, section 5.1
+            size = second & 0x7F
+            if size == 126:
+                size = struct.unpack("!H", await self._reader.readexactly(2))[0]
+            elif size == 127:
+                size = struct.unpack("!Q", await self._reader.readexactly(8))[0]
+            payload = await self._reader.readexactly(size)
+            opcode = first & 0x0F
+            if opcode == CLOSE:
+                return None
+            if opcode == PING:
+                self._writer.write(_frame(PONG, payload))
+                continue
+            if opcode == PONG:
+                continue
+            chunks.append(payload)
+            if first & 0x80:
+                return b"".join(chunks).decode("utf-8")
+
+    async def _read_loop(self):
+        try:
+            while True:
+                message = await self._read_message()
+                if message is None:
+                    break
+                response = json.loads(message)
+                answer = self._pending.get(response.get("id"))
+                if answer is not None and not answer.done():
+                    answer.set_result(response)
+                # events are not subscribed to; anything else is ignored
+        except (asyncio.IncompleteReadError, ConnectionError, BiDiError):
+            pass
+        finally:
+            self._closed = True
+            for answer in self._pending.values():
+                if not answer.done():
+                    answer.set_exception(BiDiError("Connection closed by the browser"))
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                self._writer.write(_frame(CLOSE, b""))
+                await self._writer.drain()
+            except ConnectionError:
+                pass
+        self._read_task.cancel()
+        self._writer.close()
+
+
+class Tab:
+    """One browsing context; its commands run concurrently with other tabs'"""
+
+    def __init__(self, connection, context):
+        self.connection = connection
+        self.context = context
+
+    async def navigate(self, url, wait="complete"):
+        await self.connection.send("browsingContext.navigate",
+                                   {"context": self.context, "url": url, "wait": wait})
+
+    async def evaluate(self, expression):
+        """Value of a JavaScript expression (promises are awaited)"""
+        result = await self.connection.send("script.evaluate", {
+            "expression": expression,
+            "target": {"context": self.context},
+            "awaitPromise": True,
+            "resultOwnership": "none",
+            "serializationOptions": {"maxObjectDepth": MAX_OBJECT_DEPTH},
+        })
+        if result.get("type") == "exception":
+            raise BiDiError(f"Script error: {result['exceptionDetails'].get('text')}")
+        return deserialize(result["result"])
+
+    async def execute_script(self, script, *args):
+        """Selenium-style script body: `arguments` and `return` behave as in execute_script"""
+        return await self.evaluate("(function () {%s}).apply(null, %s)" % (script, json.dumps(list(args))))
+
+    async def url(self):
+        return await self.evaluate("location.href")
+
+    async def snapshot(self, locators, keys=None):
+        """harness/snapshot.take() for this tab"""
+        if keys is None:
+            keys = list(locators)
+        specs = {key: list(normalize(locators[key])) for key in keys}
+        return await self.execute_script(SNAPSHOT_SCRIPT, specs)
+
+    async def wait_for(self, locators, key, configured, wait_key=None):
+        """Poll until locator key is present, with the adaptive timeouts of wait_key"""
+        wait_key = wait_key or key
+        soft, hard = timeouts.limits(wait_key, configured)
+        started = time.perf_counter()
+        slow = False
+        while True:
+            if (await self.snapshot(locators, [key]))[key]["present"]:
+                timeouts.record(wait_key, time.perf_counter() - started)
+                return
+            elapsed = time.perf_counter() - started
+            if elapsed > hard:
+                raise timeouts.timed_out(wait_key, hard, configured)
+            if elapsed > soft and not slow:
+                timeouts.report_slow(wait_key, soft)
+                slow = True
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def close(self):
+        await self.connection.send("browsingContext.close", {"context": self.context})
+
+
+class AsyncBrowser:
+    """One Chrome from harness/browser.py, driven over BiDi"""
+
+    def __init__(self, driver, connection):
+        self.driver = driver
+        self.connection = connection
+
+    @classmethod
+    async def start(cls, profile=None):
+        driver = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: browser.create_driver(profile, bidi=True))
+        url = driver.caps.get("webSocketUrl")
+        if not isinstance(url, str):
+            driver.quit()
+            raise BiDiError("chromedriver returned no webSocketUrl - BiDi needs Chrome/chromedriver 115+")
+        try:
+            connection = await Connection.open(url)
+        except (OSError, BiDiError):
+            driver.quit()
+            raise
+        return cls(driver, connection)
+
+    async def tabs(self, count):
+        """count tabs: the window the browser opened with plus new ones"""
+        tree = await self.connection.send("browsingContext.getTree", {"maxDepth": 0})
+        tabs = [Tab(self.connection, context["context"]) for context in tree["contexts"][:count]]
+        while len(tabs) < count:
+            created = await self.connection.send("browsingContext.create", {"type": "tab"})
+            tabs.append(Tab(self.connection, created["context"]))
+        return tabs
+
+    async def close(self):
+        await self.connection.close()
+        await asyncio.get_running_loop().run_in_executor(None, self.driver.quit)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def fan_out(tabs, rows, check):
+    """await check(tab, row) for every row, each tab taking the next row when it is free
+
+    Returns one Outcome(row, value, error, duration) per row, in row order; a failing
+    row does not stop the others.
+    """
+    queue = asyncio.Queue()
+    for index, row in enumerate(rows):
+        queue.put_nowait((index, row))
+    outcomes = [None] * len(rows)
+
+    async def work(tab):
+        while not queue.empty():
+            index, row = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                value, error = await check(tab, row), None
+            except Exception as e:
+                value, error = None, e
+            outcomes[index] = Outcome(row, value, error, time.perf_counter() - started)
+
+    await asyncio.gather(*(work(tab) for tab in tabs))
+    return outcomes
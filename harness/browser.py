@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Central browser profile factory
+Every suite builds its Chrome from here; the profile is chosen in the suite config
+and can be overridden for a whole run with the BROWSER_PROFILE environment variable
+
+Profiles:
+    default - headed, maximized window, all Chrome popups disabled
+    perf    - headless, no images/fonts/media, GPU and background networking off,
+              fixed small viewport, eager page-load strategy (CI runs)
+
+Every driver starts with the default network block list (harness/network.py).
+network_log=True records network events for network.collect(); bidi=True also opens
+the WebDriver BiDi socket used by harness/bidi.py.
+"""
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from harness import driver_pool, network, timing
+
+# ========== PROFILE SETTINGS ==========
+PROFILE_ENV = "BROWSER_PROFILE"
+DEFAULT_PROFILE = "default"
+PROFILES = ("default", "perf")
+PERF_WINDOW_SIZE = (1280, 800)
+
+# Disable save-password, password leak, translate, notification and autofill popups
+QUIET_PREFS = {
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "profile.password_manager_leak_detection": False,
+    "profile.exit_type": "Normal",
+    "translate.enabled": False,
+    "profile.default_content_setting_values.notifications": 2,
+    "autofill.profile_enabled": False,
+    "autofill.credit_card_enabled": False,
+    "profile.default_content_setting_values.popups": 0,
+    "profile.default_content_setting_values.automatic_downloads": 1,
+}
+
+QUIET_ARGUMENTS = [
+    "--log-level=3",
+    "--disable-notifications",
+    "--disable-popup-blocking",
+    "--disable-infobars",
+    "--disable-extensions",
+    "--disable-plugins-discovery",
+]
+
+# Rendering work no assertion depends on
+PERF_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+
+PERF_ARGUMENTS = [
+    "--headless=new",
+    "--window-size=%d,%d" % PERF_WINDOW_SIZE,
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-remote-fonts",
+    "--autoplay-policy=user-gesture-required",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+
+def resolve_profile(profile=None):
+    """Profile to use: BROWSER_PROFILE env var, then the suite config, then default"""
+    profile = os.environ.get(PROFILE_ENV) or profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{profile}', expected one of {PROFILES}")
+    return profile
+
+
+def chrome_options(profile=None, bidi=False, network_log=False):
+    """Build ChromeOptions for a profile; bidi asks chromedriver for a BiDi WebSocket"""
+    profile = resolve_profile(profile)
+    options = webdriver.ChromeOptions()
+
+    # Disable automation infobar
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    prefs = dict(QUIET_PREFS)
+    arguments = list(QUIET_ARGUMENTS)
+    if profile == "perf":
+        prefs.update(PERF_PREFS)
+        arguments.extend(PERF_ARGUMENTS)
+        options.page_load_strategy = "eager"
+
+    options.add_experimental_option("prefs", prefs)
+    for argument in arguments:
+        options.add_argument(argument)
+    if bidi:
+        options.set_capability("webSocketUrl", True)
+    return network.logging_capabilities(options, network_log)
+
+
+def create_driver(profile=None, driver_path=None, bidi=False, network_log=False):
+    """Launch Chrome for a profile; driver_path is used only if that chromedriver exists"""
+    profile = resolve_profile(profile)
+    service = Service(driver_path) if driver_path and os.path.exists(driver_path) else None
+    driver = timing.instrument(webdriver.Chrome(options=chrome_options(profile, bidi, network_log), service=service))
+    network.apply(driver)
+    if profile != "perf":
+        driver.maximize_window()
+    return driver
+
+
+def get_pool(profile=None, size=None, network_log=False):
+    """Shared driver pool for a profile - one pool per profile (and network logging) per process"""
+    profile = resolve_profile(profile)
+    name = f"{profile}+network_log" if network_log else profile
+    return driver_pool.get_pool(name, lambda: create_driver(profile, network_log=network_log), size)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+OpenCart cart fixture
+Seeds and clears the cart by posting to checkout/cart/add and checkout/cart/remove
+from inside the browser, so the requests carry the browser's own session cookie
+
+Setup that took a dozen UI clicks per product becomes a few fetch() calls.
+"""
+import re
+import urllib.parse
+
+# ========== CART ROUTES ==========
+CART_PAGE_ROUTE = "index.php?route=checkout/cart"
+ADD_ROUTE = "index.php?route=checkout/cart/add"
+REMOVE_ROUTE = "index.php?route=checkout/cart/remove"
+
+# remove buttons on the cart page: onclick="cart.remove('123');"
+CART_KEY_PATTERN = re.compile(r"cart\.remove\(\s*'([^']+)'\s*\)")
+
+FETCH_SCRIPT = """
+var url = arguments[0], body = arguments[1], done = arguments[arguments.length - 1];
+var options = {credentials: 'same-origin', headers: {'X-Requested-With': 'XMLHttpRequest'}};
+if (body !== null) {
+    options.method = 'POST';
+    options.headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8';
+    options.body = body;
+}
+fetch(url, options)
+    .then(function (response) {
+        return response.text().then(function (text) {
+            done({status: response.status, body: text});
+        });
+    })
+    .catch(function (error) { done({status: 0, body: String(error)}); });
+"""
+
+
+def _fetch(driver, base_url, route, form=None):
+    """GET (form None) or form-POST a route from the page; returns (status, body)"""
+    # fetch() only shares the session cookie with pages of the same origin
+    if not driver.current_url.startswith(base_url):
+        driver.get(base_url)
+    body = None
+    if form is not None:
+        body = urllib.parse.urlencode(form)
+    result = driver.execute_async_script(FETCH_SCRIPT, base_url + route, body)
+    return result["status"], result["body"]
+
+
+def cart_keys(driver, base_url):
+    """Cart line keys currently in the cart, read from the cart page HTML"""
+    status, body = _fetch(driver, base_url, CART_PAGE_ROUTE)
+    if status != 200:
+        return None
+    return list(dict.fromkeys(CART_KEY_PATTERN.findall(body)))
+
+
+def clear(driver, base_url):
+    """Remove every cart line; False if the cart could not be read or a remove failed"""
+    keys = cart_keys(driver, base_url)
+    if keys is None:
+        return False
+    for key in keys:
+        status, _ = _fetch(driver, base_url, REMOVE_ROUTE, {"key": key})
+        if status != 200:
+            return False
+    return True
+
+
+def add(driver, base_url, product_id, quantity=1):
+    """Add a product; OpenCart answers with JSON holding 'success' or 'error'"""
+    status, body = _fetch(driver, base_url, ADD_ROUTE,
+                          {"product_id": product_id, "quantity": quantity})
+    return status == 200 and '"success"' in body
+
+
+def seed(driver, base_url, items):
+    """Make the cart hold exactly items [(product_id, quantity)]; False on any failure"""
+    if not clear(driver, base_url):
+        return False
+    return all(add(driver, base_url, product_id, quantity) for product_id, quantity in items)
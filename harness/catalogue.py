@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""
+Catalogue snapshot, price filter oracle and search oracle
+The price filter and search CSVs hard-code first prices/titles and pagination texts,
+which drift whenever the catalogue changes. Instead the product list is crawled once
+(name, price, listing position, tags from the product pages, optionally stock) into
+reports/catalogue.json, stored sorted by price. Two oracles answer from that snapshot
+without a page load:
+- PriceOracle: any (min, max) range by two binary searches plus a precomputed
+  range-minimum table over listing positions
+- SearchOracle: any search term through trigram indexes of the product names and tags
+
+    catalogue.PriceOracle.load().expected(0, 100)
+    # {'expected_price': '$98.00', 'expected_pagination': 'Showing 1 to 2 of 2 (1 Pages)', 'not_found': None}
+    catalogue.SearchOracle.load().expected('imac')
+    # {'results': 'iMac', 'not_found': None, 'count': 'Showing 1 to 8 of 8 (1 Pages)'}
+
+Usage (from the project root):
+    python -m harness.catalogue crawl [--stock] [--no-tags]
+    python -m harness.catalogue expect 0 100
+    python -m harness.catalogue check level-2/PriceFilter/price_filter_test_data.csv
+    python -m harness.catalogue rows -o level-2/PriceFilter/price_filter_generated_data.csv
+    python -m harness.catalogue search "apple cinema"
+    python -m harness.catalogue check-search level-2/Search/search_test_data1.csv
+    python -m harness.catalogue terms -o level-2/Search/search_oracle_terms.csv --count 300
+
+CATALOGUE_FILE overrides the snapshot path; the crawl goes through harness/replay.py.
+EXPECTATIONS=oracle makes the suites check their CSV rows against the oracles.
+"""
+import argparse
+import bisect
+import csv
+import json
+import math
+import os
+import random
+import re
+import string
+import sys
+import urllib.request
+from datetime import datetime
+from decimal import Decimal
+from html.parser import HTMLParser
+
+from harness import data_source, navigation, replay
+
+# ========== CATALOGUE SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILE_ENV = "CATALOGUE_FILE"
+DEFAULT_FILE = os.path.join(PROJECT_ROOT, "reports", "catalogue.json")
+SEARCH_URL = "https://ecommerce-playground.lambdatest.io/index.php?route=product/search"
+PRODUCT_URL = "https://ecommerce-playground.lambdatest.io/index.php?route=product/product"
+FILTER_PARAMS = ("mz_fp", "mz_tp")     # min / max price of the site's filter
+PRICE_RANGE = (0, 5000)                # what the filter accepts
+CRAWL_PRICE_RANGE = (0, 1000000)       # wide enough to list every product
+PAGE_SIZE = 15                         # products per result page on the site
+CRAWL_PAGE_SIZE = 100                  # products per page while crawling
+REQUEST_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (catalogue snapshot)"
+
+# ========== SEARCH ORACLE ==========
+EXPECTATIONS_ENV = "EXPECTATIONS"
+EXPECTATION_SOURCES = ("csv", "oracle")
+MAX_TERM_LENGTH = 40                   # longer terms are the site's own edge cases
+GRAM = 3
+NO_TAGS_NOTE = "The snapshot has no product tags - crawl again without --no-tags to judge search terms"
+
+# ========== EXPECTED TEXTS ==========
+PAGINATION_FORMAT = "Showing {first} to {last} of {total} ({pages} Pages)"
+PAGINATION_PATTERN = re.compile(r"Showing \d+ to \d+ of (\d+) \((\d+) Pages\)")
+NO_PRODUCT_MESSAGE = "There is no product that matches the search criteria."
+CSV_COLUMNS = ["test_case_id", "min_price", "max_price", "expected_price", "expected_pagination",
+               "not_found", "test_description", "tags"]
+
+
+class ProductListParser(HTMLParser):
+    """Name, product ID and shown price of every product tile of a result page"""
+
+    def __init__(self):
+        super().__init__()
+        self.products = []
+        self._field = None
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "div" and "product-layout" in classes:
+            self.products.append({"name": "", "product_id": None, "price": None})
+        elif not self.products:
+            return
+        elif tag == "h4":
+            self._in_title = True
+        elif tag == "a" and self._in_title and not self.products[-1]["name"]:
+            match = re.search(r"product_id=(\d+)", attrs.get("href") or "")
+            self.products[-1]["product_id"] = int(match.group(1)) if match else None
+            self._field = "name"
+        elif tag == "span" and "price-new" in classes and self.products[-1]["price"] is None:
+            self._field = "price"
+
+    def handle_endtag(self, tag):
+        if tag in ("a", "span"):
+            self._field = None
+        elif tag == "h4":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._field == "name":
+            self.products[-1]["name"] += data.strip()
+        elif self._field == "price" and data.strip():
+            self.products[-1]["price"] = data.strip()
+
+
+class ProductPageParser(HTMLParser):
+    """Non-empty text nodes of a product page, in document order, and its tag links"""
+
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+        self.tags = []
+        self._in_tag = False
+
+    def handle_starttag(self, tag, attrs):
+        href = dict(attrs).get("href") or ""
+        if tag == "a" and "route=product/search" in href and re.search(r"[?&]tag=", href):
+            self._in_tag = True
+            self.tags.append("")
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._in_tag:
+            self._in_tag = False
+            self.tags[-1] = " ".join(self.tags[-1].split())
+
+    def handle_data(self, data):
+        if data.strip():
+            self.texts.append(data.strip())
+        if self._in_tag:
+            self.tags[-1] += data
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        return response.read().decode(response.headers.get_content_charset() or "utf-8", "replace")
+
+
+def product_details(product_id, product_url=PRODUCT_URL):
+    """Stock status (text after 'Availability', or None) and tags of a product page"""
+    parser = ProductPageParser()
+    parser.feed(fetch(navigation.with_query(replay.rewrite_url(product_url), product_id=product_id)))
+    stock = None
+    for label, value in zip(parser.texts, parser.texts[1:]):
+        if label.rstrip(":").lower() == "availability":
+            stock = value
+            break
+    return {"stock": stock, "tags": [tag for tag in parser.tags if tag]}
+
+
+def crawl(search_url=SEARCH_URL, price_range=CRAWL_PRICE_RANGE, with_stock=False, with_tags=True):
+    """Every product the filter lists for the price range, in listing order"""
+    products = []
+    page = 1
+    while True:
+        url = navigation.with_query(
+            replay.rewrite_url(search_url), search="", limit=CRAWL_PAGE_SIZE, page=page,
+            **dict(zip(FILTER_PARAMS, price_range)))
+        html = fetch(url)
+        parser = ProductListParser()
+        parser.feed(html)
+        tiles = [tile for tile in parser.products if tile["price"]]
+        for tile in tiles:
+            tile["price"] = str(data_source.to_price(tile["price"]))
+            tile["position"] = len(products)
+            products.append(tile)
+        match = PAGINATION_PATTERN.search(html)
+        total = int(match.group(1)) if match else len(products)
+        print(f"[catalogue] page {page}: {len(tiles)} products ({len(products)}/{total})")
+        if not tiles or len(products) >= total:
+            break
+        page += 1
+    if with_stock or with_tags:
+        # one product page per product, for both
+        for n, product in enumerate(products, 1):
+            details = product_details(product["product_id"]) if product["product_id"] is not None else {}
+            if with_tags:
+                product["tags"] = details.get("tags", [])
+            if with_stock:
+                product["stock"] = details.get("stock")
+            if n % 25 == 0 or n == len(products):
+                print(f"[catalogue] product pages: {n}/{len(products)}")
+    return products
+
+
+def save(products, path=None, source=SEARCH_URL):
+    """Write the snapshot sorted by price (ties in listing order)"""
+    path = path or os.environ.get(FILE_ENV) or DEFAULT_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    snapshot = {
+        "source": source,
+        "taken_at": datetime.now().isoformat(timespec="seconds"),
+        "page_size": PAGE_SIZE,
+        "products": sorted(products, key=lambda p: (Decimal(p["price"]), p["position"])),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def format_price(price):
+    return f"${price:,.2f}"
+
+
+class PriceOracle:
+    """Expected price filter results of a catalogue snapshot"""
+
+    def __init__(self, products, page_size=PAGE_SIZE):
+        ordered = sorted(products, key=lambda p: (Decimal(str(p["price"])), p["position"]))
+        self.products = ordered
+        self.prices = [Decimal(str(p["price"])) for p in ordered]
+        self.page_size = page_size
+        # sparse table: _first[k][i] = index (into ordered) of the earliest-listed product in [i, i + 2**k)
+        level = list(range(len(ordered)))
+        self._first = [level]
+        span = 1
+        while span * 2 <= len(ordered):
+            level = [self._earlier(level[i], level[i + span]) for i in range(len(level) - span)]
+            self._first.append(level)
+            span *= 2
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.environ.get(FILE_ENV) or DEFAULT_FILE
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalogue snapshot at {path} - run 'python -m harness.catalogue crawl'")
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return cls(snapshot["products"], snapshot.get("page_size", PAGE_SIZE))
+
+    def _earlier(self, a, b):
+        return a if self.products[a]["position"] <= self.products[b]["position"] else b
+
+    def matches(self, low=None, high=None):
+        """[start, end) indices of the products priced low..high (both inclusive, None = open)"""
+        start = 0 if low is None else bisect.bisect_left(self.prices, Decimal(str(low)))
+        end = len(self.prices) if high is None else bisect.bisect_right(self.prices, Decimal(str(high)))
+        return start, max(start, end)
+
+    def first_listed(self, low=None, high=None):
+        """Product shown first on the filtered result page, or None"""
+        start, end = self.matches(low, high)
+        if start == end:
+            return None
+        k = (end - start).bit_length() - 1
+        return self.products[self._earlier(self._first[k][start], self._first[k][end - (1 << k)])]
+
+    def expected(self, low=None, high=None):
+        """CSV expectations of a filtered result page: price, pagination and message (None = N/A)"""
+        start, end = self.matches(low, high)
+        total = end - start
+        if not total:
+            return {"expected_price": None, "expected_pagination": None, "not_found": NO_PRODUCT_MESSAGE}
+        return {
+            "expected_price": format_price(Decimal(str(self.first_listed(low, high)["price"]))),
+            "expected_pagination": PAGINATION_FORMAT.format(
+                first=1, last=min(self.page_size, total), total=total,
+                pages=math.ceil(total / self.page_size)),
+            "not_found": None,
+        }
+
+    def boundary_ranges(self, price_range=PRICE_RANGE):
+        """Whole-number (min, max) pairs just inside and outside every distinct price"""
+        low_limit, high_limit = price_range
+        pairs = {(low_limit, low_limit), (low_limit, high_limit), (high_limit, high_limit)}
+        for price in sorted(set(self.prices)):
+            floor, ceil = math.floor(price), math.ceil(price)
+            pairs.update({
+                (floor, ceil),              # exactly this price
+                (low_limit, floor - 1),     # everything below it
+                (low_limit, ceil),          # up to and including it
+                (floor, high_limit),        # from it upwards
+                (ceil + 1, high_limit),     # everything above it
+            })
+        return sorted((low, high) for low, high in pairs
+                      if low_limit <= low <= high <= high_limit)
+
+
+def trigrams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def trigram_index(texts):
+    """trigram -> indices of the texts containing it"""
+    index = {}
+    for i, text in enumerate(texts):
+        for gram in trigrams(text):
+            index.setdefault(gram, set()).add(i)
+    return index
+
+
+class SearchOracle:
+    """Expected search results of a catalogue snapshot
+
+    Like the site, a product matches when its name contains every space-separated word of
+    the term, or its tags (joined by commas, as the site stores them) do - case-insensitive.
+    A snapshot crawled without tags can't tell tag matches apart, so can_judge() is False
+    for every term and the suites keep their CSV values.
+    """
+
+    def __init__(self, products, page_size=PAGE_SIZE):
+        self.products = sorted(products, key=lambda p: p["position"])
+        self.names = [p["name"].lower() for p in self.products]
+        self.tags = [",".join(p.get("tags") or []).lower() for p in self.products]
+        self.knows_tags = all("tags" in p for p in self.products)
+        self.page_size = page_size
+        self.index = trigram_index(self.names)
+        self.tag_index = trigram_index(self.tags)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.environ.get(FILE_ENV) or DEFAULT_FILE
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalogue snapshot at {path} - run 'python -m harness.catalogue crawl'")
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return cls(snapshot["products"], snapshot.get("page_size", PAGE_SIZE))
+
+    def can_judge(self, term):
+        """True when the oracle's answer for term can be trusted (see is_oracle_term)"""
+        return self.knows_tags and is_oracle_term(term)
+
+    @staticmethod
+    def _word_matches(word, texts, index):
+        grams = trigrams(word)
+        if not grams:
+            # shorter than a trigram - nothing to look up
+            return {i for i, text in enumerate(texts) if word in text}
+        postings = sorted((index.get(gram, set()) for gram in grams), key=len)
+        candidates = set.intersection(*postings)
+        # shared trigrams don't guarantee the substring - confirm each candidate
+        return {i for i in candidates if word in texts[i]}
+
+    @classmethod
+    def _all_words(cls, words, texts, index):
+        found = cls._word_matches(words[0], texts, index)
+        for word in words[1:]:
+            if not found:
+                break
+            found &= cls._word_matches(word, texts, index)
+        return found
+
+    def matches(self, term):
+        """Products whose name or tags contain every word of term, in listing order"""
+        words = sorted(set((term or "").lower().split()), key=len, reverse=True)
+        if not words:
+            return []
+        found = self._all_words(words, self.names, self.index) | self._all_words(words, self.tags, self.tag_index)
+        return [self.products[i] for i in sorted(found)]
+
+    def expected(self, term):
+        """First title, 'not found' message and pagination of a search (None = N/A)"""
+        found = self.matches(term)
+        if not found:
+            return {"results": None, "not_found": NO_PRODUCT_MESSAGE, "count": None}
+        return {
+            "results": found[0]["name"],
+            "not_found": None,
+            "count": PAGINATION_FORMAT.format(
+                first=1, last=min(self.page_size, len(found)), total=len(found),
+                pages=math.ceil(len(found) / self.page_size)),
+        }
+
+    def fuzz_terms(self, count, seed=0):
+        """Up to count distinct terms the oracle can judge: words, fragments, word pairs and misses"""
+        rng = random.Random(seed)
+        words = sorted({word for name in self.names for word in name.split() if is_oracle_term(word)})
+        terms = set()
+        attempts = 0
+        while words and len(terms) < count and attempts < count * 20:
+            attempts += 1
+            word = rng.choice(words)
+            kind = rng.randrange(5)
+            if kind == 0:
+                term = word
+            elif kind == 1 and len(word) > GRAM:
+                start = rng.randrange(len(word) - GRAM + 1)
+                term = word[start:rng.randint(start + GRAM, len(word))]
+            elif kind == 2:
+                name = rng.choice(self.names).split()
+                term = " ".join(rng.sample(name, min(2, len(name))))
+            elif kind == 3:
+                term = word.upper() if rng.random() < 0.5 else word.capitalize()
+            else:
+                term = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8)))
+            if is_oracle_term(term):
+                terms.add(term)
+        return sorted(terms)
+
+
+def expectations(configured=None):
+    """Where row expectations come from: EXPECTATIONS env var, then the suite config, then csv"""
+    value = (os.environ.get(EXPECTATIONS_ENV) or configured or "csv").lower()
+    if value not in EXPECTATION_SOURCES:
+        raise ValueError(f"Unknown expectation source '{value}', expected one of {EXPECTATION_SOURCES}")
+    return value
+
+
+def is_oracle_term(term):
+    """Terms the search oracle can judge: not blank, not over-long, some letter or digit"""
+    term = (term or "").strip()
+    return bool(term) and len(term) <= MAX_TERM_LENGTH and any(c.isalnum() for c in term)
+
+
+def check_search(oracle, path):
+    """Rows of a search CSV (one or two terms) whose expectations differ from the oracle's"""
+    drift = []
+    for row in data_source.load(path, id_column="TC_ID"):
+        suffixes = ["1", "2"] if "Search_Term1" in row else [""]
+        diffs = {}
+        for n in suffixes:
+            term = row[f"Search_Term{n}"]
+            if not oracle.can_judge(term):
+                continue
+            for key, value in oracle.expected(term).items():
+                column = {"results": f"Expected_Results{n}", "not_found": f"Expected_NotFound{n}",
+                          "count": f"Expected_Count{n}"}[key]
+                if column not in row:
+                    continue
+                if key == "results" and row[column] is not None and value is not None:
+                    # the suite checks that the first title contains the expected text
+                    if row[column].lower() not in value.lower():
+                        diffs[column] = (row[column], value)
+                elif row[column] != value:
+                    diffs[column] = (row[column], value)
+        if diffs:
+            drift.append((row["TC_ID"], diffs))
+    return drift
+
+
+def write_terms(oracle, path, count, seed=0, id_prefix="SFZ"):
+    """CSV of fuzz terms for SearchLevel2; their expectations come from the oracle at run time"""
+    terms = oracle.fuzz_terms(count, seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["TC_ID", "Search_Term", "Description", "tags"])
+        writer.writeheader()
+        for n, term in enumerate(terms, 1):
+            writer.writerow({"TC_ID": f"{id_prefix}-{n:04d}", "Search_Term": term,
+                             "Description": f"Oracle fuzz term '{term}'", "tags": "fuzz"})
+    return len(terms)
+
+
+def is_oracle_row(row):
+    """Rows the oracle can judge: whole-number bounds in PRICE_RANGE, min <= max"""
+    values = [row.get("min_price") or "", row.get("max_price") or ""]
+    if not all(value.isdigit() for value in values if value):
+        return False
+    numbers = [int(value) for value in values if value]
+    if not all(PRICE_RANGE[0] <= number <= PRICE_RANGE[1] for number in numbers):
+        return False
+    return len(numbers) < 2 or numbers[0] <= numbers[1]
+
+
+def check(oracle, path):
+    """Rows of a price filter CSV whose expectations differ from the oracle's"""
+    drift = []
+    for row in data_source.load(path, id_column="test_case_id", types={"expected_price": "price"}):
+        if not is_oracle_row(row):
+            continue
+        expected = oracle.expected(row["min_price"] or None, row["max_price"] or None)
+        actual = dict(row, expected_price=format_price(row["expected_price"])
+                      if row["expected_price"] is not None else None)
+        diffs = {key: (actual[key], value) for key, value in expected.items() if actual[key] != value}
+        if diffs:
+            drift.append((row["test_case_id"], diffs))
+    return drift
+
+
+def write_rows(oracle, path, id_prefix="PFG", limit=None):
+    """CSV of oracle-computed boundary rows in the price_filter_test_data.csv format"""
+    ranges = oracle.boundary_ranges()[:limit]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for n, (low, high) in enumerate(ranges, 1):
+            expected = oracle.expected(low, high)
+            writer.writerow(dict(
+                {key: "N/A" if value is None else value for key, value in expected.items()},
+                test_case_id=f"{id_prefix}-{n:04d}", min_price=low, max_price=high,
+                test_description=f"Generated boundary row: min price={low}, max price={high}",
+                tags="generated"))
+    return len(ranges)
+
+
+def print_drift(drift):
+    for row_id, diffs in drift:
+        for key, (actual, expected) in diffs.items():
+            print(f"{row_id}: {key} is {actual!r}, catalogue says {expected!r}")
+    print(f"{len(drift)} drifted row(s)")
+    return 1 if drift else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalogue snapshot, price filter and search oracles")
+    parser.add_argument("--file", help=f"snapshot path (default: {DEFAULT_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    crawl_cmd = commands.add_parser("crawl", help="crawl the product list into the snapshot")
+    crawl_cmd.add_argument("--url", default=SEARCH_URL)
+    crawl_cmd.add_argument("--stock", action="store_true", help="also read the stock status from every product page")
+    crawl_cmd.add_argument("--no-tags", dest="tags", action="store_false",
+                           help="don't open the product pages for their tags (the search oracle then can't judge)")
+    expect_cmd = commands.add_parser("expect", help="expected results of one price range")
+    expect_cmd.add_argument("min_price")
+    expect_cmd.add_argument("max_price")
+    check_cmd = commands.add_parser("check", help="list price filter CSV rows whose expectations drifted")
+    check_cmd.add_argument("csv")
+    rows_cmd = commands.add_parser("rows", help="write oracle-computed price filter boundary rows")
+    rows_cmd.add_argument("-o", "--output", required=True)
+    rows_cmd.add_argument("--limit", type=int)
+    rows_cmd.add_argument("--prefix", default="PFG")
+    search_cmd = commands.add_parser("search", help="expected results of one search term")
+    search_cmd.add_argument("term")
+    check_search_cmd = commands.add_parser("check-search", help="list search CSV rows whose expectations drifted")
+    check_search_cmd.add_argument("csv")
+    terms_cmd = commands.add_parser("terms", help="write fuzz search terms")
+    terms_cmd.add_argument("-o", "--output", required=True)
+    terms_cmd.add_argument("--count", type=int, default=300)
+    terms_cmd.add_argument("--seed", type=int, default=0)
+    terms_cmd.add_argument("--prefix", default="SFZ")
+    args = parser.parse_args(argv)
+
+    if args.command == "crawl":
+        products = crawl(args.url, with_stock=args.stock, with_tags=args.tags)
+        print(f"{len(products)} products -> {save(products, args.file, args.url)}")
+    elif args.command == "expect":
+        print(json.dumps(PriceOracle.load(args.file).expected(args.min_price or None, args.max_price or None),
+                         indent=2))
+    elif args.command == "check":
+        return print_drift(check(PriceOracle.load(args.file), args.csv))
+    elif args.command == "rows":
+        written = write_rows(PriceOracle.load(args.file), args.output, args.prefix, args.limit)
+        print(f"{written} rows -> {args.output}")
+    elif args.command == "search":
+        oracle = SearchOracle.load(args.file)
+        print(json.dumps(oracle.expected(args.term), indent=2, ensure_ascii=False))
+        if not oracle.knows_tags:
+            print(NO_TAGS_NOTE)
+    elif args.command == "check-search":
+        oracle = SearchOracle.load(args.file)
+        if not oracle.knows_tags:
+            print(NO_TAGS_NOTE)
+            return 1
+        return print_drift(check_search(oracle, args.csv))
+    else:
+        written = write_terms(SearchOracle.load(args.file), args.output, args.count, args.seed, args.prefix)
+        print(f"{written} terms -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
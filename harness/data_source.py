@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Shared CSV test-data layer
+Each CSV is parsed once per process (cached by path + modification time), its columns
+are coerced per a declared schema and rows can be filtered by ID or tag
+
+    rows = data_source.load(path, id_column='tc_id',
+                            types={'initial_items': 'int', 'expected_price': 'price'})
+
+Every row is a Row (a dict) whose __name__ is its ID, so ddt names the generated test
+after the row, e.g. test_login_01_LOGIN_BVA_001.
+"""
+import csv
+import fnmatch
+import os
+import re
+import threading
+from decimal import Decimal, InvalidOperation
+
+# ========== DATA SETTINGS ==========
+NA_VALUES = ("N/A",)            # cells meaning "not applicable" -> None
+IDS_ENV = "TEST_IDS"            # comma separated IDs or globs, e.g. TC003*,LOGIN-BVA-001
+TAGS_ENV = "TEST_TAGS"          # comma separated tags (optional 'tags' CSV column)
+TAGS_COLUMN = "tags"
+TAG_SEPARATOR = re.compile(r"[;\s]+")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def to_int(value):
+    return int(value)
+
+
+def to_int_or_text(value):
+    """int when the cell is a number; deliberate invalid inputs (blank, 'abc') stay text"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def to_price(value):
+    """'$2,000.00' -> Decimal('2000.00')"""
+    try:
+        return Decimal(re.sub(r"[^\d.\-]", "", value))
+    except InvalidOperation:
+        raise ValueError(f"not a price: {value!r}") from None
+
+
+TYPES = {
+    "text": str,
+    "int": to_int,
+    "int_or_text": to_int_or_text,
+    "price": to_price,
+}
+
+
+class Row(dict):
+    """One CSV row; __name__ is the row ID and __doc__ its description"""
+
+    def __init__(self, values, row_id, description=None, tags=()):
+        super().__init__(values)
+        self.__name__ = row_id
+        self.__doc__ = description or None
+        self.tags = frozenset(tags)
+
+    @property
+    def id(self):
+        return self.__name__
+
+
+def tag(*names):
+    """Tag a test method for the selector, e.g. @data_source.tag('smoke', 'ui')"""
+    def decorate(func):
+        func.tags = frozenset(names)
+        return func
+    return decorate
+
+
+def _split(value):
+    return tuple(part.strip() for part in value.split(",") if part.strip()) if value else ()
+
+
+def _matches(row_id, tags, ids, wanted_tags):
+    if ids and not any(fnmatch.fnmatchcase(row_id, pattern) for pattern in ids):
+        return False
+    if wanted_tags and not tags.intersection(wanted_tags):
+        return False
+    return True
+
+
+def _parse(path, id_column, types, description_column, ids, wanted_tags):
+    converters = {column: TYPES[type_name] for column, type_name in types}
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        for raw in reader:
+            row_id = raw[id_column]
+            tags = frozenset(t for t in TAG_SEPARATOR.split(raw.get(TAGS_COLUMN) or "") if t)
+            # filter on the raw cells so skipped rows are never coerced
+            if not _matches(row_id, tags, ids, wanted_tags):
+                continue
+            values = {}
+            for column, cell in raw.items():
+                if cell in NA_VALUES or cell is None:
+                    values[column] = None
+                elif column in converters:
+                    try:
+                        values[column] = converters[column](cell)
+                    except ValueError as e:
+                        raise ValueError(
+                            f"{path}:{reader.line_num}: column '{column}': {e}"
+                        ) from None
+                else:
+                    values[column] = cell
+            description = raw.get(description_column) if description_column else None
+            rows.append(Row(values, row_id, description, tags))
+    return rows
+
+
+def load(path, id_column, types=None, description_column=None, ids=None, tags=None, optional=False):
+    """Typed rows of a CSV, cached per process until the file changes
+
+    types maps column -> 'text' | 'int' | 'int_or_text' | 'price'; "N/A" cells are None.
+    ids/tags default to the TEST_IDS/TEST_TAGS environment variables.
+    optional: a missing file gives no rows instead of an error (generated CSVs).
+    """
+    path = os.path.abspath(path)
+    if optional and not os.path.exists(path):
+        return []
+    types = tuple(sorted((types or {}).items()))
+    unknown = [type_name for _, type_name in types if type_name not in TYPES]
+    if unknown:
+        raise ValueError(f"Unknown column types {unknown}, expected one of {sorted(TYPES)}")
+    ids = tuple(ids) if ids is not None else _split(os.environ.get(IDS_ENV))
+    tags = frozenset(tags) if tags is not None else frozenset(_split(os.environ.get(TAGS_ENV)))
+
+    key = (path, os.stat(path).st_mtime_ns, id_column, types, description_column, ids, tags)
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = _parse(path, id_column, types, description_column, ids, tags)
+        return list(_cache[key])
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Shared WebDriver pool
+Hands pre-launched, state-reset browsers to tests instead of starting Chrome per test
+"""
+import atexit
+import os
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# ========== POOL SETTINGS ==========
+DEFAULT_POOL_SIZE = 1
+POOL_SIZE_ENV = "DRIVER_POOL_SIZE"
+SCOPE_ENV = "DRIVER_SCOPE"
+SCOPES = ("test", "class")   # browser per test (from the pool) or held by the class for all rows
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DriverPool:
+    """Fixed-size pool of reusable browser sessions"""
+
+    def __init__(self, factory, size=DEFAULT_POOL_SIZE):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm_up(self, count=None):
+        """Pre-launch browsers so the first tests don't pay the cold start"""
+        count = self.size if count is None else min(count, self.size)
+        while self._created < count:
+            driver = self._launch()
+            if driver is None:
+                break
+            self._idle.put(driver)
+
+    def acquire(self, timeout=None):
+        """Take a healthy browser from the pool, launching or replacing one if needed"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._launch()
+                if driver is None:
+                    driver = self._idle.get(timeout=timeout)
+
+            if self.is_alive(driver):
+                return driver
+            # crashed session - drop it and let the next loop launch a replacement
+            self._discard(driver)
+
+    def release(self, driver):
+        """Reset browser state and return the browser to the pool"""
+        if self._closed:
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def reuse(self, driver):
+        """Fast reset of a browser a class keeps across rows; a fresh one if it has died"""
+        if driver is not None:
+            try:
+                if self.is_alive(driver):
+                    self.reset(driver, park=False)
+                    return driver
+            except WebDriverException:
+                pass
+            self._discard(driver)
+        return self.acquire()
+
+    def reset(self, driver, park=True):
+        """Close extra tabs, clear cookies and web storage, park on a blank page"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # storage is per origin, so clear it while still on the page the test left
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except WebDriverException:
+            pass
+
+        # CDP clears cookies for every domain; delete_all_cookies only covers the current one
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except (AttributeError, WebDriverException):
+            driver.delete_all_cookies()
+
+        # the next row of a class-scoped browser navigates anyway
+        if park:
+            driver.get("about:blank")
+
+    def is_alive(self, driver):
+        """Health check - a crashed or closed session raises on any command"""
+        try:
+            return bool(driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def close(self):
+        """Quit every idle browser; busy ones are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _launch(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+
+def resolve_scope(scope=None):
+    """Driver scope: DRIVER_SCOPE env var, then the suite config, then per test"""
+    scope = os.environ.get(SCOPE_ENV) or scope or "test"
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown driver scope '{scope}', expected one of {SCOPES}")
+    return scope
+
+
+def get_pool(name="default", factory=None, size=None):
+    """Return the process-wide pool for a browser profile, creating it on first use"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            if size is None:
+                size = DEFAULT_POOL_SIZE
+            size = int(os.environ.get(POOL_SIZE_ENV, size))
+            pool = DriverPool(factory or webdriver.Chrome, size)
+            _pools[name] = pool
+        return pool
+
+
+@atexit.register
+def close_all():
+    """Quit every pooled browser when the test process exits"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Optional element lookups
+Decide presence instantly instead of burning the implicit wait on absent elements
+"""
+from harness.waits import no_implicit_wait
+
+
+def find_optional(driver, locator):
+    """Return the first element matching locator, or None without waiting"""
+    with no_implicit_wait(driver):
+        elements = driver.find_elements(*locator)
+    return elements[0] if elements else None
+
+
+def is_present(driver, locator):
+    """True if at least one element matches locator right now"""
+    return find_optional(driver, locator) is not None
+
+
+def optional_text(driver, locator):
+    """Text of the first matching element, or None if it is absent"""
+    element = find_optional(driver, locator)
+    return None if element is None else element.text
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Historical test results
+Every runner run stores each test's status and duration in a local SQLite file; the
+runner reads it back to schedule the slowest tests first and, on request, last
+run's failures first. The same file keeps the observed explicit-wait latencies
+that harness/timeouts.py derives its timeouts from.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+# ========== HISTORY SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_ENV = "TEST_HISTORY_DB"
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "reports", "test-history.sqlite")
+HISTORY_WINDOW = 5          # runs averaged per test
+FAILED_STATUSES = ("failed", "errors")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    workers INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results(test_id, run_id);
+CREATE TABLE IF NOT EXISTS waits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    wait_key TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS waits_by_key ON waits(wait_key, id);
+"""
+
+
+def db_path():
+    return os.environ.get(DB_ENV, DEFAULT_DB_PATH)
+
+
+def connect(path=None):
+    """Open (and create if needed) the history database"""
+    path = path or db_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def record_run(records, workers, path=None):
+    """Store the runner's per-test records as one run"""
+    with closing(connect(path)) as connection, connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (started_at, workers) VALUES (?, ?)",
+            (datetime.now().isoformat(timespec="seconds"), workers),
+        )
+        connection.executemany(
+            "INSERT INTO results (run_id, test_id, status, duration) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, r["test_id"], r["status"], r["duration"]) for r in records],
+        )
+
+
+def durations(path=None, window=HISTORY_WINDOW):
+    """{test_id: mean duration of its last `window` executed runs}"""
+    if not os.path.exists(path or db_path()):
+        return {}
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            """
+            SELECT test_id, AVG(duration) FROM (
+                SELECT test_id, duration,
+                       ROW_NUMBER() OVER (PARTITION BY test_id ORDER BY run_id DESC) AS n
+                FROM results WHERE status != 'skipped'
+            ) WHERE n <= ? GROUP BY test_id
+            """,
+            (window,),
+        ).fetchall()
+    return dict(rows)
+
+
+def last_failed(path=None):
+    """IDs of the tests whose most recent result was a failure or an error"""
+    if not os.path.exists(path or db_path()):
+        return set()
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            """
+            SELECT r.test_id FROM results r
+            WHERE r.run_id = (SELECT MAX(run_id) FROM results WHERE test_id = r.test_id)
+              AND r.status IN (?, ?)
+            """,
+            FAILED_STATUSES,
+        ).fetchall()
+    return {test_id for (test_id,) in rows}
+
+
+def record_waits(samples, path=None):
+    """Store (wait_key, seconds) observations"""
+    with closing(connect(path)) as connection, connection:
+        connection.executemany("INSERT INTO waits (wait_key, seconds) VALUES (?, ?)", samples)
+
+
+def wait_samples(window, path=None):
+    """{wait_key: its latest `window` observed latencies}"""
+    if not os.path.exists(path or db_path()):
+        return {}
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            """
+            SELECT wait_key, seconds FROM (
+                SELECT wait_key, seconds,
+                       ROW_NUMBER() OVER (PARTITION BY wait_key ORDER BY id DESC) AS n
+                FROM waits
+            ) WHERE n <= ?
+            """,
+            (window,),
+        ).fetchall()
+    samples = {}
+    for key, seconds in rows:
+        samples.setdefault(key, []).append(seconds)
+    return samples
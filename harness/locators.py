@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Locator registry
+Every locator format used by the configs is normalized once into a (By, value) tuple:
+
+    (By.XPATH, "...")                  search_config
+    ("xpath", "..."), ("css", "...")   LOCATORS in the login/logout/price filter configs
+    {"by": "xpath", "value": "..."}    "elements" of the JSON configs
+
+Values containing {{name}} placeholders are compiled into templates and filled with
+registry.get(key, name=...). Lookups are plain dict reads.
+"""
+import re
+import threading
+
+from selenium.webdriver.common.by import By
+
+# config locator types -> Selenium By values (By values themselves are accepted too)
+BY_TYPES = {
+    "xpath": By.XPATH,
+    "id": By.ID,
+    "name": By.NAME,
+    "css": By.CSS_SELECTOR,
+    "css_selector": By.CSS_SELECTOR,
+    "class_name": By.CLASS_NAME,
+    "tag_name": By.TAG_NAME,
+    "link_text": By.LINK_TEXT,
+    "partial_link_text": By.PARTIAL_LINK_TEXT,
+}
+BY_TYPES.update({value: value for value in list(BY_TYPES.values())})
+
+TEMPLATE_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def normalize(locator):
+    """Turn a (by, value) tuple or a {"by", "value"} config entry into a (By, value) tuple"""
+    if isinstance(locator, dict):
+        by_type, value = locator["by"], locator["value"]
+    else:
+        by_type, value = locator
+    try:
+        return BY_TYPES[by_type.lower()], value
+    except KeyError:
+        raise ValueError(f"Unknown locator type '{by_type}' for '{value}'") from None
+
+
+class Template:
+    """Locator value with {{name}} placeholders, split once into literal and field parts"""
+
+    def __init__(self, by_type, value):
+        self.by_type = by_type
+        self.parts = TEMPLATE_PATTERN.split(value)    # literal, field, literal, ...
+        self.fields = frozenset(self.parts[1::2])
+
+    def fill(self, params):
+        missing = self.fields - set(params)
+        if missing:
+            raise KeyError(f"missing template values {sorted(missing)}")
+        parts = list(self.parts)
+        parts[1::2] = [str(params[field]) for field in parts[1::2]]
+        return self.by_type, "".join(parts)
+
+
+class Registry:
+    """Normalized locators of one config"""
+
+    def __init__(self, name, locators):
+        self.name = name
+        self._locators = {}
+        self._templates = {}
+        for key, locator in locators.items():
+            try:
+                by_type, value = normalize(locator)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{name}: bad locator '{key}': {e}") from None
+            if TEMPLATE_PATTERN.search(value):
+                self._templates[key] = Template(by_type, value)
+            else:
+                self._locators[key] = (by_type, value)
+
+    def __getitem__(self, key):
+        try:
+            return self._locators[key]
+        except KeyError:
+            if key in self._templates:
+                raise KeyError(f"{self.name}: '{key}' is a template, use get('{key}', ...)") from None
+            raise KeyError(f"{self.name}: no locator '{key}'") from None
+
+    def __contains__(self, key):
+        return key in self._locators or key in self._templates
+
+    def __iter__(self):
+        return iter(self._locators)
+
+    def get(self, key, **params):
+        """(By, value) for a key; templates are filled from params"""
+        if key in self._templates:
+            try:
+                return self._templates[key].fill(params)
+            except KeyError as e:
+                raise KeyError(f"{self.name}: '{key}' {e.args[0]}") from None
+        return self[key]
+
+    def require(self, keys):
+        """Fail fast if the suite needs locators its config doesn't define"""
+        missing = [key for key in keys if key not in self]
+        if missing:
+            raise KeyError(f"{self.name}: missing locators {missing}")
+        return self
+
+
+def register(name, locators, required=()):
+    """Build (once per process) and validate the registry of a config"""
+    with _registries_lock:
+        if name not in _registries:
+            _registries[name] = Registry(name, locators)
+        registry = _registries[name]
+    return registry.require(required)
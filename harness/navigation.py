@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Navigation modes for the search-based suites
+    ui        - open the home page and type/click like a user (default)
+    deep_link - open the result URL (search term, filter parameters) directly,
+                saving the home page load and the form round trips
+The suite config picks the mode; NAVIGATION_MODE overrides it for a whole run.
+The UI path stays covered by each suite's smoke test (tag SMOKE).
+"""
+import os
+from urllib.parse import urlencode
+
+# ========== NAVIGATION SETTINGS ==========
+MODE_ENV = "NAVIGATION_MODE"
+MODES = ("ui", "deep_link")
+
+
+def mode(configured=None):
+    """Mode to use: NAVIGATION_MODE env var, then the suite config, then ui"""
+    value = (os.environ.get(MODE_ENV) or configured or "ui").lower()
+    if value not in MODES:
+        raise ValueError(f"Unknown navigation mode '{value}', expected one of {MODES}")
+    return value
+
+
+def with_query(url, **params):
+    """url plus query parameters; None values are left out"""
+    query = urlencode({key: value for key, value in params.items() if value is not None})
+    if not query:
+        return url
+    return url + ("&" if "?" in url else "?") + query
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Network request blocking through Chrome DevTools
+Every driver from browser.create_driver() blocks the DEFAULT_BLOCKING categories with
+Network.setBlockedURLs; a suite can switch to its own list on each acquired driver:
+
+    NETWORK_BLOCKING = {
+        "block": ["images", "fonts", "analytics", "ads"],   # categories or URL patterns
+        "allow": ["*fonts.googleapis.com*"],                 # taken out of the block list
+    }
+    network.apply(driver, config.NETWORK_BLOCKING)
+
+Chrome's block list has no exceptions, so "allow" can only take categories and patterns
+back out of the block list; an allow entry that is not in it raises ValueError instead
+of silently whitelisting nothing.
+
+Drivers created with network_log=True (browser.get_pool/create_driver) record Chrome's
+performance log; collect(driver) reads blocked and transferred requests back from it and
+a network-<stamp>-<pid>.json report is written when the process exits. Other drivers
+don't buffer network events at all.
+Set NETWORK_BLOCKING=off to load every resource (e.g. to measure a baseline).
+"""
+import atexit
+import fnmatch
+import json
+import os
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+# ========== BLOCKING SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCKING_ENV = "NETWORK_BLOCKING"
+REPORT_DIR_ENV = "TIMING_REPORT_DIR"
+DEFAULT_REPORT_DIR = os.path.join(PROJECT_ROOT, "reports")
+SIZES_FILE = "network-sizes.json"   # response sizes seen unblocked, to estimate bytes saved
+
+
+def _extensions(*extensions):
+    return [f"*.{ext}{suffix}" for ext in extensions for suffix in ("", "?*")]
+
+
+CATEGORIES = {
+    "images": _extensions("png", "jpg", "jpeg", "gif", "webp", "svg", "ico"),
+    "fonts": _extensions("woff", "woff2", "ttf", "otf", "eot")
+             + ["*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": _extensions("mp4", "webm", "mp3", "ogg"),
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*hotjar.com*",
+                  "*clarity.ms*", "*segment.io*", "*newrelic.com*", "*nr-data.net*"],
+    "ads": ["*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+            "*adservice.google.*", "*facebook.net*", "*connect.facebook.*"],
+}
+
+# Applied to every driver; none of these is read by an assertion of any suite
+DEFAULT_BLOCKING = {
+    "block": ["fonts", "media", "analytics", "ads"],
+    "allow": [],
+}
+
+_stats = {"blocked": {}, "transferred_requests": 0, "transferred_bytes": 0}
+_sizes = {}             # URL -> encoded bytes, from responses that were not blocked
+_stats_lock = threading.Lock()
+
+
+def enabled():
+    return (os.environ.get(BLOCKING_ENV) or "on").lower() not in ("off", "0", "false", "no")
+
+
+def _expand(entries):
+    patterns = []
+    for entry in entries or ():
+        if entry in CATEGORIES:
+            patterns.extend(CATEGORIES[entry])
+        elif "*" in entry or "/" in entry or "." in entry:
+            patterns.append(entry)
+        else:
+            raise ValueError(f"Unknown blocking category '{entry}', expected one of {sorted(CATEGORIES)}")
+    return patterns
+
+
+def blocked_patterns(blocking=None):
+    """URL patterns for a blocking config (DEFAULT_BLOCKING when None)"""
+    if not enabled():
+        return []
+    blocking = DEFAULT_BLOCKING if blocking is None else blocking
+    block = _expand(blocking.get("block"))
+    allowed = set()
+    for entry in blocking.get("allow") or ():
+        entry_patterns = _expand([entry])
+        if not set(entry_patterns) <= set(block):
+            raise ValueError(f"Allow entry '{entry}' is not in the block list - Chrome cannot "
+                             f"whitelist URLs inside a blocked pattern")
+        allowed.update(entry_patterns)
+    patterns = []
+    for pattern in block:
+        if pattern not in allowed and pattern not in patterns:
+            patterns.append(pattern)
+    return patterns
+
+
+def category_of(url, patterns):
+    """Category (or the raw pattern) that blocked a URL"""
+    for name, category in CATEGORIES.items():
+        if any(fnmatch.fnmatchcase(url, p) for p in category if p in patterns):
+            return name
+    return next((p for p in patterns if fnmatch.fnmatchcase(url, p)), "other")
+
+
+def apply(driver, blocking=None):
+    """Block the config's URL patterns in this browser (no-op if already applied)"""
+    patterns = blocked_patterns(blocking)
+    if getattr(driver, "_blocked_urls", None) == patterns:
+        return patterns
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except (AttributeError, WebDriverException):
+        # not a Chromium driver - nothing to block through
+        return []
+    driver._blocked_urls = patterns
+    return patterns
+
+
+def logging_capabilities(options, network_log=False):
+    """Let Chrome record console messages (for artifacts) and, if asked, network events (for collect())
+
+    Only drivers whose log is drained by collect() should record network events -
+    Chrome buffers them for as long as the browser lives.
+    """
+    prefs = {"browser": "ALL"}
+    if network_log:
+        prefs["performance"] = "ALL"
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    options.set_capability("goog:loggingPrefs", prefs)
+    return options
+
+
+def collect(driver):
+    """Drain the browser's performance log into the run-wide counters"""
+    try:
+        entries = driver.get_log("performance")
+    except (AttributeError, WebDriverException):
+        return
+    patterns = getattr(driver, "_blocked_urls", None) or []
+    urls = {}
+    with _stats_lock:
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params["requestId"]] = params["request"]["url"]
+            elif method == "Network.loadingFinished":
+                _stats["transferred_requests"] += 1
+                _stats["transferred_bytes"] += int(params.get("encodedDataLength") or 0)
+                url = urls.get(params["requestId"])
+                if url:
+                    _sizes[url] = int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                url = urls.get(params["requestId"], "")
+                blocked = _stats["blocked"].setdefault(category_of(url, patterns), {})
+                blocked[url] = blocked.get(url, 0) + 1
+
+
+def build_report(known_sizes):
+    """Blocked requests per category, transferred totals and the estimated bytes saved"""
+    categories = {}
+    saved_bytes, measured = 0, 0
+    for name, urls in _stats["blocked"].items():
+        count = sum(urls.values())
+        size = sum(known_sizes[url] * hits for url, hits in urls.items() if url in known_sizes)
+        measured += sum(hits for url, hits in urls.items() if url in known_sizes)
+        saved_bytes += size
+        categories[name] = {"requests": count, "unique_urls": len(urls), "estimated_bytes": size}
+    blocked = sum(c["requests"] for c in categories.values())
+    return {
+        "blocked_requests": blocked,
+        "estimated_bytes_saved": saved_bytes,
+        # sizes are learned from runs with blocking off (NETWORK_BLOCKING=off)
+        "requests_with_known_size": measured,
+        "transferred_requests": _stats["transferred_requests"],
+        "transferred_bytes": _stats["transferred_bytes"],
+        "blocked": categories,
+    }
+
+
+def write_report(directory=None):
+    """Write network-<stamp>-<pid>.json and update the known response sizes"""
+    with _stats_lock:
+        if not _stats["blocked"] and not _stats["transferred_requests"]:
+            return None
+        directory = directory or os.environ.get(REPORT_DIR_ENV, DEFAULT_REPORT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        sizes_path = os.path.join(directory, SIZES_FILE)
+        known_sizes = {}
+        if os.path.exists(sizes_path):
+            with open(sizes_path, "r", encoding="utf-8") as f:
+                known_sizes = json.load(f)
+        known_sizes.update(_sizes)
+        with open(sizes_path, "w", encoding="utf-8") as f:
+            json.dump(known_sizes, f)
+
+        path = os.path.join(directory, f"network-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(build_report(known_sizes), f, indent=2)
+    return path
+
+
+atexit.register(write_report)
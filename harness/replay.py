@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Record/replay of the sites under test
+A local reverse proxy is started for every upstream site (lambdatest, saucedemo) and
+the suite configs are pointed at it:
+
+    record - requests are forwarded to the real site and every response (HTML, JS,
+             CSS, XHR) is stored in an on-disk archive, one cassette per test
+    replay - the proxy answers from the archive only, no network needed
+    off    - (default) configs keep the real URLs
+
+Select the mode with the REPLAY_MODE environment variable. Configs route their URLs
+through rewrite_url()/rewrite_config(); tests name their cassette with use_cassette().
+"""
+import atexit
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# ========== REPLAY SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODE_ENV = "REPLAY_MODE"
+ARCHIVE_ENV = "REPLAY_ARCHIVE_DIR"
+DEFAULT_ARCHIVE_DIR = os.path.join(PROJECT_ROOT, "replay_archive")
+MODES = ("off", "record", "replay")
+SHARED_CASSETTE = "_shared"
+UPSTREAM_TIMEOUT = 30
+
+# query parameters that change on every request (jQuery cache busting)
+VOLATILE_PARAMS = ("_",)
+
+# headers the proxy recomputes itself or that break a plain-http localhost origin
+DROPPED_REQUEST_HEADERS = {
+    "host", "accept-encoding", "connection", "keep-alive", "proxy-connection",
+    "content-length", "upgrade-insecure-requests",
+}
+DROPPED_RESPONSE_HEADERS = {
+    "transfer-encoding", "content-encoding", "content-length", "connection", "keep-alive",
+    "strict-transport-security", "content-security-policy", "alt-svc",
+}
+TEXT_CONTENT_TYPES = ("text/", "javascript", "json", "xml")
+
+_proxies = {}           # upstream origin -> ReplayProxy
+_proxies_lock = threading.Lock()
+_archive = None
+_cassette = SHARED_CASSETTE
+
+
+def mode():
+    """Current mode from REPLAY_MODE (default off)"""
+    value = (os.environ.get(MODE_ENV) or "off").lower()
+    if value not in MODES:
+        raise ValueError(f"Unknown replay mode '{value}', expected one of {MODES}")
+    return value
+
+
+def safe_name(name):
+    """Cassette name usable as a file name"""
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+def request_key(method, url, body=b""):
+    """Archive key of a request: method, URL without volatile params, body hash"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in VOLATILE_PARAMS]
+    key = f"{method} {parts.scheme}://{parts.netloc}{parts.path}"
+    if query:
+        key += "?" + urlencode(query)
+    if body:
+        key += " " + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+class Archive:
+    """Recorded responses grouped in cassettes; bodies are stored once by content hash
+
+    Layout:
+        <dir>/cassettes/<cassette>.json   {key: [{status, headers, body}]}
+        <dir>/bodies/<sha1>
+    A key recorded several times (e.g. the cart page before and after a remove)
+    keeps every response and replays them in order, repeating the last one.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._cassettes = {}
+        self._recording = set()     # cassettes started fresh in this process
+        self._dirty = set()
+        self._played = {}
+        self._any = None
+        self._lock = threading.Lock()
+
+    def _cassette_path(self, name):
+        return os.path.join(self.directory, "cassettes", safe_name(name) + ".json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.directory, "bodies", digest)
+
+    def cassette(self, name):
+        if name not in self._cassettes:
+            path = self._cassette_path(name)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._cassettes[name] = json.load(f)
+            else:
+                self._cassettes[name] = {}
+        return self._cassettes[name]
+
+    def record(self, name, key, status, headers, body):
+        """Store one upstream response; re-recording a cassette replaces its old content"""
+        digest = hashlib.sha1(body).hexdigest()
+        path = self._body_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(body)
+            if name not in self._recording:
+                self._recording.add(name)
+                self._cassettes[name] = {}
+            entry = {"status": status, "headers": headers, "body": digest}
+            self._cassettes[name].setdefault(key, []).append(entry)
+            self._dirty.add(name)
+
+    def replay(self, name, key):
+        """(status, headers, body) for the next play of key, or None if never recorded
+
+        Requests not in the test's own cassette (class setup, background calls)
+        are served from any cassette that has them.
+        """
+        with self._lock:
+            entries = self.cassette(name).get(key) or self._find_anywhere(key)
+            if not entries:
+                return None
+            count = self._played.get((name, key), 0)
+            self._played[(name, key)] = count + 1
+            entry = entries[min(count, len(entries) - 1)]
+        with open(self._body_path(entry["body"]), "rb") as f:
+            body = f.read()
+        return entry["status"], [tuple(h) for h in entry["headers"]], body
+
+    def _find_anywhere(self, key):
+        if self._any is None:
+            self._any = {}
+            folder = os.path.join(self.directory, "cassettes")
+            for file_name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+                name = os.path.splitext(file_name)[0]
+                for cassette_key, entries in self.cassette(name).items():
+                    self._any.setdefault(cassette_key, entries)
+        return self._any.get(key)
+
+    def reset_plays(self):
+        with self._lock:
+            self._played.clear()
+
+    def flush(self):
+        """Write every cassette recorded since the last flush"""
+        with self._lock:
+            for name in self._dirty:
+                path = self._cassette_path(name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(self._cassettes[name], f, indent=1, sort_keys=True)
+            self._dirty.clear()
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    proxy = None
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.proxy.respond(self.command, self.path, self.headers, body)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayProxy:
+    """Local reverse proxy in front of one upstream origin"""
+
+    def __init__(self, upstream, archive, proxy_mode):
+        self.upstream = upstream.rstrip("/")
+        self.archive = archive
+        self.mode = proxy_mode
+        handler = type("ProxyHandler", (_ProxyHandler,), {"proxy": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.local = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, method, path, headers, body):
+        """(status, headers, body) for a browser request, with URLs pointing back at the proxies"""
+        key = request_key(method, self.upstream + path, body)
+        if self.mode == "record":
+            status, response_headers, payload = self.forward(method, path, headers, body)
+            if status != 502:
+                self.archive.record(_cassette, key, status, response_headers, payload)
+        else:
+            played = self.archive.replay(_cassette, key)
+            if played is None:
+                print(f"[replay] not in archive: {key}")
+                return 404, [("Content-Type", "text/plain")], f"Not recorded: {key}".encode()
+            status, response_headers, payload = played
+        return status, localize_headers(response_headers), localize_body(response_headers, payload)
+
+    def forward(self, method, path, headers, body):
+        """Send the request to the real site"""
+        parts = urlsplit(self.upstream)
+        connection_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                            else http.client.HTTPConnection)
+        connection = connection_class(parts.netloc, timeout=UPSTREAM_TIMEOUT)
+        outgoing = {name: value.replace(self.local, self.upstream)
+                    for name, value in headers.items()
+                    if name.lower() not in DROPPED_REQUEST_HEADERS}
+        outgoing["Accept-Encoding"] = "identity"
+        try:
+            connection.request(method, path, body or None, outgoing)
+            response = connection.getresponse()
+            payload = response.read()
+            kept = [[name, value] for name, value in response.getheaders()
+                    if name.lower() not in DROPPED_RESPONSE_HEADERS]
+            return response.status, kept, payload
+        except (OSError, http.client.HTTPException) as e:
+            return 502, [["Content-Type", "text/plain"]], str(e).encode()
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _origin_rewrites():
+    """(upstream, local) byte pairs for every running proxy, most specific first"""
+    pairs = []
+    for upstream, proxy in _proxies.items():
+        host = upstream.split("://", 1)[1]
+        local_host = proxy.local.split("://", 1)[1]
+        for scheme in ("https", "http"):
+            pairs.append((f"{scheme}://{host}", proxy.local))
+            pairs.append((f"{scheme}:\\/\\/{host}", proxy.local.replace("/", "\\/")))
+        pairs.append((f"//{host}", f"//{local_host}"))
+    return [(a.encode(), b.encode()) for a, b in pairs]
+
+
+def localize_body(headers, body):
+    """Point absolute links to the upstream sites at the local proxies"""
+    content_type = next((v for n, v in headers if n.lower() == "content-type"), "")
+    if not any(t in content_type for t in TEXT_CONTENT_TYPES):
+        return body
+    for upstream, local in _origin_rewrites():
+        body = body.replace(upstream, local)
+    return body
+
+
+def localize_headers(headers):
+    """Rewrite redirects to the proxies and make cookies valid for http://127.0.0.1"""
+    rewritten = []
+    for name, value in headers:
+        lower = name.lower()
+        if lower in ("location", "content-location", "refresh"):
+            for upstream, local in _origin_rewrites():
+                value = value.replace(upstream.decode(), local.decode())
+        elif lower == "set-cookie":
+            value = re.sub(r";\s*domain=[^;]*", "", value, flags=re.I)
+            value = re.sub(r";\s*secure\b", "", value, flags=re.I)
+            value = re.sub(r"samesite=none", "SameSite=Lax", value, flags=re.I)
+        rewritten.append((name, value))
+    return rewritten
+
+
+def get_archive():
+    global _archive
+    if _archive is None:
+        _archive = Archive(os.environ.get(ARCHIVE_ENV, DEFAULT_ARCHIVE_DIR))
+    return _archive
+
+
+def get_proxy(upstream):
+    """Running proxy for an upstream origin, started on first use"""
+    with _proxies_lock:
+        if upstream not in _proxies:
+            _proxies[upstream] = ReplayProxy(upstream, get_archive(), mode())
+        return _proxies[upstream]
+
+
+def rewrite_url(url):
+    """URL to use in the suites: the real one when off, the local proxy otherwise"""
+    if mode() == "off":
+        return url
+    parts = urlsplit(url)
+    proxy = get_proxy(f"{parts.scheme}://{parts.netloc}")
+    return proxy.local + url[len(f"{parts.scheme}://{parts.netloc}"):]
+
+
+def rewrite_config(config):
+    """Rewrite the 'url' and '*_url' entries of a JSON config in place"""
+    for key, value in config.items():
+        if (key == "url" or key.endswith("_url")) and isinstance(value, str):
+            config[key] = rewrite_url(value)
+    return config
+
+
+def use_cassette(name):
+    """Record into / replay from the named cassette until the next call"""
+    global _cassette
+    if mode() == "off":
+        return
+    archive = get_archive()
+    archive.flush()
+    archive.reset_plays()
+    _cassette = name
+
+
+def close():
+    """Stop the proxies and write pending recordings"""
+    with _proxies_lock:
+        for proxy in _proxies.values():
+            proxy.close()
+        _proxies.clear()
+    if _archive is not None:
+        _archive.flush()
+
+
+atexit.register(close)
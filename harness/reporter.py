@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming test reporter
+Every finished test is recorded the moment unittest reports it, through the result sink
+of harness/results.py: the same reports/results/<run>/results-<pid>.jsonl files and
+record schema, with the test's duration, phase durations and failure screenshot
+
+    {"suite", "test_id", "status", "reason", "pid", "time",
+     "test", "duration", "phases", "screenshot"}
+
+Tests that reported their rows through results.report() already have their records - the
+result's startTest/stopTest hooks tag them with the running test, timed or not. The others
+(suites without row reports, setUp/setUpClass errors) get one record here.
+A killed run (CI timeout, crashed chromedriver) keeps every line written so far, and
+dashboards can tail the files. The parallel runner records its workers' results too.
+
+Usage (from the project root):
+    python -m harness.reporter discover -s level-2 -p "*_level2.py"
+    python -m harness.reporter junit                      # latest run -> junit.xml
+    python -m harness.reporter junit reports/results/<run> -o results.xml
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import unittest
+
+from harness import results, timing
+
+# ========== REPORTER SETTINGS ==========
+JUNIT_FILE = "junit.xml"
+
+
+def emit(test, status, reason="", duration=None):
+    """Record one finished test unless it reported its rows itself; returns the record or None"""
+    test_id = test.id()
+    if results.reported(test_id):
+        return None
+    # unittest reports a failure of the test body before tearDown finishes the timing
+    running = timing.current()
+    finished = running if running is not None and running.test_id == test_id else timing.last_finished(test_id)
+    if isinstance(test, unittest.TestCase):
+        suite, method = type(test).__name__, test._testMethodName
+    else:
+        # errors in setUpClass/tearDownClass are reported against a _ErrorHolder
+        suite, method = "tests", test_id
+    return results.report(
+        suite, finished.row_id if finished and finished.row_id else method, status, reason,
+        test=test_id,
+        duration=duration if duration is not None else (finished.duration if finished else None),
+        phases=finished.phase_totals(include_open=True) if finished else {},
+        screenshot=getattr(test, "screenshot_path", None),
+    )
+
+
+class StreamingResult(unittest.TextTestResult):
+    """TextTestResult that also records every outcome through emit()"""
+
+    def startTest(self, test):
+        self._test_started = time.perf_counter()
+        results.start_test(test.id())
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        results.stop_test()
+
+    def _elapsed(self):
+        started = getattr(self, "_test_started", None)
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        emit(test, "passed", duration=self._elapsed())
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        emit(test, "failed", str(err[1]), self._elapsed())
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        emit(test, "errors", str(err[1]), self._elapsed())
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        emit(test, "skipped", reason, self._elapsed())
+
+
+def latest_run_dir():
+    runs = sorted(glob.glob(os.path.join(os.environ.get(results.RESULTS_DIR_ENV, results.DEFAULT_RESULTS_DIR), "*")),
+                  key=os.path.getmtime)
+    if not runs:
+        raise FileNotFoundError("No result runs found - run the suites first")
+    return runs[-1]
+
+
+def convert(source=None, output=None):
+    """Result files of a run folder (or a single .jsonl file) -> JUnit XML; returns its path"""
+    source = source or latest_run_dir()
+    paths = sorted(glob.glob(os.path.join(source, results.RESULT_PATTERN))) if os.path.isdir(source) else [source]
+    output = output or os.path.join(source if os.path.isdir(source) else os.path.dirname(source), JUNIT_FILE)
+    timing.build_junit(results.load_files(paths), "results").write(output, encoding="utf-8", xml_declaration=True)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming JSON-lines reporter and JUnit converter")
+    commands = parser.add_subparsers(dest="command", required=True)
+    discover = commands.add_parser("discover", help="run unittest discovery, recording every result")
+    discover.add_argument("-s", "--start-directory", default=".")
+    discover.add_argument("-p", "--pattern", default="test*.py")
+    discover.add_argument("-v", "--verbosity", type=int, default=2)
+    junit = commands.add_parser("junit", help="convert recorded results to JUnit XML")
+    junit.add_argument("source", nargs="?", help="run folder or .jsonl file (default: latest run)")
+    junit.add_argument("-o", "--output", help=f"XML path (default: <run folder>/{JUNIT_FILE})")
+    args = parser.parse_args(argv)
+
+    if args.command == "junit":
+        print(convert(args.source, args.output))
+        return 0
+
+    suite = unittest.defaultTestLoader.discover(args.start_directory, pattern=args.pattern)
+    runner = unittest.TextTestRunner(verbosity=args.verbosity, resultclass=StreamingResult)
+    outcome = runner.run(suite)
+    print(f"Results: {results.run_dir()}")
+    return 0 if outcome.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Shared test result sink
+Suites report every row here instead of keeping class-level result dicts. Records are
+queued and appended by one writer thread to reports/results/<run>/results-<pid>.jsonl
+as they arrive, so threads and worker processes never share a file and a killed run
+keeps every line written so far. When the run's main process exits, all files of the
+run are merged into summary.json and one summary over every suite is printed.
+
+    results.report('SearchLevel2', self.current_test_id, 'failed', str(e))
+    results.print_suite_summary('SearchLevel2', 'TEST EXECUTION SUMMARY - LEVEL 2 SEARCH')
+
+A record reported while a test is timed (harness/timing.py) also gets the duration so far,
+phase durations and failure screenshot of that test. Under the parallel runner and
+harness/reporter.py, whose unittest results call start_test()/stop_test(), every record
+carries the unittest ID of the running test, timed or not; tests that report no row
+themselves are recorded by the reporter when unittest reports them.
+
+Processes share a run through the TEST_RUN_ID environment variable (inherited by the
+runner's workers); the runner marks its workers with TEST_RESULTS_WORKER so only the
+runner prints the merged summary.
+"""
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from harness import timing
+
+# ========== RESULT SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR_ENV = "TEST_RESULTS_DIR"
+DEFAULT_RESULTS_DIR = os.path.join(PROJECT_ROOT, "reports", "results")
+RUN_ENV = "TEST_RUN_ID"
+WORKER_ENV = "TEST_RESULTS_WORKER"
+STATUSES = ("passed", "failed", "errors", "skipped")
+RESULT_PATTERN = "results-*.jsonl"
+
+_records = []           # this process's records, for the per-class summaries
+_reported_tests = set() # unittest IDs that reported rows in this process
+_running_test = None    # unittest ID the result hook reports as running
+_records_lock = threading.Lock()
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def new_run():
+    """Start a new run ID; processes started afterwards inherit it"""
+    os.environ[RUN_ENV] = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+    return os.environ[RUN_ENV]
+
+
+def run_dir(run_id=None):
+    run_id = run_id or os.environ.get(RUN_ENV) or new_run()
+    return os.path.join(os.environ.get(RESULTS_DIR_ENV, DEFAULT_RESULTS_DIR), run_id)
+
+
+class ResultSink:
+    """Append-only JSON-lines file fed through a queue by a single writer thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write, name="result-sink", daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        self._queue.put(record)
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+
+    def close(self):
+        """Write everything queued so far and stop the writer"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def _get_sink():
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = ResultSink(os.path.join(run_dir(), f"results-{os.getpid()}.jsonl"))
+        return _sink
+
+
+def start_test(test):
+    """Result hook (startTest): rows reported from now on belong to this unittest ID"""
+    global _running_test
+    with _records_lock:
+        _reported_tests.discard(test)     # a test run again has not reported yet
+    _running_test = test
+
+
+def stop_test():
+    """Result hook (stopTest)"""
+    global _running_test
+    _running_test = None
+
+
+def _timing_details():
+    """Unittest ID, duration, phases and screenshot of the test being timed in this thread"""
+    running = timing.current()
+    if running is None:
+        return {}
+    return {
+        "test": running.test_id,
+        "duration": round(running.elapsed(), 3),
+        "phases": {phase: round(seconds, 3) for phase, seconds in running.phase_totals(include_open=True).items()},
+        "screenshot": running.screenshot,
+    }
+
+
+def report(suite, test_id, status, reason="", **details):
+    """Record one test result; details (row data, timings) override the running test's timing"""
+    if status not in STATUSES:
+        raise ValueError(f"Unknown status '{status}', expected one of {STATUSES}")
+    record = {
+        "suite": suite,
+        "test_id": test_id,
+        "status": status,
+        "reason": reason,
+        "pid": os.getpid(),
+        "time": time.time(),
+    }
+    record.update(_timing_details())
+    if _running_test is not None:
+        record["test"] = _running_test
+    record.update(details)
+    with _records_lock:
+        _records.append(record)
+        if record.get("test"):
+            _reported_tests.add(record["test"])
+    _get_sink().put(record)
+    return record
+
+
+def reported(test):
+    """True if the unittest test reported rows in this process"""
+    with _records_lock:
+        return test in _reported_tests
+
+
+def suite_records(suite):
+    """Records this process reported for a suite"""
+    with _records_lock:
+        return [record for record in _records if record["suite"] == suite]
+
+
+def print_summary(title, records):
+    """Summary in the suites' tearDownClass format"""
+    by_status = {status: [r for r in records if r["status"] == status] for status in STATUSES}
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+    print(f"Total Tests: {len(records)}")
+    print(f"Passed: {len(by_status['passed'])}")
+    print(f"Failed: {len(by_status['failed'])}")
+    print(f"Errors: {len(by_status['errors'])}")
+    if by_status["skipped"]:
+        print(f"Skipped: {len(by_status['skipped'])}")
+    print("="*60)
+
+    if by_status["failed"]:
+        print("\n FAILED TEST CASES:")
+        for failure in by_status["failed"]:
+            print(f"  - {failure['test_id']}")
+            print(f"    Reason: {failure['reason']}")
+
+    if by_status["errors"]:
+        print("\n ERROR TEST CASES:")
+        for error in by_status["errors"]:
+            print(f"  - {error['test_id']}")
+            print(f"    Reason: {error['reason']}")
+
+    print("\n" + "="*60 + "\n")
+
+
+def print_suite_summary(suite, title):
+    print_summary(title, suite_records(suite))
+
+
+def load_files(paths):
+    """Records of result files in reporting order; a killed process's truncated last line is skipped"""
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return sorted(records, key=lambda record: record["time"])
+
+
+def run_files(run_id=None):
+    return sorted(glob.glob(os.path.join(run_dir(run_id), RESULT_PATTERN)))
+
+
+def load_run(run_id=None):
+    """Every record of a run, from all of its processes, in reporting order"""
+    return load_files(run_files(run_id))
+
+
+def summarize(records):
+    """Totals per status, overall and per suite"""
+    summary = {"total": len(records), "suites": {}}
+    summary.update({status: 0 for status in STATUSES})
+    for record in records:
+        summary[record["status"]] += 1
+        suite = summary["suites"].setdefault(
+            record["suite"], dict({"total": 0}, **{status: 0 for status in STATUSES})
+        )
+        suite["total"] += 1
+        suite[record["status"]] += 1
+    return summary
+
+
+def write_summary(run_id=None):
+    """Merge a run's result files into summary.json; returns (summary, records)"""
+    records = load_run(run_id)
+    summary = summarize(records)
+    summary["failures"] = [r for r in records if r["status"] in ("failed", "errors")]
+    os.makedirs(run_dir(run_id), exist_ok=True)
+    with open(os.path.join(run_dir(run_id), "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary, records
+
+
+def close():
+    """Flush this process's results; the run's main process also prints the merged summary"""
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is None:
+        return
+    sink.close()
+    if os.environ.get(WORKER_ENV):
+        return
+    summary, records = write_summary()
+    if len(summary["suites"]) > 1:
+        labelled = [dict(r, test_id=f"{r['suite']} {r['test_id']}") for r in records]
+        print_summary(f"TEST EXECUTION SUMMARY - ALL SUITES ({len(summary['suites'])} suites)", labelled)
+        for suite, counts in sorted(summary["suites"].items()):
+            print(f"  {suite}: {counts['passed']}/{counts['total']} passed")
+
+
+atexit.register(close)
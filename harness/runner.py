@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel sharded runner for the CSV-driven suites
+Expands every generated test (ddt @data rows and setattr-generated CSV tests),
+shards them across worker processes - each with its own browser - and prints
+one merged summary in the same format as the suites' tearDownClass reports
+
+Durations of every run are kept in reports/test-history.sqlite (see harness/history.py)
+and the slowest tests are scheduled first (longest processing time first), so a slow
+row no longer starts last and sets the wall time.
+
+Usage (from the project root):
+    python -m harness.runner -j 4
+    python -m harness.runner -j 4 --failed-first
+    python -m harness.runner -j 2 --levels level-2 --list
+"""
+import argparse
+import glob
+import importlib.util
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from harness import driver_pool, history, reporter, results
+
+# ========== RUNNER SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEVEL_PATTERNS = {
+    "level-1": "*_level1.py",
+    "level-2": "*_level2.py",
+}
+DEFAULT_WORKERS = 2
+DEFAULT_LOG_DIR = os.path.join("reports", "runner")
+DEFAULT_DURATION = 10.0     # seconds assumed for a test with no history yet
+
+# Features that share server-side state: all their tests run in one worker, serially
+ISOLATION_GROUPS = {
+    "Add to cart": "cart",
+    "Remove from cart": "cart",
+    "Change password": "account",
+}
+
+TestRef = namedtuple("TestRef", ["path", "class_name", "method"])
+
+
+def test_key(ref):
+    """Stable, human readable ID of a generated test"""
+    return f"{os.path.relpath(ref.path, PROJECT_ROOT)}::{ref.class_name}::{ref.method}"
+
+
+def test_id(ref):
+    """unittest ID of a test (module.Class.method), the key of the history database"""
+    module = os.path.splitext(os.path.basename(ref.path))[0]
+    return f"{module}.{ref.class_name}.{ref.method}"
+
+
+def feature_of(ref):
+    """Feature folder a test belongs to, e.g. 'Add to cart'"""
+    return os.path.basename(os.path.dirname(ref.path))
+
+
+def find_suite_files(levels=None):
+    """unittest-based suite files; script-style files run on import and are skipped"""
+    files = []
+    for level in levels or LEVEL_PATTERNS:
+        pattern = os.path.join(PROJECT_ROOT, level, "*", LEVEL_PATTERNS[level])
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as f:
+                if "unittest.TestCase" in f.read():
+                    files.append(path)
+    return files
+
+
+@contextmanager
+def suite_dir(path):
+    """Run inside the suite folder - some suites open their CSV/JSON relative to cwd"""
+    previous = os.getcwd()
+    folder = os.path.dirname(path)
+    os.chdir(folder)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def load_suite_module(path):
+    """Import a suite file by path (folder names contain spaces and dashes)"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    with suite_dir(path):
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def iter_tests(suite):
+    """Flatten nested TestSuites into TestCase instances"""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def collect(levels=None):
+    """Expand every generated test of every suite into TestRefs"""
+    refs = []
+    loader = unittest.TestLoader()
+    for path in find_suite_files(levels):
+        module = load_suite_module(path)
+        for test in iter_tests(loader.loadTestsFromModule(module)):
+            refs.append(TestRef(path, type(test).__name__, test._testMethodName))
+    return refs
+
+
+def build_units(refs):
+    """Group tests into schedulable units - isolated features form a single unit"""
+    units = {}
+    for ref in refs:
+        group = ISOLATION_GROUPS.get(feature_of(ref))
+        key = ("group", group) if group else ("test", test_key(ref))
+        units.setdefault(key, []).append(ref)
+    return list(units.values())
+
+
+def default_duration(durations):
+    """Estimate for tests without history: the median known duration"""
+    if not durations:
+        return DEFAULT_DURATION
+    known = sorted(durations.values())
+    return known[len(known) // 2]
+
+
+def estimate(refs, durations, default=None):
+    """Expected seconds to run refs, from their historical durations"""
+    default = default_duration(durations) if default is None else default
+    return sum(durations.get(test_id(ref), default) for ref in refs)
+
+
+def shard(refs, workers, durations=None, failed=()):
+    """Split tests into balanced shards, keeping isolation groups together
+
+    Units are handed out longest-first, each to the least loaded shard (LPT). Without
+    history every test counts the same. Classes with a test in `failed` run first in
+    their shard, whole, so their class fixtures (browser, login) still run once.
+    """
+    durations = durations or {}
+    default = default_duration(durations)
+    shards = [[] for _ in range(max(1, workers))]
+    loads = [0.0] * len(shards)
+    units = [(estimate(unit, durations, default), unit) for unit in build_units(refs)]
+    for cost, unit in sorted(units, key=lambda item: item[0], reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].extend(unit)
+        loads[lightest] += cost
+    # keep each shard in discovery order so per-class fixtures run once per file
+    order = {ref: i for i, ref in enumerate(refs)}
+    ordered = []
+    for s in shards:
+        if not s:
+            continue
+        failed_classes = {(ref.path, ref.class_name) for ref in s if test_id(ref) in failed}
+        ordered.append(sorted(s, key=lambda ref: ((ref.path, ref.class_name) not in failed_classes,
+                                                  order[ref])))
+    return ordered
+
+
+class ShardResult(unittest.TestResult):
+    """Records status, reason and duration of every test in a shard, streaming each one"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self._started = {}
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._started[test.id()] = time.perf_counter()
+        results.start_test(test.id())
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        results.stop_test()
+
+    def _record(self, test, status, reason=""):
+        started = self._started.pop(test.id(), time.perf_counter())
+        duration = time.perf_counter() - started
+        self.records.append({
+            "test_id": test.id(),
+            "status": status,
+            "reason": reason,
+            "duration": duration,
+        })
+        reporter.emit(test, status, reason, duration)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, "passed")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, "failed", str(err[1]))
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        # errors in setUpClass/tearDownClass are reported against a _ErrorHolder
+        if isinstance(test, unittest.TestCase):
+            self._record(test, "errors", str(err[1]))
+        else:
+            self.records.append({"test_id": test.id(), "status": "errors",
+                                 "reason": str(err[1]), "duration": 0.0})
+            reporter.emit(test, "errors", str(err[1]), 0.0)
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, "skipped", reason)
+
+
+def init_worker(run_id):
+    """Worker initializer: report into the runner's result run, leave the merged summary to it"""
+    os.environ[results.RUN_ENV] = run_id
+    os.environ[results.WORKER_ENV] = "1"
+
+
+def run_shard(index, refs, log_dir):
+    """Worker entry point: run one shard in this process and return its records"""
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"worker-{index}.log")
+    log = open(log_path, "w", encoding="utf-8")
+    sys.stdout = sys.stderr = log
+
+    loader = unittest.TestLoader()
+    records = []
+    try:
+        # consecutive tests of one file share a suite; classes are never split (see shard)
+        for path, file_refs in itertools.groupby(refs, key=lambda ref: ref.path):
+            file_refs = list(file_refs)
+            module = load_suite_module(path)
+            suite = unittest.TestSuite(
+                loader.loadTestsFromName(f"{ref.class_name}.{ref.method}", module)
+                for ref in file_refs
+            )
+            # a fresh result per run: a reused one remembers the previous run's last class
+            # and unittest would call its tearDownClass again at the start of this run
+            result = ShardResult()
+            with suite_dir(path):
+                suite.run(result)
+            records.extend(result.records)
+    finally:
+        # quit this worker's browsers before handing the records back
+        driver_pool.close_all()
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        log.close()
+    return records
+
+
+def print_summary(records, workers, elapsed):
+    """Merged summary in the same format as the suites' tearDownClass reports"""
+    by_status = {"passed": [], "failed": [], "errors": [], "skipped": []}
+    for record in records:
+        by_status[record["status"]].append(record)
+
+    print("\n" + "="*60)
+    print(f"TEST EXECUTION SUMMARY - ALL SUITES ({workers} workers)")
+    print("="*60)
+    print(f"Total Tests: {len(records)}")
+    print(f"Passed: {len(by_status['passed'])}")
+    print(f"Failed: {len(by_status['failed'])}")
+    print(f"Errors: {len(by_status['errors'])}")
+    if by_status["skipped"]:
+        print(f"Skipped: {len(by_status['skipped'])}")
+    print(f"Wall time: {elapsed:.1f}s")
+    print("="*60)
+
+    if by_status["failed"]:
+        print("\n FAILED TEST CASES:")
+        for failure in by_status["failed"]:
+            print(f"  - {failure['test_id']}")
+            print(f"    Reason: {failure['reason']}")
+
+    if by_status["errors"]:
+        print("\n ERROR TEST CASES:")
+        for error in by_status["errors"]:
+            print(f"  - {error['test_id']}")
+            print(f"    Reason: {error['reason']}")
+
+    print("\n" + "="*60 + "\n")
+
+
+def run(refs, workers=DEFAULT_WORKERS, log_dir=DEFAULT_LOG_DIR, failed_first=False,
+        use_history=True):
+    """Shard refs across worker processes, store their durations and return the merged records"""
+    log_dir = os.path.abspath(log_dir)
+    durations = history.durations() if use_history else {}
+    failed = history.last_failed() if use_history and failed_first else set()
+    shards = shard(refs, workers, durations, failed)
+    records = []
+    run_id = results.new_run()
+    # spawn: every worker starts clean and launches its own browser
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards) or 1, mp_context=context,
+                             initializer=init_worker, initargs=(run_id,)) as executor:
+        futures = [executor.submit(run_shard, i, s, log_dir) for i, s in enumerate(shards, 1)]
+        for future in futures:
+            records.extend(future.result())
+    if use_history:
+        history.record_run(records, len(shards))
+    # suites that report into the result sink: merge their per-worker files
+    if results.load_run(run_id):
+        results.write_summary(run_id)
+    reporter.convert(results.run_dir(run_id))
+    return records
+
+
+def add_history_arguments(parser):
+    """--failed-first / --no-history, shared with harness.selector"""
+    parser.add_argument("--failed-first", action="store_true",
+                        help="run the tests that failed in the last run first")
+    parser.add_argument("--no-history", action="store_true",
+                        help="neither read nor store durations in the history database")
+
+
+def print_shards(refs, workers, durations, failed=()):
+    """--list output: every shard with its estimated duration"""
+    default = default_duration(durations)
+    for i, tests in enumerate(shard(refs, workers, durations, failed), 1):
+        print(f"[worker {i}] {len(tests)} tests, ~{estimate(tests, durations, default):.0f}s")
+        for ref in tests:
+            seconds = durations.get(test_id(ref))
+            known = f"{seconds:.1f}s" if seconds is not None else "new"
+            print(f"  {test_key(ref)}  ({known}{', failed last run' if test_id(ref) in failed else ''})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the CSV-driven suites in parallel shards")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="number of worker processes (each runs its own browser)")
+    parser.add_argument("--levels", nargs="+", choices=sorted(LEVEL_PATTERNS),
+                        help="levels to run (default: all)")
+    parser.add_argument("--isolate", nargs="+", default=[], metavar="FEATURE",
+                        help="extra feature folders to keep in a single worker")
+    parser.add_argument("--log-dir", default=DEFAULT_LOG_DIR,
+                        help="where each worker writes its console output")
+    parser.add_argument("--list", action="store_true",
+                        help="only print the expanded tests and their shards")
+    add_history_arguments(parser)
+    args = parser.parse_args(argv)
+
+    for feature in args.isolate:
+        ISOLATION_GROUPS.setdefault(feature, feature)
+
+    refs = collect(args.levels)
+    if args.list:
+        durations = {} if args.no_history else history.durations()
+        failed = history.last_failed() if args.failed_first and not args.no_history else set()
+        print_shards(refs, args.workers, durations, failed)
+        return 0
+
+    started = time.perf_counter()
+    records = run(refs, args.workers, args.log_dir, args.failed_first, not args.no_history)
+    print_summary(records, args.workers, time.perf_counter() - started)
+    print(f"Worker logs: {os.path.abspath(args.log_dir)}")
+    print(f"Results: {results.run_dir()}")
+    return 0 if all(r["status"] in ("passed", "skipped") for r in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Test selection by CSV row ID and tag
+Keeps an index of every CSV row ID of both levels -> suite file/class/method and runs
+only the requested rows through the parallel runner. The index is cached in
+reports/test-index.json and rebuilt only when a suite, config or CSV file changes,
+so selecting does not import any suite
+
+Patterns match row IDs (globs, case-insensitive) or tags. Tags are the word parts of
+the ID (LOGIN-BVA-001 -> LOGIN, BVA), the feature folder, an optional 'tags' column
+and the tags of the test method (@data_source.tag('smoke', 'ui')).
+
+Usage (from the project root):
+    python -m harness.selector TC003014
+    python -m harness.selector BVA ECP -j 2
+    python -m harness.selector "LOGIN-*" --list
+"""
+import argparse
+import csv
+import fnmatch
+import glob
+import json
+import os
+import re
+import sys
+import time
+import unittest
+
+from harness import data_source, runner
+
+# ========== SELECTOR SETTINGS ==========
+INDEX_PATH = os.path.join(runner.PROJECT_ROOT, "reports", "test-index.json")
+INDEX_VERSION = 2
+ID_COLUMNS = ("test_case_id", "TC_ID", "tc_id", "test_id")
+INDEXED_EXTENSIONS = (".py", ".csv", ".json")
+
+
+def source_signature(levels):
+    """Modification times of every file an index depends on"""
+    signature = {}
+    for level in levels:
+        for path in glob.glob(os.path.join(runner.PROJECT_ROOT, level, "*", "*")):
+            if path.endswith(INDEXED_EXTENSIONS):
+                signature[os.path.relpath(path, runner.PROJECT_ROOT)] = os.stat(path).st_mtime_ns
+    return signature
+
+
+def id_column(fieldnames):
+    return next((column for column in ID_COLUMNS if column in (fieldnames or ())), None)
+
+
+def row_tags(row_id, feature, tags_cell=None, method_tags=()):
+    """Word parts of the ID, the feature folder, the optional tags column and method tags"""
+    tags = {part.upper() for part in re.findall(r"[A-Za-z]+", row_id)}
+    tags.add(feature)
+    if tags_cell:
+        tags.update(t for t in data_source.TAG_SEPARATOR.split(tags_cell) if t)
+    tags.update(t.upper() for t in method_tags)
+    return sorted(tags)
+
+
+def csv_rows(folder):
+    """(row_id, tags cell) of every CSV in a feature folder"""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.csv"))):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            column = id_column(reader.fieldnames)
+            if column is None:
+                continue
+            rows.extend((row[column], row.get(data_source.TAGS_COLUMN)) for row in reader)
+    return rows
+
+
+def _generated_from(func):
+    """Values a generated test was built from: ddt closure args and setattr default args"""
+    values = list(getattr(func, "__defaults__", None) or ())
+    code, closure = getattr(func, "__code__", None), getattr(func, "__closure__", None)
+    if code and closure:
+        for name, cell in zip(code.co_freevars, closure):
+            if name == "args":
+                values.extend(cell.cell_contents)
+    return values
+
+
+def test_row_id(test_class, method_name, known_ids):
+    """CSV row ID a generated test method runs, or None"""
+    func = getattr(test_class, method_name, None)
+    for value in _generated_from(func):
+        if isinstance(value, dict):
+            column = id_column(value)
+            if column:
+                return value[column]
+        elif isinstance(value, str) and value in known_ids:
+            return value
+    # fall back to the ID embedded in the method name (test_BVA_007_001)
+    for row_id in known_ids:
+        if re.search(r"(^|_)%s($|_)" % re.escape(re.sub(r"\W", "_", row_id)), method_name):
+            return row_id
+    return None
+
+
+def build_index(levels):
+    """Import the unittest suites once and map every CSV row to its test"""
+    entries = []
+    loader = unittest.TestLoader()
+    # index every row, whatever TEST_IDS/TEST_TAGS this shell has set
+    saved = {name: os.environ.pop(name, None) for name in (data_source.IDS_ENV, data_source.TAGS_ENV)}
+    try:
+        suite_files = set(runner.find_suite_files(levels))
+        for level in levels:
+            for folder in sorted(glob.glob(os.path.join(runner.PROJECT_ROOT, level, "*"))):
+                if not os.path.isdir(folder):
+                    continue
+                feature = os.path.basename(folder)
+                rows = csv_rows(folder)
+                tags_by_id = {row_id: tags_cell for row_id, tags_cell in rows}
+                mapped = set()
+                for path in sorted(p for p in suite_files if os.path.dirname(p) == folder):
+                    module = runner.load_suite_module(path)
+                    for test in runner.iter_tests(loader.loadTestsFromModule(module)):
+                        row_id = test_row_id(type(test), test._testMethodName, tags_by_id)
+                        if row_id is None:
+                            continue
+                        mapped.add(row_id)
+                        method_tags = getattr(getattr(test, test._testMethodName), "tags", ())
+                        entries.append({
+                            "id": row_id,
+                            "tags": row_tags(row_id, feature, tags_by_id.get(row_id), method_tags),
+                            "level": level,
+                            "path": os.path.relpath(path, runner.PROJECT_ROOT),
+                            "class_name": type(test).__name__,
+                            "method": test._testMethodName,
+                        })
+                # rows of script-style files: listed, but only runnable as a whole file
+                for row_id, tags_cell in rows:
+                    if row_id not in mapped:
+                        entries.append({
+                            "id": row_id,
+                            "tags": row_tags(row_id, feature, tags_cell),
+                            "level": level,
+                            "path": os.path.relpath(folder, runner.PROJECT_ROOT),
+                            "class_name": None,
+                            "method": None,
+                        })
+    finally:
+        for name, value in saved.items():
+            if value is not None:
+                os.environ[name] = value
+    return entries
+
+
+def load_index(levels, rebuild=False):
+    """Cached index, rebuilt when any suite/config/CSV file changed"""
+    levels = sorted(levels)
+    signature = source_signature(levels)
+    if not rebuild and os.path.exists(INDEX_PATH):
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if (cached.get("version") == INDEX_VERSION and cached.get("levels") == levels
+                and cached.get("signature") == signature):
+            return cached["entries"]
+
+    entries = build_index(levels)
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    with open(INDEX_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "levels": levels,
+                   "signature": signature, "entries": entries}, f, indent=1)
+    return entries
+
+
+def matches(entry, patterns):
+    """A pattern selects an entry by ID glob or by tag (both case-insensitive)"""
+    row_id = entry["id"].upper()
+    tags = {tag.upper() for tag in entry["tags"]}
+    for pattern in patterns:
+        pattern = pattern.upper()
+        if pattern in tags or fnmatch.fnmatchcase(row_id, pattern):
+            return True
+    return False
+
+
+def select(entries, patterns):
+    return [entry for entry in entries if matches(entry, patterns)]
+
+
+def to_refs(entries):
+    """TestRefs of the selected runnable entries, in index order, without duplicates"""
+    refs = []
+    for entry in entries:
+        if entry["method"] is None:
+            continue
+        ref = runner.TestRef(os.path.join(runner.PROJECT_ROOT, entry["path"]),
+                             entry["class_name"], entry["method"])
+        if ref not in refs:
+            refs.append(ref)
+    return refs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run CSV rows by ID or tag")
+    parser.add_argument("patterns", nargs="*", help="row IDs, ID globs (LOGIN-*) or tags (BVA)")
+    parser.add_argument("-j", "--workers", type=int, default=runner.DEFAULT_WORKERS,
+                        help="number of worker processes")
+    parser.add_argument("--levels", nargs="+", choices=sorted(runner.LEVEL_PATTERNS),
+                        default=sorted(runner.LEVEL_PATTERNS), help="levels to search (default: all)")
+    parser.add_argument("--log-dir", default=runner.DEFAULT_LOG_DIR,
+                        help="where each worker writes its console output")
+    parser.add_argument("--list", action="store_true", help="only print the selected rows")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the cached index")
+    runner.add_history_arguments(parser)
+    args = parser.parse_args(argv)
+
+    entries = load_index(args.levels, args.rebuild)
+    selected = select(entries, args.patterns) if args.patterns else entries
+    if args.list or not args.patterns:
+        for entry in selected:
+            target = (f"{entry['path']}::{entry['class_name']}::{entry['method']}" if entry["method"]
+                      else f"{entry['path']} (script-style, run the whole file)")
+            print(f"{entry['id']:<16} {','.join(entry['tags']):<28} {target}")
+        print(f"{len(selected)} rows")
+        return 0
+
+    skipped = [entry["id"] for entry in selected if entry["method"] is None]
+    if skipped:
+        print(f"Script-style rows, not runnable one by one: {', '.join(skipped)}")
+    refs = to_refs(selected)
+    if not refs:
+        print("No runnable tests match " + " ".join(args.patterns))
+        return 1
+
+    started = time.perf_counter()
+    records = runner.run(refs, args.workers, args.log_dir, args.failed_first, not args.no_history)
+    runner.print_summary(records, args.workers, time.perf_counter() - started)
+    print(f"Worker logs: {os.path.abspath(args.log_dir)}")
+    print(f"Results: {runner.results.run_dir()}")
+    return 0 if all(r["status"] in ("passed", "skipped") for r in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Authenticated-session cache
+Logs in through the UI once per worker process, captures cookies and localStorage,
+and restores them into later browsers instead of driving the login form again
+
+Only for tests where "already logged in" is a precondition - tests that exercise
+login itself keep the UI path.
+
+Usage:
+    session_cache.ensure_session(driver, ('saucedemo', user, pwd), ui_login,
+                                 landing_url, is_logged_in)
+"""
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+# key -> {'origin', 'cookies', 'local_storage'}
+_sessions = {}
+
+LOCAL_STORAGE_READ_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+LOCAL_STORAGE_WRITE_SCRIPT = """
+var items = arguments[0];
+Object.keys(items).forEach(function (key) { window.localStorage.setItem(key, items[key]); });
+"""
+
+
+def origin_of(url):
+    """scheme://host/ part of a URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def capture(driver):
+    """Snapshot the cookies and localStorage of the page the driver is on"""
+    return {
+        'origin': origin_of(driver.current_url),
+        'cookies': driver.get_cookies(),
+        'local_storage': driver.execute_script(LOCAL_STORAGE_READ_SCRIPT) or {},
+    }
+
+
+def _set_cookies_cdp(driver, cookies):
+    """Install cookies for any domain without navigating first; False if CDP is unavailable"""
+    params = []
+    for cookie in cookies:
+        param = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                 if key in cookie}
+        if 'expiry' in cookie:
+            param['expires'] = cookie['expiry']
+        if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+            param['sameSite'] = cookie['sameSite']
+        params.append(param)
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+        return True
+    except (AttributeError, WebDriverException):
+        return False
+
+
+def restore(driver, session, landing_url):
+    """Put a captured session into the driver and open landing_url"""
+    on_origin = False
+    if not _set_cookies_cdp(driver, session['cookies']):
+        # add_cookie only works for the domain of the current page
+        driver.get(session['origin'])
+        on_origin = True
+        for cookie in session['cookies']:
+            driver.add_cookie(cookie)
+
+    if session['local_storage']:
+        if not on_origin:
+            driver.get(session['origin'])
+        driver.execute_script(LOCAL_STORAGE_WRITE_SCRIPT, session['local_storage'])
+
+    driver.get(landing_url)
+
+
+def ensure_session(driver, key, login, landing_url, is_logged_in):
+    """Make the driver logged in, from the cache if possible
+
+    login() drives the UI login form; is_logged_in() checks the page the driver is on.
+    A cached session that no longer works is dropped and replaced by a fresh UI login.
+    Returns True if the driver ends up logged in.
+    """
+    session = _sessions.get(key)
+    if session is not None:
+        restore(driver, session, landing_url)
+        if is_logged_in():
+            return True
+        invalidate(key)
+
+    login()
+    if not is_logged_in():
+        return False
+    _sessions[key] = capture(driver)
+    return True
+
+
+def invalidate(key=None):
+    """Forget one cached session, or all of them"""
+    if key is None:
+        _sessions.clear()
+    else:
+        _sessions.pop(key, None)
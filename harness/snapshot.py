@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Single round-trip DOM snapshot
+Reads presence, match count and text of several locators with one execute_script call
+instead of a find_element + .text round trip per element
+"""
+from harness.locators import normalize
+
+# findAll(by, value): every element matching a Selenium locator, for the scripts here and in harness/batching.py
+FIND_ALL_FUNCTION = """
+function findAll(by, value) {
+    switch (by) {
+    case 'xpath':
+        var found = document.evaluate(value, document, null,
+                                      XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+        return nodes;
+    case 'css selector':
+        return Array.prototype.slice.call(document.querySelectorAll(value));
+    case 'id':
+        return Array.prototype.slice.call(document.querySelectorAll('#' + CSS.escape(value)));
+    case 'name':
+        return Array.prototype.slice.call(
+            document.querySelectorAll('[name="' + value.replace(/"/g, '\\\\"') + '"]'));
+    case 'class name':
+        return Array.prototype.slice.call(document.querySelectorAll('.' + CSS.escape(value)));
+    case 'tag name':
+        return Array.prototype.slice.call(document.getElementsByTagName(value));
+    case 'link text':
+    case 'partial link text':
+        return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+            var text = (a.innerText || '').trim();
+            return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+        });
+    }
+    throw new Error('Unsupported locator type: ' + by);
+}
+"""
+
+SNAPSHOT_SCRIPT = """
+var specs = arguments[0], result = {};
+""" + FIND_ALL_FUNCTION + """
+Object.keys(specs).forEach(function (key) {
+    var nodes = findAll(specs[key][0], specs[key][1]);
+    result[key] = {
+        present: nodes.length > 0,
+        count: nodes.length,
+        text: nodes.length ? (nodes[0].innerText || '').trim() : null
+    };
+});
+return result;
+"""
+
+
+def take(driver, locators, keys=None):
+    """Snapshot the given locator keys in one round trip
+
+    Returns {key: {'present': bool, 'count': int, 'text': str or None}}.
+    """
+    if keys is None:
+        keys = list(locators)
+    specs = {key: list(normalize(locators[key])) for key in keys}
+    return driver.execute_script(SNAPSHOT_SCRIPT, specs)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive explicit-wait timeouts
+Every wait made through wait_for() records how long the condition actually took,
+keyed by suite and locator (e.g. 'price_filter:min_price_input'). Once a key has
+MIN_SAMPLES observations its timeout becomes
+
+    PERCENTILE of the observed latencies * FACTOR + MARGIN
+
+clamped between FLOOR and the timeout configured by the suite (itself capped at
+HARD_CAP). A wait fails at its learned timeout, so a broken page fails in a few seconds.
+A wait that times out is recorded at the limit it hit, which raises the learned value
+for the next runs - a slow day costs a few failures, then the timeouts catch up.
+ADAPTIVE_TIMEOUTS=soft makes the learned timeout a soft deadline instead: a wait that
+outlives it is reported as slow and keeps waiting up to the configured value, and its
+real latency is recorded. =off uses the configured timeouts unchanged and learns nothing new.
+Observations are kept in the history database (harness/history.py), written at exit.
+
+    element = timeouts.wait_for(driver, 'login:username_field',
+                                EC.presence_of_element_located(locator), configured=10)
+"""
+import atexit
+import math
+import os
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from harness import history, waits
+
+# ========== TIMEOUT SETTINGS ==========
+ADAPTIVE_ENV = "ADAPTIVE_TIMEOUTS"
+PERCENTILE = 0.95
+FACTOR = 1.5            # head room on top of the percentile
+MARGIN = 1.0            # seconds, absorbs jitter on very fast waits
+FLOOR = 2.0             # never wait less than this
+HARD_CAP = 30.0         # never wait longer than this, whatever a config says
+MIN_SAMPLES = 5         # observations needed before a key is adapted
+SAMPLE_WINDOW = 50      # latest observations used per key
+
+_samples = None         # wait_key -> latest observed latencies (seconds)
+_pending = []           # observations not written to the database yet
+_lock = threading.Lock()
+
+
+def enabled():
+    return (os.environ.get(ADAPTIVE_ENV) or "on").lower() not in ("off", "0", "false", "no")
+
+
+def soft_deadline():
+    """True if waits keep going past the learned timeout, up to the configured one"""
+    return (os.environ.get(ADAPTIVE_ENV) or "on").lower() == "soft"
+
+
+def _observed():
+    global _samples
+    with _lock:
+        if _samples is None:
+            _samples = history.wait_samples(SAMPLE_WINDOW)
+        return _samples
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def timeout(key, configured):
+    """Learned timeout of key: from history, the configured value at most"""
+    cap = min(float(configured), HARD_CAP)
+    if not enabled():
+        return cap
+    observed = _observed().get(key, ())
+    if len(observed) < MIN_SAMPLES:
+        return cap
+    learned = percentile(observed, PERCENTILE) * FACTOR + MARGIN
+    return min(cap, max(FLOOR, learned))
+
+
+def limits(key, configured):
+    """(soft, hard) deadlines of a wait, in seconds; the hard one is where it fails"""
+    soft = timeout(key, configured)
+    hard = min(float(configured), HARD_CAP) if soft_deadline() else soft
+    return soft, hard
+
+
+def record(key, seconds):
+    """Remember one observed wait latency"""
+    observed = _observed()
+    with _lock:
+        latest = observed.setdefault(key, [])
+        latest.insert(0, seconds)
+        del latest[SAMPLE_WINDOW:]
+        _pending.append((key, seconds))
+
+
+def wait_for(driver, key, condition, configured):
+    """WebDriverWait(...).until(condition) with the adaptive timeout of key
+
+    The implicit wait is suspended meanwhile, otherwise every poll of a missing
+    element would block for the implicit wait instead of the adaptive timeout.
+    """
+    soft, hard = limits(key, configured)
+    started = time.perf_counter()
+    with waits.no_implicit_wait(driver):
+        try:
+            result = WebDriverWait(driver, soft).until(condition)
+        except TimeoutException:
+            if hard <= soft:
+                raise timed_out(key, soft, configured) from None
+            report_slow(key, soft)
+            try:
+                result = WebDriverWait(driver, hard - (time.perf_counter() - started)).until(condition)
+            except TimeoutException:
+                raise timed_out(key, hard, configured) from None
+    record(key, time.perf_counter() - started)
+    return result
+
+
+def report_slow(key, soft):
+    print(f"[timeouts] '{key}' slower than its learned {soft:.1f}s, waiting up to the configured timeout")
+
+
+def timed_out(key, limit, configured):
+    """TimeoutException for a wait that hit its hard deadline, recorded at that limit"""
+    record(key, limit)
+    return TimeoutException(f"'{key}' not ready after {limit:.1f}s (configured {configured}s)")
+
+
+def flush():
+    """Write pending observations to the history database"""
+    with _lock:
+        samples = list(_pending)
+        _pending.clear()
+    if samples:
+        history.record_waits(samples)
+
+
+atexit.register(flush)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Per-step timing instrumentation
+Each test records how long its phases took (driver acquire, navigation, input,
+submit, wait, assertions, teardown) and every WebDriver command it issued;
+a JSON and a JUnit XML report are written when the test process exits
+
+Usage inside a test:
+    self.timing = timing.start(self.id())
+    self.timing.step('navigation')
+    ...
+    self.timing.step('assertions')
+    ...
+    timing.finish(self.timing)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+# ========== REPORT SETTINGS ==========
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_DIR_ENV = "TIMING_REPORT_DIR"
+DEFAULT_REPORT_DIR = os.path.join(PROJECT_ROOT, "reports")
+
+_local = threading.local()
+_finished = []
+_finished_lock = threading.Lock()
+
+
+class TestTiming:
+    """Phase and WebDriver command durations of one test (one CSV row)"""
+
+    def __init__(self, test_id, row_id=None):
+        self.test_id = test_id
+        self.row_id = row_id
+        self.status = None
+        self.phases = []        # [(phase, seconds)] in execution order
+        self.commands = {}      # command -> {'count', 'total', 'max'}
+        self.duration = None
+        self.screenshot = None  # failure screenshot (harness/artifacts.py)
+        self._started = time.perf_counter()
+        self._phase = None
+        self._phase_started = None
+
+    def step(self, name):
+        """Close the current phase and start the next one"""
+        now = time.perf_counter()
+        self._close_phase(now)
+        self._phase, self._phase_started = name, now
+
+    def add_command(self, command, seconds):
+        stats = self.commands.setdefault(command, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+    def phase_totals(self, include_open=False):
+        """Seconds per phase name (a phase may be entered more than once)"""
+        totals = {}
+        phases = list(self.phases)
+        if include_open and self._phase is not None:
+            phases.append((self._phase, time.perf_counter() - self._phase_started))
+        for name, seconds in phases:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def elapsed(self):
+        """Seconds since the test started (its duration once finished)"""
+        return self.duration if self.duration is not None else time.perf_counter() - self._started
+
+    def to_record(self):
+        """The test as a harness/results.py record, for build_junit()"""
+        classname, _, name = self.test_id.rpartition('.')
+        return {
+            'suite': classname.rpartition('.')[2] or 'tests',
+            'test_id': self.row_id or name,
+            'status': self.status,
+            'reason': '',
+            'test': self.test_id,
+            'duration': self.duration,
+            'phases': self.phase_totals(),
+            'screenshot': self.screenshot,
+        }
+
+    def to_dict(self):
+        return {
+            'test_id': self.test_id,
+            'row_id': self.row_id,
+            'status': self.status,
+            'duration': self.duration,
+            'phases': self.phase_totals(),
+            'commands': self.commands,
+        }
+
+    def _close_phase(self, now):
+        if self._phase is not None:
+            self.phases.append((self._phase, now - self._phase_started))
+            self._phase = None
+
+
+def start(test_id, row_id=None):
+    """Begin timing a test; WebDriver commands are attributed to it until finish()"""
+    timing = TestTiming(test_id, row_id)
+    _local.timing = timing
+    return timing
+
+
+def current():
+    """Timing of the test running in this thread, if any"""
+    return getattr(_local, 'timing', None)
+
+
+def finish(timing, status=None):
+    """Close the last phase and keep the record for the run report
+
+    A test that never set its status did not reach its success path.
+    """
+    now = time.perf_counter()
+    timing._close_phase(now)
+    timing.duration = now - timing._started
+    if status is not None:
+        timing.status = status
+    if timing.status is None:
+        timing.status = 'failed'
+    if current() is timing:
+        _local.timing = None
+    with _finished_lock:
+        _finished.append(timing)
+
+
+def last_finished(test_id):
+    """Most recent finished timing of a test, or None"""
+    with _finished_lock:
+        return next((t for t in reversed(_finished) if t.test_id == test_id), None)
+
+
+def instrument(driver):
+    """Time every WebDriver command the driver sends (idempotent)"""
+    if getattr(driver, '_timing_instrumented', False):
+        return driver
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            timing = current()
+            if timing is not None:
+                timing.add_command(driver_command, time.perf_counter() - started)
+
+    driver.execute = timed_execute
+    driver._timing_instrumented = True
+    return driver
+
+
+def build_report(timings):
+    """Per-row records plus run-wide phase and command totals"""
+    phase_totals, command_totals = {}, {}
+    for timing in timings:
+        for name, seconds in timing.phase_totals().items():
+            phase_totals[name] = phase_totals.get(name, 0.0) + seconds
+        for command, stats in timing.commands.items():
+            total = command_totals.setdefault(command, {'count': 0, 'total': 0.0})
+            total['count'] += stats['count']
+            total['total'] += stats['total']
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'tests': [timing.to_dict() for timing in timings],
+        'phase_totals': phase_totals,
+        'command_totals': command_totals,
+    }
+
+
+def build_junit(records, name='tests'):
+    """JUnit XML of harness/results.py records, one testsuite per suite
+
+    Test time is the record's duration; phase durations, the unittest ID and the
+    screenshot (as an attachment) go to system-out. The one JUnit builder of the
+    harness: timing reports and harness/reporter.py both use it.
+    """
+    root = ET.Element('testsuites', {'name': name})
+    suites = {}
+    for record in records:
+        suite = suites.get(record['suite'])
+        if suite is None:
+            suite = suites[record['suite']] = ET.SubElement(root, 'testsuite', {'name': record['suite']})
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': record['suite'],
+            'name': str(record['test_id']),
+            'time': '%.3f' % (record.get('duration') or 0.0),
+        })
+        reason = record.get('reason') or ''
+        if record['status'] == 'failed':
+            ET.SubElement(case, 'failure', {'message': reason[:500] or 'failed'}).text = reason
+        elif record['status'] == 'errors':
+            ET.SubElement(case, 'error', {'message': reason[:500] or 'error'}).text = reason
+        elif record['status'] == 'skipped':
+            ET.SubElement(case, 'skipped', {'message': reason})
+        lines = [f"test: {record['test']}"] if record.get('test') else []
+        lines += [f"{phase}: {seconds:.3f}s" for phase, seconds in (record.get('phases') or {}).items()]
+        if record.get('screenshot'):
+            lines.append(f"[[ATTACHMENT|{record['screenshot']}]]")
+        if lines:
+            ET.SubElement(case, 'system-out').text = '\n'.join(lines)
+
+    for element in [root] + list(root):
+        counts = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+        total = 0.0
+        for case in element.iter('testcase'):
+            counts['tests'] += 1
+            total += float(case.get('time'))
+            for tag, key in (('failure', 'failures'), ('error', 'errors'), ('skipped', 'skipped')):
+                if case.find(tag) is not None:
+                    counts[key] += 1
+        for key, value in counts.items():
+            element.set(key, str(value))
+        element.set('time', '%.3f' % total)
+    return ET.ElementTree(root)
+
+
+def write_reports(directory=None):
+    """Write timing-<stamp>-<pid>.json and .xml for every finished test of this process"""
+    with _finished_lock:
+        timings = list(_finished)
+    if not timings:
+        return None
+    directory = directory or os.environ.get(REPORT_DIR_ENV, DEFAULT_REPORT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f"timing-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}")
+
+    with open(stem + '.json', 'w', encoding='utf-8') as f:
+        json.dump(build_report(timings), f, indent=2)
+    build_junit([timing.to_record() for timing in timings], 'timing').write(
+        stem + '.xml', encoding='utf-8', xml_declaration=True)
+    return stem
+
+
+atexit.register(write_reports)
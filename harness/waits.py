@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Event-driven page-settle waiter
+Replaces fixed time.sleep calls: returns as soon as the page is quiet,
+with the old fixed delay kept only as a fallback ceiling
+"""
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# ========== SETTLE SETTINGS ==========
+DEFAULT_QUIET_MS = 300      # no DOM mutation for this long counts as quiet
+POLL_FREQUENCY = 0.1
+
+# Installs the page probe once per document and reports its state.
+# Pending requests are counted from XHR/fetch hooks plus jQuery.active (OpenCart uses
+# jQuery ajax); beforeunload marks a navigation in progress so the old, already quiet
+# document is never reported as settled after a click that submits or follows a link.
+SETTLE_SCRIPT = """
+var s = window.__settle;
+if (!s) {
+    s = window.__settle = {pending: 0, leaving: false, lastMutation: Date.now()};
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        s.pending++;
+        this.addEventListener('loadend', function () { s.pending--; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            s.pending++;
+            return originalFetch.apply(this, arguments).finally(function () { s.pending--; });
+        };
+    }
+    window.addEventListener('beforeunload', function () { s.leaving = true; });
+    if (document.documentElement) {
+        new MutationObserver(function () { s.lastMutation = Date.now(); }).observe(
+            document.documentElement,
+            {childList: true, subtree: true, attributes: true, characterData: true}
+        );
+    }
+}
+return {
+    ready: document.readyState,
+    leaving: s.leaving,
+    pending: s.pending + (window.jQuery && window.jQuery.active ? window.jQuery.active : 0),
+    quietFor: Date.now() - s.lastMutation
+};
+"""
+
+
+@contextmanager
+def no_implicit_wait(driver):
+    """Temporarily zero the implicit wait so absent elements are reported instantly"""
+    previous = driver.timeouts.implicit_wait
+    driver.implicitly_wait(0)
+    try:
+        yield driver
+    finally:
+        driver.implicitly_wait(previous)
+
+
+def page_state(driver):
+    """Return the page probe state (readyState, pending requests, ms since last mutation)"""
+    return driver.execute_script(SETTLE_SCRIPT)
+
+
+def is_settled(driver, quiet_ms=DEFAULT_QUIET_MS, locator=None):
+    """One-shot check: document loaded, no pending XHR/fetch, DOM quiet, locator present"""
+    try:
+        state = page_state(driver)
+    except WebDriverException:
+        # navigation in progress - the script context is being torn down
+        return False
+
+    if state['ready'] != 'complete' or state['leaving']:
+        return False
+    if state['pending'] > 0 or state['quietFor'] < quiet_ms:
+        return False
+    if locator is not None and not driver.find_elements(*locator):
+        return False
+    return True
+
+
+def wait_until_settled(driver, ceiling, quiet_ms=DEFAULT_QUIET_MS, locator=None):
+    """Wait until the page has settled, never longer than ceiling seconds
+
+    Returns True when the page settled and False when the ceiling was reached;
+    hitting the ceiling is not an error, it simply restores the old fixed delay.
+    """
+    with no_implicit_wait(driver):
+        try:
+            WebDriverWait(driver, ceiling, poll_frequency=POLL_FREQUENCY).until(
+                lambda d: is_settled(d, quiet_ms, locator)
+            )
+            return True
+        except TimeoutException:
+            return False
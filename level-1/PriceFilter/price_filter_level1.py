@@ -14,8 +14,13 @@ import csv
 import time
 import re
 import os
+import sys
 from ddt import ddt, data, unpack
 
+# Add the project root to the Python path to find the shared result sink
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from harness import results
+
 
 def load_test_data():
     """Load test data from CSV file"""
@@ -33,19 +38,9 @@ def load_test_data():
 @ddt
 class PriceFilterLevel1(unittest.TestCase):
     
-    # Class variables to track test results
-    test_results = {
-        'passed': [],
-        'failed': [],
-        'errors': []
-    }
-    total_tests = 0
-    
     @classmethod
     def setUpClass(cls):
         """Set up before all tests"""
-        cls.test_results = {'passed': [], 'failed': [], 'errors': []}
-        cls.total_tests = 0
         print("\n" + "="*60)
         print("Starting Level 1 Test Execution")
         print("="*60)
@@ -65,7 +60,6 @@ class PriceFilterLevel1(unittest.TestCase):
         """Test price filter with data from CSV - runs once per test case"""
         
         self.current_test_id = test_case['test_case_id']
-        PriceFilterLevel1.total_tests += 1
         
         print(f"\n{'='*60}")
         print(f"Running: {test_case['test_case_id']}")
@@ -185,22 +179,16 @@ class PriceFilterLevel1(unittest.TestCase):
             print(f" Test Case {test_case['test_case_id']} PASSED")
             
             # Record success
-            PriceFilterLevel1.test_results['passed'].append(self.current_test_id)
+            results.report('PriceFilterLevel1', self.current_test_id, 'passed')
         
         except AssertionError as e:
             print(f" Test Case {test_case['test_case_id']} FAILED: {str(e)}")
-            PriceFilterLevel1.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('PriceFilterLevel1', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
             print(f" Test Case {test_case['test_case_id']} ERROR: {str(e)}")
-            PriceFilterLevel1.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('PriceFilterLevel1', self.current_test_id, 'errors', str(e))
             raise
     
     def tearDown(self):
@@ -210,28 +198,7 @@ class PriceFilterLevel1(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Print summary after all tests"""
-        print("\n" + "="*60)
-        print("TEST EXECUTION SUMMARY - LEVEL 1")
-        print("="*60)
-        print(f"Total Tests: {cls.total_tests}")
-        print(f"Passed: {len(cls.test_results['passed'])}")
-        print(f"Failed: {len(cls.test_results['failed'])}")
-        print(f"Errors: {len(cls.test_results['errors'])}")
-        print("="*60)
-    
-        if cls.test_results['failed']:
-            print("\n FAILED TEST CASES:")
-            for failure in cls.test_results['failed']:
-                print(f"  - {failure['test_id']}")
-                print(f"    Reason: {failure['reason']}")
-        
-        if cls.test_results['errors']:
-            print("\n ERROR TEST CASES:")
-            for error in cls.test_results['errors']:
-                print(f"  - {error['test_id']}")
-                print(f"    Reason: {error['reason']}")
-        
-        print("\n" + "="*60 + "\n")
+        results.print_suite_summary('PriceFilterLevel1', "TEST EXECUTION SUMMARY - LEVEL 1")
 
 
 if __name__ == "__main__":
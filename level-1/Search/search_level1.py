@@ -12,8 +12,13 @@ import unittest
 import csv
 import time
 import os
+import sys
 from ddt import ddt, data, unpack
 
+# Add the project root to the Python path to find the shared result sink
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from harness import results
+
 
 def load_test_data1():
     """Load test data from CSV file 1"""
@@ -42,19 +47,9 @@ def load_test_data2():
 @ddt
 class SearchLevel1(unittest.TestCase):
     
-    # Class variables to track test results
-    test_results = {
-        'passed': [],
-        'failed': [],
-        'errors': []
-    }
-    total_tests = 0
-    
     @classmethod
     def setUpClass(cls):
         """Set up before all tests"""
-        cls.test_results = {'passed': [], 'failed': [], 'errors': []}
-        cls.total_tests = 0
         print("\n" + "="*60)
         print("Starting Level 1 Search Test Execution")
         print("="*60)
@@ -74,7 +69,6 @@ class SearchLevel1(unittest.TestCase):
         """Test search functionality with single search term from CSV"""
         
         self.current_test_id = test_case['TC_ID']
-        SearchLevel1.total_tests += 1
         
         print(f"\n{'='*60}")
         print(f"Running: {test_case['TC_ID']}")
@@ -183,22 +177,16 @@ class SearchLevel1(unittest.TestCase):
             print(f" Test Case {test_case['TC_ID']} PASSED")
             
             # Record success
-            SearchLevel1.test_results['passed'].append(self.current_test_id)
+            results.report('SearchLevel1', self.current_test_id, 'passed')
         
         except AssertionError as e:
             print(f" Test Case {test_case['TC_ID']} FAILED: {str(e)}")
-            SearchLevel1.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('SearchLevel1', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
             print(f" Test Case {test_case['TC_ID']} ERROR: {str(e)}")
-            SearchLevel1.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('SearchLevel1', self.current_test_id, 'errors', str(e))
             raise
     
     @data(*load_test_data2())
@@ -206,7 +194,6 @@ class SearchLevel1(unittest.TestCase):
         """Test search functionality with two consecutive search terms from CSV"""
         
         self.current_test_id = test_case['TC_ID']
-        SearchLevel1.total_tests += 1
         
         print(f"\n{'='*60}")
         print(f"Running: {test_case['TC_ID']}")
@@ -363,22 +350,16 @@ class SearchLevel1(unittest.TestCase):
             print(f"\n Test Case {test_case['TC_ID']} PASSED")
             
             # Record success
-            SearchLevel1.test_results['passed'].append(self.current_test_id)
+            results.report('SearchLevel1', self.current_test_id, 'passed')
         
         except AssertionError as e:
             print(f" Test Case {test_case['TC_ID']} FAILED: {str(e)}")
-            SearchLevel1.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('SearchLevel1', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
             print(f" Test Case {test_case['TC_ID']} ERROR: {str(e)}")
-            SearchLevel1.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            results.report('SearchLevel1', self.current_test_id, 'errors', str(e))
             raise
     
     def tearDown(self):
@@ -388,28 +369,7 @@ class SearchLevel1(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Print summary after all tests"""
-        print("\n" + "="*60)
-        print("TEST EXECUTION SUMMARY - LEVEL 1 SEARCH")
-        print("="*60)
-        print(f"Total Tests: {cls.total_tests}")
-        print(f"Passed: {len(cls.test_results['passed'])}")
-        print(f"Failed: {len(cls.test_results['failed'])}")
-        print(f"Errors: {len(cls.test_results['errors'])}")
-        print("="*60)
-    
-        if cls.test_results['failed']:
-            print("\n FAILED TEST CASES:")
-            for failure in cls.test_results['failed']:
-                print(f"  - {failure['test_id']}")
-                print(f"    Reason: {failure['reason']}")
-        
-        if cls.test_results['errors']:
-            print("\n ERROR TEST CASES:")
-            for error in cls.test_results['errors']:
-                print(f"  - {error['test_id']}")
-                print(f"    Reason: {error['reason']}")
-        
-        print("\n" + "="*60 + "\n")
+        results.print_suite_summary('SearchLevel1', "TEST EXECUTION SUMMARY - LEVEL 1 SEARCH")
 
 
 if __name__ == "__main__":
@@ -1,30 +1,35 @@
 # -*- coding: utf-8 -*-
 import unittest
-import csv
 import json
-import time
+import os
+import sys
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import (
     NoSuchElementException,
     NoAlertPresentException,
     TimeoutException,
 )
 
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from harness import artifacts, browser, data_source, locators, replay, results, snapshot, timeouts, timing, waits
+
 
 class AddToCartTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        service = Service(r"D:\drivers\chromedriver.exe")   # chỉnh nếu khác
-        cls.driver = webdriver.Chrome(service=service)
-        cls.driver.implicitly_wait(10)
-
         with open("add_to_cart_config.json", encoding="utf-8") as f:
-            cls.config = json.load(f)
+            cls.config = replay.rewrite_config(json.load(f))
+        replay.use_cassette(f"{cls.__module__}.{cls.__name__}")
+        cls.locators = locators.register("add_to_cart", cls.config["elements"])
+
+        cls.driver = browser.create_driver(
+            cls.config["browser_profile"], driver_path=cls.config["driver_path"]
+        )
+        cls.driver.implicitly_wait(10)
 
         cls.base_url = cls.config["url"]
         cls.accept_next_alert = True
@@ -32,20 +37,20 @@ class AddToCartTest(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         cls.driver.quit()
+        results.print_suite_summary("AddToCartTest", "TEST EXECUTION SUMMARY - LEVEL 2 ADD TO CART")
 
-    def get_element(self, key):
-        element = self.__class__.config["elements"][key]
-        by_map = {
-            "xpath": By.XPATH,
-            "id": By.ID,
-            "css": By.CSS_SELECTOR,
-            "link_text": By.LINK_TEXT,
-        }
-        return by_map[element["by"]], element["value"]
+    def setUp(self):
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+
+    def tearDown(self):
+        timing.finish(self.timing)
+
+    def get_element(self, key, **params):
+        return self.__class__.locators.get(key, **params)
 
     def apply_filter(self, filter_key):
         driver = self.__class__.driver
-        wait = WebDriverWait(driver, 10)
 
         by_tile, loc_tile = self.get_element("product_tile")
         tiles = driver.find_elements(by_tile, loc_tile)
@@ -55,17 +60,35 @@ class AddToCartTest(unittest.TestCase):
             driver.find_element(*self.get_element(filter_key)).click()
             if first_tile is not None:
                 try:
-                    wait.until(EC.staleness_of(first_tile))
+                    timeouts.wait_for(driver, "add_to_cart:product_grid_refresh",
+                                      EC.staleness_of(first_tile), self.config["explicit_wait"])
                 except TimeoutException:
                     pass
         except NoSuchElementException:
             pass
 
+    def run_row(self, tc_id, run, *args):
+        """Run one CSV row, capture evidence if it fails and report it to the result sink"""
+        try:
+            run(tc_id, *args)
+        except AssertionError as e:
+            self.timing.status = "failed"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("AddToCartTest", tc_id, "failed", str(e))
+            raise
+        except Exception as e:
+            self.timing.status = "errors"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("AddToCartTest", tc_id, "errors", str(e))
+            raise
+        results.report("AddToCartTest", tc_id, "passed")
+
     def run_add_to_cart_test(self, tc_id, product, quantity,
                              size_option, stock_status, expected_message):
         driver = self.__class__.driver
-        wait = WebDriverWait(driver, 10)
+        self.timing.row_id = tc_id
 
+        self.timing.step('navigation')
         driver.get(self.__class__.base_url)
 
         if stock_status == "IN_STOCK":
@@ -80,17 +103,20 @@ class AddToCartTest(unittest.TestCase):
             self.apply_filter("filter_out_of_stock")
 
         try:
-            prod_link = wait.until(
-                EC.element_to_be_clickable((By.LINK_TEXT, product))
+            prod_link = timeouts.wait_for(
+                driver, "add_to_cart:product_link",
+                EC.element_to_be_clickable(self.get_element("product_link", product=product)),
+                self.config["explicit_wait"],
             )
             prod_link.click()
         except TimeoutException:
             try:
-                driver.find_element(By.XPATH, f"//img[@alt='{product}']").click()
+                driver.find_element(*self.get_element("product_image", product=product)).click()
             except Exception as e:
                 self.fail(f"{tc_id}: Cannot open product '{product}' - {e}")
                 return
 
+        self.timing.step('input')
         if stock_status == "IN_STOCK":
             if size_option == "Small":
                 try:
@@ -108,28 +134,30 @@ class AddToCartTest(unittest.TestCase):
                 self.fail(f"{tc_id}: Quantity input not found")
                 actual_msg = ""
             else:
+                self.timing.step('submit')
                 try:
                     driver.find_element(*self.get_element("add_to_cart_button")).click()
                 except NoSuchElementException as e:
                     self.fail(f"{tc_id}: Add to Cart button not found - {e}")
                     actual_msg = ""
                 else:
-                    time.sleep(2)     
-
-                    try:
-                        actual_msg = driver.find_element(
-                            *self.get_element("notification_message")
-                        ).text.strip()
-                    except NoSuchElementException:
-                        actual_msg = ""
-
-                    if not actual_msg:
-                        try:
-                            actual_msg = driver.find_element(
-                                *self.get_element("size_error_message")
-                            ).text.strip()
-                        except NoSuchElementException:
-                            actual_msg = ""
+                    self.timing.step('wait')
+                    waits.wait_until_settled(
+                        driver, self.__class__.config["wait_times"]["after_add_to_cart"]
+                    )
+                    self.timing.step('assertions')
+
+                    # read both possible messages in one round trip
+                    result = snapshot.take(
+                        driver,
+                        self.__class__.config["elements"],
+                        ["notification_message", "size_error_message"],
+                    )
+                    actual_msg = (
+                        result["notification_message"]["text"]
+                        or result["size_error_message"]["text"]
+                        or ""
+                    )
         else:
             try:
                 qty_input = driver.find_element(*self.get_element("quantity_input"))
@@ -146,6 +174,7 @@ class AddToCartTest(unittest.TestCase):
             except NoSuchElementException:
                 actual_msg = ""
 
+        self.timing.step('assertions')
         actual_msg_normalized = " ".join(actual_msg.split())
         expected_message_normalized = " ".join(expected_message.split())
 
@@ -154,6 +183,7 @@ class AddToCartTest(unittest.TestCase):
             actual_msg_normalized,
             msg=f"{tc_id}: EXPECT '{expected_message}' BUT GOT '{actual_msg_normalized}'"
         )
+        self.timing.status = "passed"
 
     def is_alert_present(self):
         try:
@@ -176,25 +206,27 @@ class AddToCartTest(unittest.TestCase):
 
 
 def add_tests_from_csv():
-    with open("add_to_cart_test_data.csv", newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            def test_func(self, row=row):
-                self.run_add_to_cart_test(
-                    row["tc_id"],
-                    row["product"],
-                    row["quantity"],
-                    row["size_option"],
-                    row["stock_status"],
-                    row["expected_message"]
-                )
-
-            test_name = (
-                f"test_{row['tc_id']}_{row['product']}"
-                .replace(" ", "_")
-                .replace('"', "")
+    rows = data_source.load(
+        "add_to_cart_test_data.csv", id_column="tc_id", types={"quantity": "int_or_text"}
+    )
+    for row in rows:
+        def test_func(self, row=row):
+            self.run_row(
+                row["tc_id"],
+                self.run_add_to_cart_test,
+                row["product"],
+                row["quantity"],
+                row["size_option"],
+                row["stock_status"],
+                row["expected_message"]
             )
-            setattr(AddToCartTest, test_name, test_func)
+
+        test_name = (
+            f"test_{row['tc_id']}_{row['product']}"
+            .replace(" ", "_")
+            .replace('"', "")
+        )
+        setattr(AddToCartTest, test_name, test_func)
 
 
 add_tests_from_csv()
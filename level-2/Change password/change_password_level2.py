@@ -1,72 +1,110 @@
 # change_password_level2.py - LEVEL 2 HOÀN CHỈNH - CHẠY NGON 100%
 import unittest
-import csv
 import json
-import time
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+import sys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 
 # TỰ ĐỘNG TÌM FILE CÙNG THƯ MỤC VỚI .PY
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(CURRENT_DIR, "change_password_config.json")
 TEST_DATA_FILE = os.path.join(CURRENT_DIR, "change_password_test_data.csv")  
 
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(CURRENT_DIR)))
+
+from harness import artifacts, batching, browser, data_source, locators, replay, results, session_cache, timeouts, timing, waits
+
 class ChangePasswordTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.driver = webdriver.Chrome()
-        cls.driver.maximize_window()
-        cls.wait = WebDriverWait(cls.driver, 15)
-
         # Đọc config.json
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            cls.config = json.load(f)
+            cls.config = replay.rewrite_config(json.load(f))
+        replay.use_cassette(f"{cls.__module__}.{cls.__name__}")
+
+        cls.driver = browser.create_driver(cls.config["browser_profile"])
 
         cls.url = cls.config["url"]
         cls.elements = cls.config["elements"]
+        cls.locators = locators.register("change_password", cls.elements)
         cls.login_info = cls.config["login"]
+        # a rejected password re-renders the form: the next row types into it directly
+        cls.batch = batching.PageBatch(cls.config["password_url"], cls.locators["input_new_password"],
+                                       reset=cls.reset_form, enabled=batching.enabled(cls.config["batch_rows"]))
 
-        # Đăng nhập một lần
-        cls.driver.get(cls.url)
-        cls.login()
+        # Đăng nhập một lần (hoặc khôi phục phiên đã lưu của worker)
+        cls.ensure_logged_in()
 
     @classmethod
     def tearDownClass(cls):
+        print(cls.batch.summary())
         cls.driver.quit()
+        results.print_suite_summary("ChangePasswordTest", "TEST EXECUTION SUMMARY - LEVEL 2 CHANGE PASSWORD")
+
+    def setUp(self):
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+
+    def tearDown(self):
+        timing.finish(self.timing)
+
+    @classmethod
+    def ensure_logged_in(cls):
+        if not cls.config["reuse_session"]:
+            cls.ui_login()
+            return
+        session_cache.ensure_session(
+            cls.driver,
+            ("lambdatest", cls.login_info["email"], cls.login_info["password"]),
+            cls.ui_login,
+            cls.config["account_url"],
+            cls.is_logged_in,
+        )
+
+    @classmethod
+    def ui_login(cls):
+        cls.driver.get(cls.url)
+        cls.login()
+
+    @classmethod
+    def is_logged_in(cls):
+        # OpenCart redirects account pages to the login form when the session is gone
+        return cls.config["account_url"] in cls.driver.current_url
 
     @classmethod
     def login(cls):
         try:
-            cls.driver.find_element(By.XPATH, cls.elements["my_account_dropdown"]["value"]).click()
-            cls.driver.find_element(By.LINK_TEXT, cls.elements["login_link"]["value"]).click()
+            cls.driver.find_element(*cls.locators["my_account_dropdown"]).click()
+            cls.driver.find_element(*cls.locators["login_link"]).click()
 
-            cls.driver.find_element(By.ID, cls.elements["input_email"]["value"]).send_keys(cls.login_info["email"])
-            cls.driver.find_element(By.ID, cls.elements["input_password_login"]["value"]).send_keys(cls.login_info["password"])
-            cls.driver.find_element(By.XPATH, cls.elements["btn_login"]["value"]).click()
-            time.sleep(3)
+            cls.driver.find_element(*cls.locators["input_email"]).send_keys(cls.login_info["email"])
+            cls.driver.find_element(*cls.locators["input_password_login"]).send_keys(cls.login_info["password"])
+            cls.driver.find_element(*cls.locators["btn_login"]).click()
+            waits.wait_until_settled(cls.driver, cls.config["wait_times"]["after_login"])
             print("[INFO] Login successful!")
         except Exception as e:
             print("[INFO] Already logged in or skip login")
 
     def get_element(self, key):
-        elem = self.__class__.elements[key]
-        by_map = {
-            "xpath": By.XPATH,
-            "id": By.ID,
-            "css": By.CSS_SELECTOR,
-            "link_text": By.LINK_TEXT
-        }
-        return by_map[elem["by"]], elem["value"]
+        return self.__class__.locators[key]
+
+    @classmethod
+    def reset_form(cls, driver):
+        # bỏ thông báo và giá trị của dòng trước
+        batching.remove_elements(driver, [cls.locators["alert_message"]])
+        batching.clear_fields(driver, [cls.locators["input_new_password"], cls.locators["input_confirm"]])
 
     def go_to_change_password_page(self):
+        if self.batch.reuse(self.driver):
+            return
         self.driver.find_element(*self.get_element("my_account_dropdown")).click()
         self.driver.find_element(*self.get_element("password_link")).click()
-        self.wait.until(EC.presence_of_element_located(self.get_element("input_new_password")))
+        timeouts.wait_for(self.driver, "change_password:input_new_password",
+                          EC.presence_of_element_located(self.get_element("input_new_password")),
+                          self.config["explicit_wait"])
 
     def change_password(self, new_pwd="", confirm=""):
         self.driver.find_element(*self.get_element("input_new_password")).clear()
@@ -76,41 +114,64 @@ class ChangePasswordTest(unittest.TestCase):
         self.driver.find_element(*self.get_element("btn_continue")).click()
 
     def get_alert_message(self):
-        time.sleep(2)
+        waits.wait_until_settled(self.driver, self.config["wait_times"]["after_submit"])
         try:
             msg = self.driver.find_element(*self.get_element("alert_message")).text.strip()
             return msg
         except NoSuchElementException:
             return "Success: You have modified your password!"
 
+    def run_row(self, test_id, run, *args):
+        """Chạy một dòng CSV, chụp bằng chứng khi lỗi và ghi kết quả vào result sink"""
+        try:
+            run(test_id, *args)
+        except AssertionError as e:
+            self.timing.status = "failed"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("ChangePasswordTest", test_id, "failed", str(e))
+            raise
+        except Exception as e:
+            self.timing.status = "errors"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("ChangePasswordTest", test_id, "errors", str(e))
+            raise
+        results.report("ChangePasswordTest", test_id, "passed")
+
     def test_change_password(self, test_id, new_password, confirm, expected):
         print(f"\n Running {test_id} | pwd='{new_password}' | confirm='{confirm}'")
+        self.timing.row_id = test_id
+        self.timing.step('navigation')
         self.go_to_change_password_page()
+        self.timing.step('input')
         self.change_password(new_password, confirm)
+        self.timing.step('wait')
         actual = self.get_alert_message()
+        self.timing.step('assertions')
 
         self.assertIn(
             expected,
             actual,
             msg=f"\n{test_id} FAILED!\nExpected: '{expected}'\nActual  : '{actual}'"
         )
+        self.timing.status = "passed"
         print(f"{test_id}  PASSED")
 
 # TẠO TEST CASE TỰ ĐỘNG TỪ CSV
 def create_test_functions():
-    with open(TEST_DATA_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            test_id = row["test_id"]
-            pwd = row["new_password"] if row["new_password"] else ""
-            confirm = row["confirm"] if row["confirm"] else ""
-            expected = row["expected_result"]
-
-            def test_func(self, p=pwd, c=confirm, e=expected, tid=test_id):
-                self.test_change_password(tid, p, c, e)
-
-            test_name = f"test_{test_id.replace('-', '_')}"
-            setattr(ChangePasswordTest, test_name, test_func)
+    # Success rời khỏi form nên chạy cuối; số thứ tự giữ đúng thứ tự chạy (như ddt)
+    rows = batching.group(data_source.load(TEST_DATA_FILE, id_column="test_id"),
+                          lambda row: row["expected_result"] == "Success")
+    for index, row in enumerate(rows, 1):
+        test_id = row["test_id"]
+        pwd = row["new_password"] if row["new_password"] else ""
+        confirm = row["confirm"] if row["confirm"] else ""
+        expected = row["expected_result"]
+
+        def test_func(self, p=pwd, c=confirm, e=expected, tid=test_id):
+            self.run_row(tid, self.test_change_password, p, c, e)
+
+        test_name = f"test_{index:02d}_{test_id.replace('-', '_')}"
+        setattr(ChangePasswordTest, test_name, test_func)
 
 create_test_functions()
 
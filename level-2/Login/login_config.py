@@ -2,22 +2,29 @@
 """
 Login config for Level 2 data-driven tests
 """
-BASE_URL = "https://www.saucedemo.com/"
+from harness import locators, replay
+
+BASE_URL = replay.rewrite_url("https://www.saucedemo.com/")
 
 # element locators: (by_type, locator_value)
-LOCATORS = {
+LOCATORS = locators.register("login", {
     "username_field": ("id", "user-name"),
     "password_field": ("id", "password"),
     "login_button": ("id", "login-button"),
     "error_message": ("css", "h3[data-test='error']"),
+    "error_close_button": ("css", ".error-button"),
     "inventory_page_marker": ("css", ".inventory_list"),
-}
+})
 
 TEST_CONFIG = {
     "implicit_wait": 10,
     "explicit_wait": 10,
     "page_load_timeout": 30,
     "browser": "chrome",
+    "browser_profile": "default",  # 'perf' for headless CI runs (BROWSER_PROFILE env var overrides)
+    "pool_size": 1,
+    "driver_scope": "class",  # one browser for the whole CSV (DRIVER_SCOPE env var overrides)
+    "batch_rows": True,       # rejected logins run back to back on the loaded form (ROW_BATCHING=off disables)
 }
 
 EXPECTED_VALUES = {
@@ -27,3 +34,9 @@ EXPECTED_VALUES = {
     "locked_out": "Epic sadface: Sorry, this user has been locked out.",
     "inventory_marker": "inventory_list"
 }
+
+# Settle ceilings (seconds) - the page-settle waiter never waits longer than these
+WAIT_TIMES = {
+    "after_navigation": 1,
+    "after_login": 1,
+}
@@ -3,90 +3,46 @@
 Level 2 Login tests (data-driven)
 Uses external configuration file for URLs, locators, and CSV test data
 """
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import unittest
-import csv
-import time
 import os
 import sys
 
 # allow config import from same folder
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from login_config import BASE_URL, LOCATORS, TEST_CONFIG, EXPECTED_VALUES
-from ddt import ddt, data
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-def load_test_data():
-    csv_path = os.path.join(os.path.dirname(__file__), 'login_test_data.csv')
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+from login_config import BASE_URL, LOCATORS, TEST_CONFIG, EXPECTED_VALUES, WAIT_TIMES
+from harness import artifacts, batching, browser, data_source, driver_pool, elements, replay, results, timeouts, timing, waits
+from ddt import ddt, data
 
 @ddt
 class LoginLevel2(unittest.TestCase):
-    test_results = {'passed': [], 'failed': [], 'errors': []}
-    total_tests = 0
-
     @classmethod
     def setUpClass(cls):
-        cls.test_results = {'passed': [], 'failed': [], 'errors': []}
-        cls.total_tests = 0
+        cls.driver_scope = driver_pool.resolve_scope(TEST_CONFIG['driver_scope'])
+        cls.class_driver = None
+        # rejected logins leave the form on screen: the next row reuses it
+        cls.batch = batching.PageBatch(BASE_URL, LOCATORS['username_field'], reset=cls.reset_form,
+                                       enabled=batching.enabled(TEST_CONFIG['batch_rows']))
         print("\n" + "="*60)
         print("Starting Login Level 2 Test Execution")
         print("="*60)
 
     def setUp(self):
-        # ---------------------------
-        # Disable ALL Chrome popups
-        # ---------------------------
-        options = webdriver.ChromeOptions()
-
-        # Disable automation infobar
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-
-        # Disable save-password popup + password leak popup
-        prefs = {
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-
-            # Disable Chrome password leak detection
-            "profile.password_manager_leak_detection": False,
-            "profile.exit_type": "Normal",
-
-            # Disable translate popup
-            "translate.enabled": False,
-
-            # Disable notification permission popups
-            "profile.default_content_setting_values.notifications": 2,
-
-            # Disable autofill
-            "autofill.profile_enabled": False,
-            "autofill.credit_card_enabled": False,
-
-            # Disable popup blocking message
-            "profile.default_content_setting_values.popups": 0,
-
-            # Disable Chrome startup restore popup
-            "profile.default_content_setting_values.automatic_downloads": 1,
-        }
-        options.add_experimental_option("prefs", prefs)
-
-        # Reduce logging
-        options.add_argument("--log-level=3")
-        options.add_argument("--disable-notifications")
-        options.add_argument("--disable-popup-blocking")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-plugins-discovery")
-
-        # Start Chrome
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.maximize_window()
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+        self.timing.step('driver_acquire')
+        self.pool = browser.get_pool(TEST_CONFIG['browser_profile'], TEST_CONFIG['pool_size'])
+        if self.driver_scope == 'class':
+            # one browser for every row of the class, cookies/storage reset between rows
+            self.driver = type(self).class_driver = self.pool.reuse(type(self).class_driver)
+        else:
+            self.driver = self.pool.acquire()
         self.driver.implicitly_wait(TEST_CONFIG['implicit_wait'])
         self.driver.set_page_load_timeout(TEST_CONFIG['page_load_timeout'])
         self.wait = WebDriverWait(self.driver, TEST_CONFIG['explicit_wait'])
@@ -94,26 +50,35 @@ class LoginLevel2(unittest.TestCase):
 
 
     def tearDown(self):
-        self.driver.quit()
+        self.timing.step('teardown')
+        if self.driver_scope != 'class':
+            self.pool.release(self.driver)
+        timing.finish(self.timing)
 
     def find_element_by_config(self, key):
-        locator_type, locator_value = LOCATORS[key]
-        by_type = getattr(By, locator_type.upper())
-        return self.driver.find_element(by_type, locator_value)
+        return self.driver.find_element(*LOCATORS[key])
 
     def wait_for_element(self, key, timeout=None):
         if timeout is None:
             timeout = TEST_CONFIG['explicit_wait']
-        locator_type, locator_value = LOCATORS[key]
-        by_type = getattr(By, locator_type.upper())
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((by_type, locator_value))
-        )
+        return timeouts.wait_for(self.driver, f"login:{key}",
+                                 EC.presence_of_element_located(LOCATORS[key]), timeout)
+
+    @staticmethod
+    def reset_form(driver):
+        """Close the previous row's error and empty both fields (React keeps its own copy)"""
+        close_button = elements.find_optional(driver, LOCATORS['error_close_button'])
+        if close_button is not None:
+            close_button.click()
+        batching.clear_fields(driver, [LOCATORS['username_field'], LOCATORS['password_field']])
 
     def do_login(self, username, password):
-        self.driver.get(BASE_URL)
-        time.sleep(1)
+        self.timing.step('navigation')
+        if not self.batch.reuse(self.driver):
+            self.driver.get(BASE_URL)
+            waits.wait_until_settled(self.driver, WAIT_TIMES['after_navigation'])
         # username
+        self.timing.step('input')
         uname = self.wait_for_element('username_field')
         uname.clear()
         if username is not None:
@@ -125,8 +90,10 @@ class LoginLevel2(unittest.TestCase):
         if password is not None:
             pwd.send_keys(password)
         # click login
+        self.timing.step('submit')
         self.find_element_by_config('login_button').click()
-        time.sleep(1)
+        self.timing.step('wait')
+        waits.wait_until_settled(self.driver, WAIT_TIMES['after_login'])
 
     def validate(self, expected):
         page = self.driver.page_source
@@ -135,7 +102,7 @@ class LoginLevel2(unittest.TestCase):
         if expected == "success":
             # presence of inventory marker
             try:
-                self.driver.find_element(*self._tuple_from_locator(LOCATORS['inventory_page_marker']))
+                self.driver.find_element(*LOCATORS['inventory_page_marker'])
                 return True
             except NoSuchElementException:
                 return False
@@ -154,51 +121,45 @@ class LoginLevel2(unittest.TestCase):
 
         return False
 
-    def _tuple_from_locator(self, loc):
-        by_type = getattr(By, loc[0].upper())
-        return (by_type, loc[1])
-
-    @data(*load_test_data())
+    # successful logins leave the form, so they run last
+    @data(*batching.group(data_source.load(
+        os.path.join(os.path.dirname(__file__), 'login_test_data.csv'),
+        id_column='test_case_id', description_column='test_description'),
+        lambda row: row['expected'] == 'success'))
     def test_login(self, test_case):
         self.current_test_id = test_case['test_case_id']
-        LoginLevel2.total_tests += 1
+        self.timing.row_id = self.current_test_id
         print(f"\nExecuting: {test_case['test_case_id']} - {test_case.get('test_description','')}")
         try:
             self.do_login(test_case['username'], test_case['password'])
+            self.timing.step('assertions')
             result = self.validate(test_case['expected'])
             if result:
                 print(f" Test Case {self.current_test_id} PASSED")
-                LoginLevel2.test_results['passed'].append(self.current_test_id)
+                results.report('LoginLevel2', self.current_test_id, 'passed')
+                self.timing.status = 'passed'
             else:
                 raise AssertionError(f"Validation failed for expected: {test_case['expected']}")
         except AssertionError as e:
+            self.timing.status = 'failed'
             print(f" Test Case {self.current_test_id} FAILED: {e}")
-            LoginLevel2.test_results['failed'].append({'test_id': self.current_test_id, 'reason': str(e)})
+            artifacts.capture(self, self.driver, str(e), TEST_CONFIG)
+            results.report('LoginLevel2', self.current_test_id, 'failed', str(e))
             raise
         except Exception as e:
+            self.timing.status = 'errors'
             print(f" Test Case {self.current_test_id} ERROR: {e}")
-            LoginLevel2.test_results['errors'].append({'test_id': self.current_test_id, 'reason': str(e)})
+            artifacts.capture(self, self.driver, str(e), TEST_CONFIG)
+            results.report('LoginLevel2', self.current_test_id, 'errors', str(e))
             raise
 
     @classmethod
     def tearDownClass(cls):
-        print("\n" + "="*60)
-        print("TEST EXECUTION SUMMARY - LOGIN LEVEL 2")
-        print("="*60)
-        print(f"Total Tests: {cls.total_tests}")
-        print(f"Passed: {len(cls.test_results['passed'])}")
-        print(f"Failed: {len(cls.test_results['failed'])}")
-        print(f"Errors: {len(cls.test_results['errors'])}")
-        print("="*60)
-        if cls.test_results['failed']:
-            print("\nFAILED TEST CASES:")
-            for f in cls.test_results['failed']:
-                print(f" - {f['test_id']}: {f['reason']}")
-        if cls.test_results['errors']:
-            print("\nERROR TEST CASES:")
-            for e in cls.test_results['errors']:
-                print(f" - {e['test_id']}: {e['reason']}")
-        print("\n" + "="*60 + "\n")
+        if cls.class_driver is not None:
+            browser.get_pool(TEST_CONFIG['browser_profile']).release(cls.class_driver)
+            cls.class_driver = None
+        print(cls.batch.summary())
+        results.print_suite_summary('LoginLevel2', "TEST EXECUTION SUMMARY - LOGIN LEVEL 2")
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
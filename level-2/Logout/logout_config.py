@@ -2,25 +2,40 @@
 """
 Logout config for Level 2 data-driven tests
 """
-BASE_URL = "https://www.saucedemo.com/"
+from harness import locators, replay
 
-LOCATORS = {
+BASE_URL = replay.rewrite_url("https://www.saucedemo.com/")
+INVENTORY_URL = BASE_URL + "inventory.html"
+
+LOCATORS = locators.register("logout", {
     "username_field": ("id", "user-name"),
     "password_field": ("id", "password"),
     "login_button": ("id", "login-button"),
     "menu_button": ("id", "react-burger-menu-btn"),
     "logout_button": ("id", "logout_sidebar_link"),
-    "login_page_marker": ("css", ".login_container")
-}
+    "login_page_marker": ("css", ".login_container"),
+    "inventory_marker": ("class_name", "inventory_list")
+})
 
 TEST_CONFIG = {
     "implicit_wait": 10,
     "explicit_wait": 10,
     "page_load_timeout": 30,
     "browser": "chrome",
+    "browser_profile": "default",  # 'perf' for headless CI runs (BROWSER_PROFILE env var overrides)
+    "pool_size": 1,
+    "reuse_session": True,  # restore a cached login instead of driving the login form
 }
 
 EXPECTED_VALUES = {
-    "logout_success": "https://www.saucedemo.com/",
+    "logout_success": BASE_URL,
     "inventory_marker": "inventory_list"
 }
+
+# Settle ceilings (seconds) - the page-settle waiter never waits longer than these
+WAIT_TIMES = {
+    "after_navigation": 1,
+    "after_login": 1,
+    "after_menu": 0.5,
+    "after_logout": 1,
+}
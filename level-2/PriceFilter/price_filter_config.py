@@ -3,13 +3,14 @@
 Configuration file for test data and element locators
 Level 2: Data-driven testing with externalized test data and element locators
 """
+from harness import locators, replay
 
-# Site URLs
-BASE_URL = "https://ecommerce-playground.lambdatest.io/"
-SEARCH_URL = "https://ecommerce-playground.lambdatest.io/index.php?route=product/search"
+# Site URLs (local proxy when REPLAY_MODE is record/replay)
+BASE_URL = replay.rewrite_url("https://ecommerce-playground.lambdatest.io/")
+SEARCH_URL = replay.rewrite_url("https://ecommerce-playground.lambdatest.io/index.php?route=product/search")
 
 # Element Locators
-LOCATORS = {
+LOCATORS = locators.register("price_filter", {
     # Search and Filter Elements
     "search_button": ("xpath", "//button[@type='submit']"),
     "min_price_input": ("xpath", "//div[@id='mz-filter-panel-0-0']/div/div[2]/input"),
@@ -33,7 +34,10 @@ LOCATORS = {
     "filter_panel": ("xpath", "//div[@id='mz-filter-panel-0-0']"),
     "apply_filter_button": ("xpath", "//button[contains(text(), 'Apply')]"),
     "clear_filter_button": ("xpath", "//button[contains(text(), 'Clear')]"),
-}
+})
+
+# Result-page elements read together in one snapshot after filtering
+RESULT_KEYS = ["first_product_price", "pagination_text", "no_product_message"]
 
 # Test Configuration
 TEST_CONFIG = {
@@ -41,6 +45,31 @@ TEST_CONFIG = {
     "explicit_wait": 10,
     "page_load_timeout": 30,
     "browser": "chrome",
+    "browser_profile": "default",  # 'perf' for headless CI runs (BROWSER_PROFILE env var overrides)
+    "pool_size": 1,
+    "driver_scope": "class",  # 'class': one browser for all rows, cookies/storage reset between rows; 'test': one per row
+    "batch_rows": True,       # UI rows type into the filter panel the previous row left (ROW_BATCHING=off disables)
+}
+
+# Navigation: "ui" opens the home page, clicks search and types into the filter;
+# "deep_link" opens SEARCH_URL with the filter's query parameters (NAVIGATION_MODE env var
+# overrides). Rows only the filter's own input validation can judge (negative, above
+# PRICE_RANGE, text, min > max) always take the UI path.
+NAVIGATION_MODE = "ui"
+FILTER_PARAMS = {"min_price": "mz_fp", "max_price": "mz_tp"}
+PRICE_RANGE = (0, 5000)
+UI_SMOKE_ROW = "TC003017"  # row the UI path smoke test runs in every mode
+
+# Boundary rows computed from a catalogue snapshot by the price oracle (harness/catalogue.py):
+#   python -m harness.catalogue crawl
+#   python -m harness.catalogue rows -o level-2/PriceFilter/price_filter_generated_data.csv
+# test_price_filter_generated has no rows until the file exists
+GENERATED_DATA_FILE = "price_filter_generated_data.csv"
+
+# Network blocking (see harness/network.py) - prices are read as text, images are never needed
+NETWORK_BLOCKING = {
+    "block": ["images", "fonts", "media", "analytics", "ads"],
+    "allow": [],
 }
 
 # Expected Values
@@ -49,4 +78,11 @@ EXPECTED_VALUES = {
     "price_pattern": r"^\$\d{1,3}(,\d{3})*\.\d{2}$",
     "pagination_pattern": r"Showing \d+ to \d+ of \d+ \(\d+ Pages\)",
     "no_product_message": "There is no product that matches the search criteria.",
-}
\ No newline at end of file
+}
+
+# Settle ceilings (seconds) - the page-settle waiter never waits longer than these
+WAIT_TIMES = {
+    "after_navigation": 2,
+    "after_search": 2,
+    "after_filter": 3,
+}
@@ -3,63 +3,54 @@
 Level 2: Advanced data-driven testing approach
 Uses external configuration file for URLs, locators, and test data
 """
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 import unittest
-import csv
-import time
 import re
 import os
 import sys
 
 # Add the current directory to the Python path to find config.py
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the project root to the Python path to find the shared harness package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from price_filter_config import BASE_URL, LOCATORS, TEST_CONFIG, EXPECTED_VALUES
+from price_filter_config import (BASE_URL, SEARCH_URL, LOCATORS, RESULT_KEYS, TEST_CONFIG, EXPECTED_VALUES,
+                                 WAIT_TIMES, NETWORK_BLOCKING, NAVIGATION_MODE, FILTER_PARAMS,
+                                 PRICE_RANGE, UI_SMOKE_ROW, GENERATED_DATA_FILE)
+from harness import artifacts, batching, browser, data_source, driver_pool, navigation, network, replay, results, snapshot, timeouts, timing, waits
 from ddt import ddt, data, unpack
 
 
-def load_test_data():
-    """Load test data from CSV file"""
-    test_data = []
-    csv_path = os.path.join(os.path.dirname(__file__), 'price_filter_test_data.csv')
-    # csv_path = os.path.join(os.path.dirname(__file__), 'test.csv')
-    
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        test_data = list(csv_reader)
-    
-    return test_data
-
-
 @ddt
 class PriceFilterLevel2(unittest.TestCase):
     
-    # Class variables to track test results
-    test_results = {
-        'passed': [],
-        'failed': [],
-        'errors': []
-    }
-    total_tests = 0
-    
     @classmethod
     def setUpClass(cls):
         """Set up before all tests"""
-        cls.test_results = {'passed': [], 'failed': [], 'errors': []}
-        cls.total_tests = 0
+        cls.driver_scope = driver_pool.resolve_scope(TEST_CONFIG['driver_scope'])
+        cls.class_driver = None
+        # every row ends on the search page, so the UI path can start from its filter panel
+        cls.batch = batching.PageBatch(SEARCH_URL, LOCATORS['filter_panel'], reset=cls.reset_results,
+                                       enabled=batching.enabled(TEST_CONFIG['batch_rows']))
         print("\n" + "="*60)
         print("Starting Level 2 Test Execution")
         print("="*60)
     
     def setUp(self):
         """Set up for each test - uses config file"""
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+        self.timing.step('driver_acquire')
+        self.pool = browser.get_pool(TEST_CONFIG['browser_profile'], TEST_CONFIG['pool_size'], network_log=True)
+        if self.driver_scope == 'class':
+            # one browser for every row of the class, cookies/storage reset between rows
+            self.driver = type(self).class_driver = self.pool.reuse(type(self).class_driver)
+        else:
+            self.driver = self.pool.acquire()
+        network.apply(self.driver, NETWORK_BLOCKING)
         self.driver.implicitly_wait(TEST_CONFIG['implicit_wait'])
         self.driver.set_page_load_timeout(TEST_CONFIG['page_load_timeout'])
         self.wait = WebDriverWait(self.driver, TEST_CONFIG['explicit_wait'])
@@ -68,21 +59,15 @@ class PriceFilterLevel2(unittest.TestCase):
     
     def find_element_by_config(self, locator_key):
         """Find element using locator from config file"""
-        locator_type, locator_value = LOCATORS[locator_key]
-        by_type = getattr(By, locator_type.upper())
-        return self.driver.find_element(by_type, locator_value)
+        return self.driver.find_element(*LOCATORS[locator_key])
     
     def wait_for_element(self, locator_key, timeout=None):
         """Wait for element using locator from config file"""
         if timeout is None:
             timeout = TEST_CONFIG['explicit_wait']
         
-        locator_type, locator_value = LOCATORS[locator_key]
-        by_type = getattr(By, locator_type.upper())
-        
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((by_type, locator_value))
-        )
+        return timeouts.wait_for(self.driver, f"price_filter:{locator_key}",
+                                 EC.presence_of_element_located(LOCATORS[locator_key]), timeout)
     
     def enter_price_values(self, min_price, max_price):
         """Enter price values in filter fields"""
@@ -100,6 +85,60 @@ class PriceFilterLevel2(unittest.TestCase):
         
         return max_field
     
+    @staticmethod
+    def reset_results(driver):
+        """Drop the previous row's results so they can't be read as this row's"""
+        batching.remove_elements(driver, [LOCATORS[key] for key in RESULT_KEYS])
+
+    def deep_link_url(self, test_case):
+        """Filtered search URL for a row, or None when the row needs the filter's input validation"""
+        params = {}
+        for column, param in FILTER_PARAMS.items():
+            value = test_case[column] or ''
+            if value and not value.isdigit():
+                return None
+            if value and not PRICE_RANGE[0] <= int(value) <= PRICE_RANGE[1]:
+                return None
+            params[param] = value or None
+        low, high = test_case['min_price'], test_case['max_price']
+        if low and high and int(low) > int(high):
+            return None
+        return navigation.with_query(SEARCH_URL, search='', **params)
+    
+    def open_filtered_results(self, test_case, mode):
+        """Get to the filtered result page - by URL in deep_link mode, else through the UI"""
+        url = self.deep_link_url(test_case) if mode == 'deep_link' else None
+        if url is not None:
+            self.timing.step('navigation')
+            self.driver.get(url)
+            self.timing.step('wait')
+            waits.wait_until_settled(self.driver, WAIT_TIMES['after_filter'])
+            return
+        
+        self.timing.step('navigation')
+        if not self.batch.reuse(self.driver):
+            # Navigate to website using config URL
+            self.driver.get(BASE_URL)
+            waits.wait_until_settled(self.driver, WAIT_TIMES['after_navigation'])
+            
+            # Click search button using config locator
+            search_btn = self.wait_for_element('search_button')
+            search_btn.click()
+            waits.wait_until_settled(self.driver, WAIT_TIMES['after_search'])
+        
+        self.timing.step('input')
+        # Enter price values
+        max_field = self.enter_price_values(
+            test_case['min_price'],
+            test_case['max_price']
+        )
+        
+        self.timing.step('submit')
+        # Apply filter
+        max_field.send_keys(Keys.ENTER)
+        self.timing.step('wait')
+        waits.wait_until_settled(self.driver, WAIT_TIMES['after_filter'])
+    
     def verify_price_format(self, price_text):
         """Verify price matches expected format"""
         pattern = EXPECTED_VALUES['price_pattern']
@@ -110,88 +149,74 @@ class PriceFilterLevel2(unittest.TestCase):
         pattern = EXPECTED_VALUES['pagination_pattern']
         return re.match(pattern, pagination_text) is not None
     
-    @data(*load_test_data())
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), 'price_filter_test_data.csv'),
+        id_column='test_case_id', types={'expected_price': 'price'}))
     def test_price_filter_with_config(self, test_case):
         """Execute test case using configuration - runs once per test case"""
-        
+        self.check_price_filter(test_case, navigation.mode(NAVIGATION_MODE))
+    
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), GENERATED_DATA_FILE),
+        id_column='test_case_id', types={'expected_price': 'price'}, optional=True))
+    @data_source.tag('generated')
+    def test_price_filter_generated(self, test_case):
+        """Oracle-computed boundary rows - all in range, so deep_link unless the NAVIGATION_MODE env var says ui"""
+        self.check_price_filter(test_case, navigation.mode('deep_link'))
+    
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), 'price_filter_test_data.csv'),
+        id_column='test_case_id', types={'expected_price': 'price'}, ids=[UI_SMOKE_ROW], tags=()))
+    @data_source.tag('smoke', 'ui')
+    def test_ui_path_smoke(self, test_case):
+        """UI path (home page, search button, typed filter) - kept whatever NAVIGATION_MODE is"""
+        self.check_price_filter(test_case, 'ui')
+    
+    def check_price_filter(self, test_case, mode):
+        """Open the filtered results for a row and verify price, pagination and message"""
         self.current_test_id = test_case['test_case_id']
-        PriceFilterLevel2.total_tests += 1
+        self.timing.row_id = self.current_test_id
         
         print(f"\n{'='*60}")
         print(f"Executing: {test_case['test_case_id']}")
         print(f"Description: {test_case['test_description']}")
         print(f"Min: {test_case['min_price']}, Max: {test_case['max_price']}")
+        print(f"Navigation: {mode}")
         print(f"{'='*60}")
         
         try:
-            # Navigate to website using config URL
-            self.driver.get(BASE_URL)
-            time.sleep(2)
-            
-            # Click search button using config locator
-            search_btn = self.wait_for_element('search_button')
-            search_btn.click()
-            time.sleep(2)
-            
-            # Enter price values
-            max_field = self.enter_price_values(
-                test_case['min_price'],
-                test_case['max_price']
-            )
-            
-            # Apply filter
-            max_field.send_keys(Keys.ENTER)
-            time.sleep(3)
-            
-            # Check what's actually displayed
-            product_price_found = False
-            pagination_found = False
-            not_found_found = False
+            self.open_filtered_results(test_case, mode)
             
-            actual_price = None
-            actual_pagination = None
-            actual_not_found = None
+            self.timing.step('assertions')
+            # Check what's actually displayed - one round trip for all result elements
+            result = snapshot.take(self.driver, LOCATORS, RESULT_KEYS)
+            product_price_found = result['first_product_price']['present']
+            pagination_found = result['pagination_text']['present']
+            not_found_found = result['no_product_message']['present']
             
-            # Try to find product price
-            try:
-                actual_price = self.find_element_by_config('first_product_price').text
-                product_price_found = True
-            except NoSuchElementException:
-                pass
-            
-            # Try to find pagination
-            try:
-                actual_pagination = self.find_element_by_config('pagination_text').text
-                pagination_found = True
-            except NoSuchElementException:
-                pass
-            
-            # Try to find "not found" message
-            try:
-                actual_not_found = self.find_element_by_config('no_product_message').text
-                not_found_found = True
-            except NoSuchElementException:
-                pass
+            actual_price = result['first_product_price']['text']
+            actual_pagination = result['pagination_text']['text']
+            actual_not_found = result['no_product_message']['text']
             
             # Verify product price
-            if test_case['expected_price'] != 'N/A':
+            if test_case['expected_price'] is not None:
                 if not product_price_found:
                     self.fail(f"Expected price {test_case['expected_price']}, but no product price found")
                 
-                self.assertEqual(actual_price, test_case['expected_price'], 
-                                f"Expected price {test_case['expected_price']}, but got {actual_price}")
                 # Verify price format
                 self.assertTrue(
                     self.verify_price_format(actual_price),
                     f"Price format invalid: {actual_price}"
                 )
+                self.assertEqual(data_source.to_price(actual_price), test_case['expected_price'],
+                                f"Expected price {test_case['expected_price']}, but got {actual_price}")
                 print(f" Price matches: {actual_price}")
             else:
                 if product_price_found:
                     self.fail(f"Expected no product price (N/A), but found: {actual_price}")
             
             # Verify pagination
-            if test_case['expected_pagination'] != 'N/A':
+            if test_case['expected_pagination'] is not None:
                 if not pagination_found:
                     self.fail(f"Expected pagination '{test_case['expected_pagination']}', but no pagination found")
                 
@@ -208,7 +233,7 @@ class PriceFilterLevel2(unittest.TestCase):
                     self.fail(f"Expected no pagination (N/A), but found: {actual_pagination}")
             
             # Verify "not found" message
-            if test_case['not_found'] != 'N/A':
+            if test_case['not_found'] is not None:
                 if not not_found_found:
                     self.fail(f"Expected 'not found' message '{test_case['not_found']}', but no message found")
                 
@@ -222,53 +247,39 @@ class PriceFilterLevel2(unittest.TestCase):
             print(f" Test Case {test_case['test_case_id']} PASSED")
             
             # Record success
-            PriceFilterLevel2.test_results['passed'].append(self.current_test_id)
+            results.report('PriceFilterLevel2', self.current_test_id, 'passed')
+            self.timing.status = 'passed'
         
         except AssertionError as e:
+            self.timing.status = 'failed'
             print(f" Test Case {test_case['test_case_id']} FAILED: {str(e)}")
-            PriceFilterLevel2.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), TEST_CONFIG)
+            results.report('PriceFilterLevel2', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
+            self.timing.status = 'errors'
             print(f" Test Case {test_case['test_case_id']} ERROR: {str(e)}")
-            PriceFilterLevel2.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), TEST_CONFIG)
+            results.report('PriceFilterLevel2', self.current_test_id, 'errors', str(e))
             raise
     
     def tearDown(self):
-        """Clean up after each test"""
-        self.driver.quit()
+        """Clean up after each test - hand the browser back to the pool"""
+        self.timing.step('teardown')
+        network.collect(self.driver)
+        if self.driver_scope != 'class':
+            self.pool.release(self.driver)
+        timing.finish(self.timing)
     
     @classmethod
     def tearDownClass(cls):
         """Print summary after all tests"""
-        print("\n" + "="*60)
-        print("TEST EXECUTION SUMMARY - LEVEL 2")
-        print("="*60)
-        print(f"Total Tests: {cls.total_tests}")
-        print(f"Passed: {len(cls.test_results['passed'])}")
-        print(f"Failed: {len(cls.test_results['failed'])}")
-        print(f"Errors: {len(cls.test_results['errors'])}")
-        print("="*60)
-        
-        if cls.test_results['failed']:
-            print("\n FAILED TEST CASES:")
-            for failure in cls.test_results['failed']:
-                print(f"  - {failure['test_id']}")
-                print(f"    Reason: {failure['reason']}")
-        
-        if cls.test_results['errors']:
-            print("\n ERROR TEST CASES:")
-            for error in cls.test_results['errors']:
-                print(f"  - {error['test_id']}")
-                print(f"    Reason: {error['reason']}")
-        
-        print("\n" + "="*60 + "\n")
+        if cls.class_driver is not None:
+            browser.get_pool(TEST_CONFIG['browser_profile'], network_log=True).release(cls.class_driver)
+            cls.class_driver = None
+        print(cls.batch.summary())
+        results.print_suite_summary('PriceFilterLevel2', "TEST EXECUTION SUMMARY - LEVEL 2")
 
 
 if __name__ == "__main__":
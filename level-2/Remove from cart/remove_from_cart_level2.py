@@ -1,13 +1,9 @@
 # -*- coding: utf-8 -*-
 import unittest
-import csv
 import json
-import time
+import os
+import sys
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     NoSuchElementException,
@@ -15,34 +11,42 @@ from selenium.common.exceptions import (
     TimeoutException,
 )
 
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from harness import artifacts, browser, cart_fixture, data_source, locators, replay, results, snapshot, timeouts, timing, waits
+
 
 class RemoveFromCartTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        service = Service(r"D:\drivers\chromedriver.exe")
-        cls.driver = webdriver.Chrome(service=service)
-        cls.driver.implicitly_wait(10)
-
         with open("remove_cart_config.json", encoding="utf-8") as f:
-            cls.config = json.load(f)
+            cls.config = replay.rewrite_config(json.load(f))
+        replay.use_cassette(f"{cls.__module__}.{cls.__name__}")
+        cls.locators = locators.register("remove_from_cart", cls.config["elements"])
+
+        cls.driver = browser.create_driver(
+            cls.config["browser_profile"], driver_path=cls.config["driver_path"]
+        )
+        cls.driver.implicitly_wait(10)
 
         cls.base_url = cls.config["url"]
         cls.accept_next_alert = True
-        cls.wait = WebDriverWait(cls.driver, 10)
 
     @classmethod
     def tearDownClass(cls):
         cls.driver.quit()
+        results.print_suite_summary("RemoveFromCartTest", "TEST EXECUTION SUMMARY - LEVEL 2 REMOVE FROM CART")
+
+    def setUp(self):
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+
+    def tearDown(self):
+        timing.finish(self.timing)
 
-    def get_element(self, key):
-        element = self.__class__.config["elements"][key]
-        by_map = {
-            "xpath": By.XPATH,
-            "id": By.ID,
-            "css": By.CSS_SELECTOR,
-            "link_text": By.LINK_TEXT,
-        }
-        return by_map[element["by"]], element["value"]
+    def get_element(self, key, **params):
+        return self.__class__.locators.get(key, **params)
 
 
     def open_home(self):
@@ -61,11 +65,10 @@ class RemoveFromCartTest(unittest.TestCase):
             if not remove_buttons:
                 break
             remove_buttons[0].click()
-            time.sleep(1)
+            waits.wait_until_settled(d, self.config["wait_times"]["after_remove"])
 
     def add_product(self, product_name, size_text=None, qty="1"):
         d = self.driver
-        wait = self.__class__.wait
 
         self.open_home()
 
@@ -85,16 +88,17 @@ class RemoveFromCartTest(unittest.TestCase):
             d.find_element(*self.get_element("filter_in_stock")).click()
             if first_tile is not None:
                 try:
-                    wait.until(EC.staleness_of(first_tile))
+                    timeouts.wait_for(d, "remove_from_cart:product_grid_refresh",
+                                      EC.staleness_of(first_tile), self.config["explicit_wait"])
                 except TimeoutException:
                     pass
         except NoSuchElementException:
             pass
 
         try:
-            d.find_element(By.LINK_TEXT, product_name).click()
+            d.find_element(*self.get_element("product_link", product=product_name)).click()
         except NoSuchElementException:
-            d.find_element(By.XPATH, f"//img[@alt='{product_name}']").click()
+            d.find_element(*self.get_element("product_image", product=product_name)).click()
 
         if size_text:
             try:
@@ -112,31 +116,52 @@ class RemoveFromCartTest(unittest.TestCase):
             pass
 
         d.find_element(*self.get_element("add_to_cart_button")).click()
-        time.sleep(2)
+        waits.wait_until_settled(d, self.config["wait_times"]["after_add_to_cart"])
 
-    def prepare_cart_for_tc(self, tc_id, initial_items):
-        self.clear_cart_completely()
-
-        initial_items = int(initial_items)
+    def seed_cart(self, items):
+        """Fill the cart over HTTP; True only if the cart page then shows every line"""
+        products = self.config["seed_products"]
+        if any(name not in products for name, _ in items):
+            return False
+        seeded = cart_fixture.seed(
+            self.driver, self.base_url,
+            [(products[name], qty) for name, qty in items],
+        )
+        if not seeded:
+            return False
+        self.open_cart_page()
+        rows = snapshot.take(self.driver, self.config["elements"], ["cart_rows"])
+        return rows["cart_rows"]["count"] == len(items)
 
+    def prepare_cart_for_tc(self, tc_id, initial_items):
         if initial_items == 0:
-            pass
+            items = []
         elif initial_items == 1:
-            self.add_product("iPod Touch", size_text=None, qty="1")
-        elif initial_items >= 2:
-            self.add_product("iPod Touch", size_text=None, qty="2")
-            self.add_product("Samsung SyncMaster 941BW", size_text=None, qty="3")
+            items = [("iPod Touch", "1")]
+        else:
+            items = [("iPod Touch", "2"), ("Samsung SyncMaster 941BW", "3")]
+
+        if self.config["seed_cart_via_http"] and self.seed_cart(items):
+            return
 
+        # UI fallback
+        self.clear_cart_completely()
+        for name, qty in items:
+            self.add_product(name, size_text=None, qty=qty)
         self.open_cart_page()
 
-    def count_cart_rows(self):
-        d = self.driver
-        by_rows, loc_rows = self.get_element("cart_rows")
-        try:
-            rows = d.find_elements(by_rows, loc_rows)
-            return len(rows)
-        except NoSuchElementException:
-            return 0
+    def read_cart_state(self):
+        """Row count, empty-cart message and Continue link in one round trip"""
+        result = snapshot.take(
+            self.driver,
+            self.config["elements"],
+            ["cart_rows", "empty_cart_message", "continue_link"],
+        )
+        return (
+            result["cart_rows"]["count"],
+            result["empty_cart_message"]["text"] or "",
+            result["continue_link"]["present"],
+        )
 
     def click_remove_once(self):
         d = self.driver
@@ -144,38 +169,39 @@ class RemoveFromCartTest(unittest.TestCase):
         remove_buttons = d.find_elements(by_rm, loc_rm)
         if remove_buttons:
             remove_buttons[0].click()
-            time.sleep(1)
+            waits.wait_until_settled(d, self.config["wait_times"]["after_remove"])
 
-    def get_empty_cart_message(self):
-        d = self.driver
-        by_msg, loc_msg = self.get_element("empty_cart_message")
-        try:
-            msg = d.find_element(by_msg, loc_msg).text
-            return msg.strip()
-        except NoSuchElementException:
-            return ""
 
-    def has_continue_link(self):
-        d = self.driver
+    def run_row(self, tc_id, run, *args):
+        """Run one CSV row, capture evidence if it fails and report it to the result sink"""
         try:
-            d.find_element(*self.get_element("continue_link"))
-            return True
-        except NoSuchElementException:
-            return False
-
+            run(tc_id, *args)
+        except AssertionError as e:
+            self.timing.status = "failed"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("RemoveFromCartTest", tc_id, "failed", str(e))
+            raise
+        except Exception as e:
+            self.timing.status = "errors"
+            artifacts.capture(self, self.driver, str(e), self.config)
+            results.report("RemoveFromCartTest", tc_id, "errors", str(e))
+            raise
+        results.report("RemoveFromCartTest", tc_id, "passed")
 
     def run_remove_cart_test(self, tc_id, initial_items,
                              remove_clicks, expected_items_after,
                              expect_empty_message):
+        self.timing.row_id = tc_id
 
+        self.timing.step('cart_setup')
         self.prepare_cart_for_tc(tc_id, initial_items)
 
-        remove_clicks = int(remove_clicks)
+        self.timing.step('submit')
         for _ in range(remove_clicks):
             self.click_remove_once()
 
-        expected_items_after = int(expected_items_after)
-        actual_items_after = self.count_cart_rows()
+        self.timing.step('assertions')
+        actual_items_after, empty_msg, continue_exists = self.read_cart_state()
         self.assertEqual(
             expected_items_after,
             actual_items_after,
@@ -183,8 +209,6 @@ class RemoveFromCartTest(unittest.TestCase):
         )
 
         expect_empty = (expect_empty_message.strip().upper() == "YES")
-        empty_msg = self.get_empty_cart_message()
-        continue_exists = self.has_continue_link()
 
         if expect_empty:
             self.assertEqual(
@@ -202,6 +226,7 @@ class RemoveFromCartTest(unittest.TestCase):
                 empty_msg,
                 msg=f"{tc_id}: Cart should NOT be empty"
             )
+        self.timing.status = "passed"
 
     def is_alert_present(self):
         try:
@@ -224,20 +249,24 @@ class RemoveFromCartTest(unittest.TestCase):
 
 
 def add_tests_from_csv():
-    with open("remove_from_cart_test_data.csv", newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            def test_func(self, row=row):
-                self.run_remove_cart_test(
-                    row["tc_id"],
-                    row["initial_items"],
-                    row["remove_clicks"],
-                    row["expected_items_after"],
-                    row["expect_empty_message"],
-                )
-
-            test_name = f"test_{row['tc_id']}"
-            setattr(RemoveFromCartTest, test_name, test_func)
+    rows = data_source.load(
+        "remove_from_cart_test_data.csv",
+        id_column="tc_id",
+        types={"initial_items": "int", "remove_clicks": "int", "expected_items_after": "int"},
+    )
+    for row in rows:
+        def test_func(self, row=row):
+            self.run_row(
+                row["tc_id"],
+                self.run_remove_cart_test,
+                row["initial_items"],
+                row["remove_clicks"],
+                row["expected_items_after"],
+                row["expect_empty_message"],
+            )
+
+        test_name = f"test_{row['tc_id']}"
+        setattr(RemoveFromCartTest, test_name, test_func)
 
 
 add_tests_from_csv()
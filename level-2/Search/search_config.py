@@ -6,22 +6,66 @@ Contains all URLs, locators, test data paths, and configuration settings
 
 from selenium.webdriver.common.by import By
 
+from harness import locators, replay
+
 # ========== BASE CONFIGURATION ==========
-BASE_URL = "https://ecommerce-playground.lambdatest.io/"
+BASE_URL = replay.rewrite_url("https://ecommerce-playground.lambdatest.io/")
+SEARCH_URL = replay.rewrite_url("https://ecommerce-playground.lambdatest.io/index.php?route=product/search")
 
 # ========== TIMEOUT SETTINGS ==========
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 15
 PAGE_LOAD_TIMEOUT = 30
 
+# ========== BROWSER ==========
+BROWSER_PROFILE = 'default'  # 'perf' = headless, no images/fonts (BROWSER_PROFILE env var overrides)
+POOL_SIZE = 1  # browsers kept alive and reused across tests
+DRIVER_SCOPE = 'class'  # 'class': one browser for all rows, cookies/storage reset between rows; 'test': one per row
+
+# ========== NAVIGATION ==========
+# 'ui' types into the home page search box; 'deep_link' opens SEARCH_URL&search=<term>
+# directly (NAVIGATION_MODE env var overrides). The UI path keeps its own smoke test.
+NAVIGATION_MODE = 'ui'
+UI_SMOKE_ROW = 'TC004001'
+# search_level2_async.py: rows fanned out across this many tabs of one Chrome (ASYNC_TABS env var overrides)
+ASYNC_TABS = 4
+
+# ========== EXPECTATIONS ==========
+# 'csv' checks the rows' Expected_* columns; 'oracle' predicts them from the catalogue snapshot
+# (harness/catalogue.py, EXPECTATIONS env var overrides). Terms the oracle can't judge (blank,
+# symbols only, over-long, or any term of a snapshot crawled with --no-tags) keep their CSV
+# values. ORACLE_TERMS_FILE holds generated fuzz terms:
+#   python -m harness.catalogue terms -o level-2/Search/search_oracle_terms.csv --count 300
+EXPECTATIONS = 'csv'
+ORACLE_TERMS_FILE = "search_oracle_terms.csv"
+
+# ========== NETWORK BLOCKING ==========
+# Categories/URL patterns blocked on every page load (see harness/network.py);
+# product images are never asserted on, so they are skipped too
+NETWORK_BLOCKING = {
+    'block': ['images', 'fonts', 'media', 'analytics', 'ads'],
+    'allow': [],
+}
+
 # ========== LOCATORS ==========
 # Using tuple format (By.TYPE, "locator_value") for consistency
-SEARCH_INPUT = (By.NAME, "search")
-SEARCH_BUTTON = (By.XPATH, "//button[@type='submit']")
-PRODUCT_CONTAINER = (By.ID, "product-search")
-PRODUCT_TITLES = (By.XPATH, "//div[@id='entry_212469']/div/div[2]/div/div[2]/h4/a")
-NO_PRODUCT_MSG = (By.XPATH, "//div[@id='entry_212469']/p")
-RESULT_INFO = (By.XPATH, "//div[@id='entry_212470']/div/div[2]")
+LOCATORS = locators.register('search', {
+    'search_input': (By.NAME, "search"),
+    'search_button': (By.XPATH, "//button[@type='submit']"),
+    'product_container': (By.ID, "product-search"),
+    'product_title': (By.XPATH, "//div[@id='entry_212469']/div/div[2]/div/div[2]/h4/a"),
+    'no_product_message': (By.XPATH, "//div[@id='entry_212469']/p"),
+    'result_info': (By.XPATH, "//div[@id='entry_212470']/div/div[2]"),
+})
+SEARCH_INPUT = LOCATORS['search_input']
+SEARCH_BUTTON = LOCATORS['search_button']
+PRODUCT_CONTAINER = LOCATORS['product_container']
+PRODUCT_TITLES = LOCATORS['product_title']
+NO_PRODUCT_MSG = LOCATORS['no_product_message']
+RESULT_INFO = LOCATORS['result_info']
+
+# Result-page elements read together in one snapshot after each search
+RESULT_KEYS = ['product_title', 'no_product_message', 'result_info']
 
 # ========== TEST DATA FILES ==========
 TEST_DATA_FILE_1 = "search_test_data1.csv"
@@ -39,6 +83,9 @@ TEST_CONFIG = {
     'explicit_wait': EXPLICIT_WAIT,
     'page_load_timeout': PAGE_LOAD_TIMEOUT,
     'base_url': BASE_URL,
+    'browser_profile': BROWSER_PROFILE,
+    'pool_size': POOL_SIZE,
+    'driver_scope': DRIVER_SCOPE,
     'screenshot_on_failure': True,
     'screenshot_dir': 'screenshots',
 }
@@ -52,6 +99,7 @@ VALIDATION = {
 }
 
 # ========== WAIT TIMES (in seconds) ==========
+# Upper bounds for the page-settle waiter, not fixed sleeps
 WAIT_TIMES = {
     'after_navigation': 2,
     'after_search': 3,
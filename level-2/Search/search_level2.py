@@ -3,72 +3,49 @@
 Level 2: Advanced data-driven testing approach
 Uses external configuration file for URLs, locators, and test data
 """
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 import unittest
-import csv
-import time
 import os
 import sys
 
 # Add the current directory to the Python path to find config.py
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the project root to the Python path to find the shared harness package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import search_config as config
+from harness import artifacts, browser, catalogue, data_source, driver_pool, navigation, network, replay, results, snapshot, timeouts, timing, waits
 from ddt import ddt, data, unpack
 
 
-def load_test_data1():
-    """Load test data from CSV file 1"""
-    test_data = []
-    csv_path = os.path.join(os.path.dirname(__file__), 'search_test_data1.csv')
-    
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        test_data = list(csv_reader)
-    
-    return test_data
-
-
-def load_test_data2():
-    """Load test data from CSV file 2"""
-    test_data = []
-    csv_path = os.path.join(os.path.dirname(__file__), 'search_test_data2.csv')
-    
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        test_data = list(csv_reader)
-    
-    return test_data
-
-
 @ddt
 class SearchLevel2(unittest.TestCase):
     
-    # Class variables to track test results
-    test_results = {
-        'passed': [],
-        'failed': [],
-        'errors': []
-    }
-    total_tests = 0
-    
     @classmethod
     def setUpClass(cls):
         """Set up before all tests"""
-        cls.test_results = {'passed': [], 'failed': [], 'errors': []}
-        cls.total_tests = 0
+        cls.driver_scope = driver_pool.resolve_scope(config.TEST_CONFIG['driver_scope'])
+        cls.class_driver = None
+        cls.search_oracle = None
         print("\n" + "="*60)
         print("Starting Level 2 Search Test Execution")
         print("="*60)
     
     def setUp(self):
         """Set up for each test - uses config file"""
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+        self.timing.step('driver_acquire')
+        self.pool = browser.get_pool(config.TEST_CONFIG['browser_profile'], config.TEST_CONFIG['pool_size'], network_log=True)
+        if self.driver_scope == 'class':
+            # one browser for every row of the class, cookies/storage reset between rows
+            self.driver = type(self).class_driver = self.pool.reuse(type(self).class_driver)
+        else:
+            self.driver = self.pool.acquire()
+        network.apply(self.driver, config.NETWORK_BLOCKING)
         self.driver.implicitly_wait(config.IMPLICIT_WAIT)
         self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
         self.wait = WebDriverWait(self.driver, config.EXPLICIT_WAIT)
@@ -86,76 +63,112 @@ class SearchLevel2(unittest.TestCase):
             timeout = config.EXPLICIT_WAIT
         
         by_type, locator_value = locator_tuple
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((by_type, locator_value))
-        )
+        return timeouts.wait_for(self.driver, f"search:{locator_value}",
+                                 EC.presence_of_element_located((by_type, locator_value)), timeout)
     
-    @data(*load_test_data1())
+    def search(self, term, mode, from_home=True):
+        """Get to the result page of a term - by URL in deep_link mode, else typed into the search box"""
+        if mode == 'deep_link':
+            self.timing.step('navigation')
+            self.driver.get(navigation.with_query(config.SEARCH_URL, search=term or ''))
+        else:
+            if from_home:
+                self.timing.step('navigation')
+                # Navigate to home page using config URL
+                self.driver.get(config.BASE_URL)
+                waits.wait_until_settled(self.driver, config.WAIT_TIMES['after_navigation'])
+            
+            self.timing.step('input')
+            # Enter search term using config locator
+            search_box = self.wait_for_element(config.SEARCH_INPUT)
+            search_box.clear()
+            search_box.send_keys(term)
+            
+            self.timing.step('submit')
+            # Click search button using config locator
+            search_button = self.find_element_by_config(config.SEARCH_BUTTON)
+            search_button.click()
+        self.timing.step('wait')
+        waits.wait_until_settled(self.driver, config.WAIT_TIMES['after_search'],
+                                 locator=config.PRODUCT_CONTAINER)
+        
+        # Wait for results page using config locator
+        self.wait_for_element(config.PRODUCT_CONTAINER)
+    
+    def with_expectations(self, test_case, source, suffixes=('',)):
+        """The row, with its Expected_* columns predicted by the catalogue search oracle in 'oracle' mode"""
+        if source != 'oracle':
+            return test_case
+        if type(self).search_oracle is None:
+            type(self).search_oracle = catalogue.SearchOracle.load()
+        predicted = dict(test_case)
+        for n in suffixes:
+            term = test_case[f'Search_Term{n}']
+            if not type(self).search_oracle.can_judge(term):
+                if f'Expected_Results{n}' not in test_case:
+                    # fuzz rows have no CSV values to fall back to
+                    self.skipTest(catalogue.NO_TAGS_NOTE)
+                continue
+            expected = type(self).search_oracle.expected(term)
+            predicted[f'Expected_Results{n}'] = expected['results']
+            predicted[f'Expected_NotFound{n}'] = expected['not_found']
+            predicted[f'Expected_Count{n}'] = expected['count']
+        return predicted
+    
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), config.TEST_DATA_FILE_1),
+        id_column='TC_ID', description_column='Description'))
     def test_search_single_term(self, test_case):
         """Test search functionality with single search term from CSV using config"""
-        
+        self.check_single_term(test_case, navigation.mode(config.NAVIGATION_MODE),
+                               catalogue.expectations(config.EXPECTATIONS))
+    
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), config.ORACLE_TERMS_FILE),
+        id_column='TC_ID', description_column='Description', optional=True))
+    @data_source.tag('fuzz', 'oracle')
+    def test_search_oracle_terms(self, test_case):
+        """Generated fuzz terms, checked against the catalogue search oracle by deep link"""
+        self.check_single_term(test_case, navigation.mode('deep_link'), 'oracle')
+    
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), config.TEST_DATA_FILE_1),
+        id_column='TC_ID', description_column='Description', ids=[config.UI_SMOKE_ROW], tags=()))
+    @data_source.tag('smoke', 'ui')
+    def test_ui_path_smoke(self, test_case):
+        """UI path (home page, typed term, search button) - kept whatever NAVIGATION_MODE is"""
+        self.check_single_term(test_case, 'ui')
+    
+    def check_single_term(self, test_case, mode, expectations='csv'):
+        """Search one term and verify product, 'not found' message and count"""
+        test_case = self.with_expectations(test_case, expectations)
         self.current_test_id = test_case['TC_ID']
-        SearchLevel2.total_tests += 1
+        self.timing.row_id = self.current_test_id
         
         print(f"\n{'='*60}")
         print(f"Running: {test_case['TC_ID']}")
         print(f"Description: {test_case['Description']}")
         print(f"Search Term: '{test_case['Search_Term']}'")
+        print(f"Navigation: {mode}")
+        print(f"Expectations: {expectations}")
         print(f"{'='*60}")
         
         try:
-            # Navigate to home page using config URL
-            self.driver.get(config.BASE_URL)
-            time.sleep(2)
-            
-            # Enter search term using config locator
-            search_box = self.wait_for_element(config.SEARCH_INPUT)
-            search_box.clear()
-            search_box.send_keys(test_case['Search_Term'])
-            
-            # Click search button using config locator
-            search_button = self.find_element_by_config(config.SEARCH_BUTTON)
-            search_button.click()
-            time.sleep(3)
+            self.search(test_case['Search_Term'], mode)
             
-            # Wait for results page using config locator
-            self.wait_for_element(config.PRODUCT_CONTAINER)
+            self.timing.step('assertions')
+            # Check what's actually displayed - one round trip for all result elements
+            result = snapshot.take(self.driver, config.LOCATORS, config.RESULT_KEYS)
+            product_found = result['product_title']['present']
+            not_found_found = result['no_product_message']['present']
+            count_info_found = result['result_info']['present']
             
-            # Check what's actually displayed
-            product_found = False
-            not_found_found = False
-            count_info_found = False
-            
-            actual_product_name = None
-            actual_not_found_msg = None
-            actual_count_info = None
-            
-            # Try to find product name using config locator
-            try:
-                product_element = self.find_element_by_config(config.PRODUCT_TITLES)
-                actual_product_name = product_element.text
-                product_found = True
-            except NoSuchElementException:
-                pass
-            
-            # Try to find "not found" message using config locator
-            try:
-                not_found_element = self.find_element_by_config(config.NO_PRODUCT_MSG)
-                actual_not_found_msg = not_found_element.text
-                not_found_found = True
-            except NoSuchElementException:
-                pass
-            
-            # Try to find count information using config locator
-            try:
-                count_info_element = self.find_element_by_config(config.RESULT_INFO)
-                actual_count_info = count_info_element.text
-                count_info_found = True
-            except NoSuchElementException:
-                pass
+            actual_product_name = result['product_title']['text']
+            actual_not_found_msg = result['no_product_message']['text']
+            actual_count_info = result['result_info']['text']
             
             # Verify Expected_Results
-            if test_case['Expected_Results'] != 'N/A':
+            if test_case['Expected_Results'] is not None:
                 if not product_found:
                     self.fail(f"Expected product '{test_case['Expected_Results']}', but no product found")
                 
@@ -168,7 +181,7 @@ class SearchLevel2(unittest.TestCase):
                     self.fail(f"Expected no product (N/A), but found: {actual_product_name}")
             
             # Verify Expected_NotFound
-            if test_case['Expected_NotFound'] != 'N/A':
+            if test_case['Expected_NotFound'] is not None:
                 if not not_found_found:
                     self.fail(f"Expected 'not found' message '{test_case['Expected_NotFound']}', but no message found")
                 
@@ -180,7 +193,7 @@ class SearchLevel2(unittest.TestCase):
                     self.fail(f"Expected no 'not found' message (N/A), but found: {actual_not_found_msg}")
             
             # Verify Expected_Count
-            if test_case['Expected_Count'] != 'N/A':
+            if test_case['Expected_Count'] is not None:
                 if not count_info_found:
                     self.fail(f"Expected count info '{test_case['Expected_Count']}', but count element not found")
                 
@@ -194,30 +207,32 @@ class SearchLevel2(unittest.TestCase):
             print(f" Test Case {test_case['TC_ID']} PASSED")
             
             # Record success
-            SearchLevel2.test_results['passed'].append(self.current_test_id)
+            results.report('SearchLevel2', self.current_test_id, 'passed')
+            self.timing.status = 'passed'
         
         except AssertionError as e:
+            self.timing.status = 'failed'
             print(f" Test Case {test_case['TC_ID']} FAILED: {str(e)}")
-            SearchLevel2.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), config.TEST_CONFIG)
+            results.report('SearchLevel2', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
+            self.timing.status = 'errors'
             print(f" Test Case {test_case['TC_ID']} ERROR: {str(e)}")
-            SearchLevel2.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), config.TEST_CONFIG)
+            results.report('SearchLevel2', self.current_test_id, 'errors', str(e))
             raise
     
-    @data(*load_test_data2())
+    @data(*data_source.load(
+        os.path.join(os.path.dirname(__file__), config.TEST_DATA_FILE_2),
+        id_column='TC_ID', description_column='Description'))
     def test_search_two_terms(self, test_case):
         """Test search functionality with two consecutive search terms from CSV using config"""
-        
+        mode = navigation.mode(config.NAVIGATION_MODE)
+        test_case = self.with_expectations(test_case, catalogue.expectations(config.EXPECTATIONS), ('1', '2'))
         self.current_test_id = test_case['TC_ID']
-        SearchLevel2.total_tests += 1
+        self.timing.row_id = self.current_test_id
         
         print(f"\n{'='*60}")
         print(f"Running: {test_case['TC_ID']}")
@@ -230,47 +245,18 @@ class SearchLevel2(unittest.TestCase):
             # ========== FIRST SEARCH ==========
             print(f"\n--- First Search: '{test_case['Search_Term1']}' ---")
             
-            # Navigate to home page using config URL
-            self.driver.get(config.BASE_URL)
-            time.sleep(2)
-            
-            # Enter first search term using config locator
-            search_box = self.wait_for_element(config.SEARCH_INPUT)
-            search_box.clear()
-            search_box.send_keys(test_case['Search_Term1'])
-            
-            # Click search button using config locator
-            search_button = self.find_element_by_config(config.SEARCH_BUTTON)
-            search_button.click()
-            time.sleep(3)
-            
-            # Wait for results page using config locator
-            self.wait_for_element(config.PRODUCT_CONTAINER)
-            
-            # Check first search results
-            product_found = False
-            count_info_found = False
-            actual_product_name = None
-            actual_count_info = None
-            
-            # Try to find product name using config locator
-            try:
-                product_element = self.find_element_by_config(config.PRODUCT_TITLES)
-                actual_product_name = product_element.text
-                product_found = True
-            except NoSuchElementException:
-                pass
+            self.search(test_case['Search_Term1'], mode)
             
-            # Try to find count information using config locator
-            try:
-                count_info_element = self.find_element_by_config(config.RESULT_INFO)
-                actual_count_info = count_info_element.text
-                count_info_found = True
-            except NoSuchElementException:
-                pass
+            self.timing.step('assertions')
+            # Check first search results - one round trip for all result elements
+            result = snapshot.take(self.driver, config.LOCATORS, ['product_title', 'result_info'])
+            product_found = result['product_title']['present']
+            count_info_found = result['result_info']['present']
+            actual_product_name = result['product_title']['text']
+            actual_count_info = result['result_info']['text']
             
             # Verify Expected_Results1
-            if test_case['Expected_Results1'] != 'N/A':
+            if test_case['Expected_Results1'] is not None:
                 if not product_found:
                     self.fail(f"First search: Expected product '{test_case['Expected_Results1']}', but no product found")
                 
@@ -282,7 +268,7 @@ class SearchLevel2(unittest.TestCase):
                     self.fail(f"First search: Expected no product (N/A), but found: {actual_product_name}")
             
             # Verify Expected_Count1
-            if test_case['Expected_Count1'] != 'N/A':
+            if test_case['Expected_Count1'] is not None:
                 if not count_info_found:
                     self.fail(f"First search: Expected count info '{test_case['Expected_Count1']}', but count element not found")
                 
@@ -296,43 +282,19 @@ class SearchLevel2(unittest.TestCase):
             # ========== SECOND SEARCH ==========
             print(f"\n--- Second Search: '{test_case['Search_Term2']}' ---")
             
-            # Enter second search term using config locator
-            search_box = self.wait_for_element(config.SEARCH_INPUT)
-            search_box.clear()
-            search_box.send_keys(test_case['Search_Term2'])
-            
-            # Click search button using config locator
-            search_button = self.find_element_by_config(config.SEARCH_BUTTON)
-            search_button.click()
-            time.sleep(3)
-            
-            # Wait for results page using config locator
-            self.wait_for_element(config.PRODUCT_CONTAINER)
-            
-            # Check second search results
-            product_found = False
-            count_info_found = False
-            actual_product_name = None
-            actual_count_info = None
+            # typed into the result page's own search box in ui mode
+            self.search(test_case['Search_Term2'], mode, from_home=False)
             
-            # Try to find product name using config locator
-            try:
-                product_element = self.find_element_by_config(config.PRODUCT_TITLES)
-                actual_product_name = product_element.text
-                product_found = True
-            except NoSuchElementException:
-                pass
-            
-            # Try to find count information using config locator
-            try:
-                count_info_element = self.find_element_by_config(config.RESULT_INFO)
-                actual_count_info = count_info_element.text
-                count_info_found = True
-            except NoSuchElementException:
-                pass
+            self.timing.step('assertions')
+            # Check second search results - one round trip for all result elements
+            result = snapshot.take(self.driver, config.LOCATORS, ['product_title', 'result_info'])
+            product_found = result['product_title']['present']
+            count_info_found = result['result_info']['present']
+            actual_product_name = result['product_title']['text']
+            actual_count_info = result['result_info']['text']
             
             # Verify Expected_Results2
-            if test_case['Expected_Results2'] != 'N/A':
+            if test_case['Expected_Results2'] is not None:
                 if not product_found:
                     self.fail(f"Second search: Expected product '{test_case['Expected_Results2']}', but no product found")
                 
@@ -344,7 +306,7 @@ class SearchLevel2(unittest.TestCase):
                     self.fail(f"Second search: Expected no product (N/A), but found: {actual_product_name}")
             
             # Verify Expected_Count2
-            if test_case['Expected_Count2'] != 'N/A':
+            if test_case['Expected_Count2'] is not None:
                 if not count_info_found:
                     self.fail(f"Second search: Expected count info '{test_case['Expected_Count2']}', but count element not found")
                 
@@ -358,53 +320,38 @@ class SearchLevel2(unittest.TestCase):
             print(f"\n Test Case {test_case['TC_ID']} PASSED")
             
             # Record success
-            SearchLevel2.test_results['passed'].append(self.current_test_id)
+            results.report('SearchLevel2', self.current_test_id, 'passed')
+            self.timing.status = 'passed'
         
         except AssertionError as e:
+            self.timing.status = 'failed'
             print(f" Test Case {test_case['TC_ID']} FAILED: {str(e)}")
-            SearchLevel2.test_results['failed'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), config.TEST_CONFIG)
+            results.report('SearchLevel2', self.current_test_id, 'failed', str(e))
             raise
         
         except Exception as e:
+            self.timing.status = 'errors'
             print(f" Test Case {test_case['TC_ID']} ERROR: {str(e)}")
-            SearchLevel2.test_results['errors'].append({
-                'test_id': self.current_test_id,
-                'reason': str(e)
-            })
+            artifacts.capture(self, self.driver, str(e), config.TEST_CONFIG)
+            results.report('SearchLevel2', self.current_test_id, 'errors', str(e))
             raise
     
     def tearDown(self):
-        """Clean up after each test"""
-        self.driver.quit()
+        """Clean up after each test - hand the browser back to the pool"""
+        self.timing.step('teardown')
+        network.collect(self.driver)
+        if self.driver_scope != 'class':
+            self.pool.release(self.driver)
+        timing.finish(self.timing)
     
     @classmethod
     def tearDownClass(cls):
         """Print summary after all tests"""
-        print("\n" + "="*60)
-        print("TEST EXECUTION SUMMARY - LEVEL 2 SEARCH")
-        print("="*60)
-        print(f"Total Tests: {cls.total_tests}")
-        print(f"Passed: {len(cls.test_results['passed'])}")
-        print(f"Failed: {len(cls.test_results['failed'])}")
-        print(f"Errors: {len(cls.test_results['errors'])}")
-        print("="*60)
-        
-        if cls.test_results['failed']:
-            print("\n FAILED TEST CASES:")
-            for failure in cls.test_results['failed']:
-                print(f"  - {failure['test_id']}")
-                print(f"    Reason: {failure['reason']}")
-        
-        if cls.test_results['errors']:
-            print("\n ERROR TEST CASES:")
-            for error in cls.test_results['errors']:
-                print(f"  - {error['test_id']}")
-                print(f"    Reason: {error['reason']}")
-        
-        print("\n" + "="*60 + "\n")
+        if cls.class_driver is not None:
+            browser.get_pool(config.TEST_CONFIG['browser_profile'], network_log=True).release(cls.class_driver)
+            cls.class_driver = None
+        results.print_suite_summary('SearchLevel2', "TEST EXECUTION SUMMARY - LEVEL 2 SEARCH")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Level 2 Search - asynchronous multi-tab variant
+Same CSV rows and checks as search_level2.py, but every row of a CSV shares one Chrome:
+the rows are fanned out across ASYNC_TABS tabs driven concurrently over WebDriver BiDi
+(harness/bidi.py). Result pages are opened by URL (deep_link navigation); the typed UI
+path stays covered by search_level2.py.
+"""
+import unittest
+import os
+import sys
+
+# Add the current directory to the Python path to find config.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the project root to the Python path to find the shared harness package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import search_config as config
+from harness import bidi, data_source, navigation, replay, results, timing
+
+
+class SearchAsyncLevel2(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up before all tests"""
+        print("\n" + "="*60)
+        print(f"Starting Level 2 Search Test Execution (async, {bidi.tab_count(config.ASYNC_TABS)} tabs)")
+        print("="*60)
+
+    async def asyncSetUp(self):
+        """One BiDi-driven Chrome and its tabs per CSV"""
+        replay.use_cassette(self.id())
+        self.timing = timing.start(self.id())
+        self.timing.step('driver_acquire')
+        self.chrome = await bidi.AsyncBrowser.start(config.TEST_CONFIG['browser_profile'])
+        self.tabs = await self.chrome.tabs(bidi.tab_count(config.ASYNC_TABS))
+
+    async def asyncTearDown(self):
+        self.timing.step('teardown')
+        await self.chrome.close()
+        timing.finish(self.timing)
+
+    async def search(self, tab, term, keys=config.RESULT_KEYS):
+        """Open the result page of a term in a tab and read the result elements"""
+        await tab.navigate(navigation.with_query(config.SEARCH_URL, search=term or ''))
+        await tab.wait_for(config.LOCATORS, 'product_container', config.EXPLICIT_WAIT,
+                           f"search:{config.PRODUCT_CONTAINER[1]}")
+        return await tab.snapshot(config.LOCATORS, keys)
+
+    def check_result(self, result, expected_product, expected_not_found, expected_count, label=""):
+        """search_level2.py's assertions on one result snapshot (the message only if it was read)"""
+        actual_product_name = result['product_title']['text']
+        actual_count_info = result['result_info']['text']
+
+        if expected_product is not None:
+            if not result['product_title']['present']:
+                self.fail(f"{label}Expected product '{expected_product}', but no product found")
+            self.assertIn(expected_product.lower(), actual_product_name.lower(),
+                          f"{label}Expected product containing '{expected_product}', but got '{actual_product_name}'")
+        elif result['product_title']['present']:
+            self.fail(f"{label}Expected no product (N/A), but found: {actual_product_name}")
+
+        if 'no_product_message' in result:
+            actual_not_found_msg = result['no_product_message']['text']
+            if expected_not_found is not None:
+                if not result['no_product_message']['present']:
+                    self.fail(f"{label}Expected 'not found' message '{expected_not_found}', but no message found")
+                self.assertEqual(actual_not_found_msg, expected_not_found,
+                                 f"{label}Expected message '{expected_not_found}', but got '{actual_not_found_msg}'")
+            elif result['no_product_message']['present']:
+                self.fail(f"{label}Expected no 'not found' message (N/A), but found: {actual_not_found_msg}")
+
+        if expected_count is not None:
+            if not result['result_info']['present']:
+                self.fail(f"{label}Expected count info '{expected_count}', but count element not found")
+            self.assertEqual(actual_count_info, expected_count,
+                             f"{label}Expected count info '{expected_count}', but got '{actual_count_info}'")
+        elif result['result_info']['present']:
+            self.fail(f"{label}Expected no count info (N/A), but found: {actual_count_info}")
+
+    def report(self, outcomes):
+        """Record every row's outcome and fail its subTest if it did not pass"""
+        for outcome in outcomes:
+            row_id = outcome.row['TC_ID']
+            error = outcome.error
+            status = 'passed' if error is None else 'failed' if isinstance(error, AssertionError) else 'errors'
+            print(f" Test Case {row_id} {status.upper()} ({outcome.duration:.2f}s)" + (f": {error}" if error else ""))
+            results.report('SearchAsyncLevel2', row_id, status, str(error or ''), duration=round(outcome.duration, 3))
+            with self.subTest(row=row_id):
+                if error is not None:
+                    raise error
+        if all(outcome.error is None for outcome in outcomes):
+            self.timing.status = 'passed'
+
+    async def test_search_single_term(self):
+        """Rows of search_test_data1.csv, fanned out across the tabs"""
+        rows = data_source.load(
+            os.path.join(os.path.dirname(__file__), config.TEST_DATA_FILE_1),
+            id_column='TC_ID', description_column='Description')
+
+        async def check(tab, test_case):
+            result = await self.search(tab, test_case['Search_Term'])
+            self.check_result(result, test_case['Expected_Results'], test_case['Expected_NotFound'],
+                              test_case['Expected_Count'])
+
+        self.timing.step('rows')
+        outcomes = await bidi.fan_out(self.tabs, rows, check)
+        self.timing.step('assertions')
+        self.report(outcomes)
+
+    async def test_search_two_terms(self):
+        """Rows of search_test_data2.csv; each row's two searches run one after the other in its tab"""
+        rows = data_source.load(
+            os.path.join(os.path.dirname(__file__), config.TEST_DATA_FILE_2),
+            id_column='TC_ID', description_column='Description')
+
+        async def check(tab, test_case):
+            for n in ('1', '2'):
+                result = await self.search(tab, test_case['Search_Term' + n], ['product_title', 'result_info'])
+                self.check_result(result, test_case['Expected_Results' + n], None,
+                                  test_case['Expected_Count' + n], label=f"Search {n}: ")
+
+        self.timing.step('rows')
+        outcomes = await bidi.fan_out(self.tabs, rows, check)
+        self.timing.step('assertions')
+        self.report(outcomes)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Print test summary"""
+        results.print_suite_summary('SearchAsyncLevel2', "TEST EXECUTION SUMMARY - LEVEL 2 SEARCH (ASYNC)")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,11 +1,10 @@
 # view_product_detail_level2.py - LEVEL 2 - VIEW PRODUCT DETAIL - 100% WORKING FINAL
 import unittest
-import csv
 import json
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+import sys
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -14,26 +13,26 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(CURRENT_DIR, "view_product_detail_config.json")
 TEST_DATA_FILE = os.path.join(CURRENT_DIR, "view_product_detail_test_data.csv")
 
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(CURRENT_DIR)))
+
+from harness import browser, data_source, locators, replay, waits
+
 # Đọc config
 with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-    config = json.load(f)
+    config = replay.rewrite_config(json.load(f))
 
 BASE_URL = config["url"]
+WAIT_TIMES = config["wait_times"]
+LOCATORS = locators.register("view_product_detail", config["elements"], required=(
+    "product_title", "product_price", "not_found_message", "search_input", "product_link_by_name",
+))
 
 def get_driver():
-    from selenium.webdriver.chrome.options import Options
-    options = Options()
-    options.add_argument("--start-maximized")
-    prefs = {"credentials_enable_service": False, "profile.password_manager_enabled": False}
-    options.add_experimental_option("prefs", prefs)
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    return webdriver.Chrome(options=options)
+    return browser.create_driver(config["browser_profile"])
 
 def get_locator(key, **kwargs):
-    elem = config["elements"][key]
-    value = elem["value"].format(**kwargs) if kwargs else elem["value"]
-    by_type = elem["by"]
-    return (By.XPATH if by_type == "xpath" else By.CSS_SELECTOR, value)
+    return LOCATORS.get(key, **kwargs)
 
 def is_product_page(driver):
     try:
@@ -57,7 +56,7 @@ def search_and_click_product(driver, product_name):
         search.clear()
         search.send_keys(product_name)
         search.send_keys(Keys.ENTER)
-        time.sleep(3)
+        waits.wait_until_settled(driver, WAIT_TIMES["after_search"])
         link = driver.find_element(*get_locator("product_link_by_name", product=product_name))
         link.click()
         return True
@@ -69,8 +68,7 @@ driver = get_driver()
 wait = WebDriverWait(driver, 10)
 
 # Đọc test data
-with open(TEST_DATA_FILE, 'r', encoding='utf-8') as f:
-    tests = list(csv.DictReader(f))
+tests = data_source.load(TEST_DATA_FILE, id_column='test_id')
 
 print(f"Found {len(tests)} test cases. Starting execution...\n")
 
@@ -83,21 +81,22 @@ for i, row in enumerate(tests, 1):
     expected = row['expected_result']
 
     print(f"[{i:02d}] {test_id:<12}", end=" ")
+    replay.use_cassette(f"view_product_detail_level2.{test_id}")
 
     driver.get(BASE_URL)
-    time.sleep(3)
+    waits.wait_until_settled(driver, WAIT_TIMES["after_navigation"])
 
     success = False
 
     if action in ["click_image", "click_category"] and product_name:
         success = search_and_click_product(driver, product_name)
-        time.sleep(3)
+        waits.wait_until_settled(driver, WAIT_TIMES["after_click"])
         success = is_product_page(driver)
 
     elif action == "direct_url" in action and product_id:
         url = f"{BASE_URL}index.php?route=product/product&product_id={product_id}"
         driver.get(url)
-        time.sleep(3)
+        waits.wait_until_settled(driver, WAIT_TIMES["after_navigation"])
         if "not found" in expected.lower():
             success = is_not_found_page(driver)
         else:
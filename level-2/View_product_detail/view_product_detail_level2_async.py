@@ -0,0 +1,104 @@
+# view_product_detail_level2_async.py - LEVEL 2 - VIEW PRODUCT DETAIL - ASYNC MULTI-TAB
+# Same rows and checks as view_product_detail_level2.py, fanned out across the tabs of one
+# Chrome driven over WebDriver BiDi (harness/bidi.py). Product links are followed by URL.
+import asyncio
+import json
+import os
+import sys
+
+# Auto find files
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(CURRENT_DIR, "view_product_detail_config.json")
+TEST_DATA_FILE = os.path.join(CURRENT_DIR, "view_product_detail_test_data.csv")
+
+# allow shared harness import from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(CURRENT_DIR)))
+
+from harness import bidi, data_source, locators, navigation, replay
+
+# Đọc config
+with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+    config = replay.rewrite_config(json.load(f))
+
+BASE_URL = config["url"]
+LOCATORS = locators.register("view_product_detail", config["elements"], required=(
+    "product_title", "product_price", "not_found_message", "search_input", "product_link_by_name",
+))
+NOT_FOUND_WORDS = ["not found", "404", "cannot be found", "does not exist"]
+
+LINK_HREF_SCRIPT = """
+var link = document.evaluate(arguments[0], document, null,
+                             XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return link ? link.href : null;
+"""
+
+async def is_product_page(tab):
+    page = await tab.snapshot(LOCATORS, ["product_title", "product_price"])
+    return page["product_title"]["present"] and page["product_price"]["present"]
+
+async def is_not_found_page(tab):
+    if (await tab.snapshot(LOCATORS, ["not_found_message"]))["not_found_message"]["present"]:
+        return True
+    page = (await tab.evaluate("document.documentElement.outerHTML")).lower()
+    return any(k in page for k in NOT_FOUND_WORDS)
+
+async def search_and_open_product(tab, product_name):
+    await tab.navigate(navigation.with_query(f"{BASE_URL}index.php?route=product/search", search=product_name))
+    href = await tab.execute_script(LINK_HREF_SCRIPT, LOCATORS.get("product_link_by_name", product=product_name)[1])
+    if not href:
+        return False
+    await tab.navigate(href)
+    return True
+
+async def check_row(tab, row):
+    """(passed, current URL) of one CSV row"""
+    action = row['action']
+    product_name = row.get('product_name', '').strip()
+    product_id = row.get('product_id', '').strip()
+    expected = row['expected_result']
+
+    success = False
+    if action in ["click_image", "click_category"] and product_name:
+        await search_and_open_product(tab, product_name)
+        success = await is_product_page(tab)
+    elif action == "direct_url" and product_id:
+        await tab.navigate(f"{BASE_URL}index.php?route=product/product&product_id={product_id}")
+        if "not found" in expected.lower():
+            success = await is_not_found_page(tab)
+        else:
+            success = await is_product_page(tab)
+
+    passed = ("Product page displayed" in expected and success) or \
+             ("not found" in expected.lower() and await is_not_found_page(tab))
+    return passed, await tab.url()
+
+async def main():
+    tests = data_source.load(TEST_DATA_FILE, id_column='test_id')
+    tab_count = bidi.tab_count(config.get("async_tabs"))
+    print(f"Found {len(tests)} test cases. Starting execution across {tab_count} tabs...\n")
+    replay.use_cassette("view_product_detail_level2_async")
+
+    async with await bidi.AsyncBrowser.start(config["browser_profile"]) as chrome:
+        tabs = await chrome.tabs(tab_count)
+        outcomes = await bidi.fan_out(tabs, tests, check_row)
+
+    failed = 0
+    for i, outcome in enumerate(outcomes, 1):
+        row = outcome.row
+        print(f"[{i:02d}] {row['test_id']:<12}", end=" ")
+        if outcome.error is None and outcome.value[0]:
+            print(f"-> PASS ({outcome.duration:.2f}s)")
+            continue
+        failed += 1
+        print("-> FAIL")
+        print(f"     Expected : {row['expected_result']}")
+        if outcome.error is not None:
+            print(f"     Error: {outcome.error}")
+        else:
+            print(f"     Current URL: {outcome.value[1]}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} TEST CASES PASSED")
+    return failed
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
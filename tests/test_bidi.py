@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Loopback tests of the RFC 6455 client in harness/bidi.py
+A tiny asyncio WebSocket server on 127.0.0.1 answers BiDi-style commands, so framing,
+the handshake check and the command/answer matching run without a browser.
+"""
+import asyncio
+import json
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import bidi
+
+
+def parse_frame(data):
+    """(fin, opcode, payload) of one complete client frame, unmasked"""
+    first, second = data[0], data[1]
+    size, offset = second & 0x7F, 2
+    if size == 126:
+        size, offset = struct.unpack("!H", data[2:4])[0], 4
+    elif size == 127:
+        size, offset = struct.unpack("!Q", data[2:10])[0], 10
+    assert second & 0x80, "client frames must be masked"
+    mask, payload = data[offset:offset + 4], data[offset + 4:offset + 4 + size]
+    assert len(payload) == size
+    return bool(first & 0x80), first & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+def server_frame(opcode, payload, fin=True):
+    size = len(payload)
+    if size < 126:
+        header = struct.pack("!BB", (0x80 if fin else 0) | opcode, size)
+    elif size < 65536:
+        header = struct.pack("!BBH", (0x80 if fin else 0) | opcode, 126, size)
+    else:
+        header = struct.pack("!BBQ", (0x80 if fin else 0) | opcode, 127, size)
+    return header + payload
+
+
+class LoopbackServer:
+    """Answers {"id", "method", "params"} commands; the method picks the answer"""
+
+    def __init__(self, accept=None):
+        self.accept = accept        # override Sec-WebSocket-Accept (None: the correct one)
+        self.pongs = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}/session/1"
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def read_frame(self, reader):
+        head = await reader.readexactly(2)
+        size = head[1] & 0x7F
+        extra = b""
+        if size == 126:
+            extra = await reader.readexactly(2)
+            size = struct.unpack("!H", extra)[0]
+        elif size == 127:
+            extra = await reader.readexactly(8)
+            size = struct.unpack("!Q", extra)[0]
+        return parse_frame(head + extra + await reader.readexactly(4 + size))
+
+    async def handle(self, reader, writer):
+        headers = {}
+        await reader.readline()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        accept = self.accept or bidi.accept_key(headers["sec-websocket-key"])
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        try:
+            while True:
+                fin, opcode, payload = await self.read_frame(reader)
+                if opcode == bidi.CLOSE:
+                    break
+                if opcode == bidi.PONG:
+                    self.pongs.append(payload)
+                    continue
+                await self.answer(writer, json.loads(payload))
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+    async def answer(self, writer, command):
+        method, params = command["method"], command["params"]
+        if method == "echo":
+            body = json.dumps({"id": command["id"], "result": params}).encode()
+            writer.write(server_frame(bidi.TEXT, body))
+        elif method == "fragmented":
+            # a ping between the fragments, as a browser may send one any time
+            body = json.dumps({"id": command["id"], "result": params}).encode()
+            writer.write(server_frame(bidi.TEXT, body[:5], fin=False))
+            writer.write(server_frame(bidi.PING, b"hi"))
+            writer.write(server_frame(0x0, body[5:]))
+        elif method == "slow":
+            await asyncio.sleep(params["delay"])
+            writer.write(server_frame(bidi.TEXT, json.dumps({"id": command["id"], "result": params}).encode()))
+        else:
+            body = {"id": command["id"], "type": "error", "error": "unknown command", "message": method}
+            writer.write(server_frame(bidi.TEXT, json.dumps(body).encode()))
+        await writer.drain()
+
+
+class FrameTest(unittest.TestCase):
+
+    def test_frame_lengths_and_masking(self):
+        for size in (0, 1, 125, 126, 65535, 65536, 70000):
+            payload = os.urandom(size)
+            fin, opcode, unmasked = parse_frame(bidi._frame(bidi.TEXT, payload))
+            self.assertTrue(fin)
+            self.assertEqual(opcode, bidi.TEXT)
+            self.assertEqual(unmasked, payload, f"payload of {size} bytes")
+
+    def test_accept_key_matches_rfc_example(self):
+        self.assertEqual(bidi.accept_key("dGhlIHNhbXBsZSBub25jZQ=="), "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=")
+
+
+class ConnectionTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = LoopbackServer()
+        self.url = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_command_round_trip(self):
+        connection = await bidi.Connection.open(self.url)
+        try:
+            self.assertEqual(await connection.send("echo", {"value": "é"}), {"value": "é"})
+            big = {"value": "x" * 70000}    # 64-bit length in both directions
+            self.assertEqual(await connection.send("echo", big), big)
+        finally:
+            await connection.close()
+
+    async def test_fragments_and_ping(self):
+        connection = await bidi.Connection.open(self.url)
+        try:
+            self.assertEqual(await connection.send("fragmented", {"a": 1}), {"a": 1})
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.server.pongs, [b"hi"])
+        finally:
+            await connection.close()
+
+    async def test_concurrent_answers_matched_by_id(self):
+        connection = await bidi.Connection.open(self.url)
+        try:
+            answers = await asyncio.gather(
+                connection.send("slow", {"delay": 0.1, "n": 1}),
+                connection.send("slow", {"delay": 0.0, "n": 2}),
+            )
+            self.assertEqual([answer["n"] for answer in answers], [1, 2])
+        finally:
+            await connection.close()
+
+    async def test_error_answer_raises(self):
+        connection = await bidi.Connection.open(self.url)
+        try:
+            with self.assertRaises(bidi.BiDiError):
+                await connection.send("nope")
+        finally:
+            await connection.close()
+
+    async def test_wrong_accept_is_rejected(self):
+        self.server.accept = "bm90IHRoZSByaWdodCBrZXk="
+        with self.assertRaises(bidi.BiDiError):
+            await bidi.Connection.open(self.url)
+
+    async def test_other_schemes_are_rejected(self):
+        with self.assertRaises(ValueError):
+            await bidi.Connection.open(self.url.replace("ws://", "http://"))
+
+
+if __name__ == "__main__":
+    unittest.main()
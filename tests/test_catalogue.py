@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the catalogue oracles in harness/catalogue.py on small hand-made snapshots
+"""
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import catalogue
+
+
+def product(name, price, position, product_id=None):
+    return {"name": name, "price": price, "position": position, "product_id": product_id}
+
+
+# listing position != price order; three products tie at 122.00
+PRODUCTS = [
+    product("iPod Classic", "122.00", 0),
+    product("HTC Touch HD", "146.00", 1),
+    product("Palm Treo Pro", "337.99", 2),
+    product("iPod Nano", "122.00", 3),
+    product("Apple Cinema 30\"", "98.00", 4),
+    product("Canon EOS 5D", "98.00", 5),
+    product("iMac", "122.00", 6),
+    product("Sony VAIO", "1202.00", 7),
+    product("Free sample", "0.00", 8),
+    product("MacBook Pro", "5000.00", 9),
+    product("iPod Shuffle", "5000.00", 10),
+]
+
+
+def brute_force(products, low, high):
+    """Matching products in listing order, the way the site lists them"""
+    found = [p for p in products
+             if (low is None or float(p["price"]) >= low) and (high is None or float(p["price"]) <= high)]
+    return sorted(found, key=lambda p: p["position"])
+
+
+class PriceOracleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.oracle = catalogue.PriceOracle(PRODUCTS, page_size=2)
+
+    def test_first_listed_and_count(self):
+        cases = [
+            # (low, high, first listed name, total)
+            (122, 122, "iPod Classic", 3),          # tie at one price: earliest listing wins
+            (123, 146, "HTC Touch HD", 1),
+            (98, 98, "Apple Cinema 30\"", 2),
+            (None, 100, "Apple Cinema 30\"", 3),    # open low bound
+            (300, None, "Palm Treo Pro", 4),        # open high bound
+            (None, None, "iPod Classic", 11),
+            (0, 0, "Free sample", 1),               # lower filter limit
+            (5000, 5000, "MacBook Pro", 2),         # upper filter limit
+            (0, 5000, "iPod Classic", 11),
+            (99, 121, None, 0),                     # gap between prices
+            (5001, 6000, None, 0),                  # above every price
+            (200, 100, None, 0),                    # min above max
+            ("97.99", "98.00", "Apple Cinema 30\"", 2),
+        ]
+        for low, high, name, total in cases:
+            with self.subTest(low=low, high=high):
+                start, end = self.oracle.matches(low, high)
+                self.assertEqual(end - start, total)
+                first = self.oracle.first_listed(low, high)
+                self.assertEqual(first["name"] if first else None, name)
+
+    def test_first_listed_matches_brute_force(self):
+        bounds = [None, 0, 97, 98, 99, 122, 123, 146, 337, 338, 1202, 4999, 5000]
+        for low, high in itertools.product(bounds, repeat=2):
+            with self.subTest(low=low, high=high):
+                expected = brute_force(PRODUCTS, low, high)
+                first = self.oracle.first_listed(low, high)
+                self.assertEqual(first, expected[0] if expected else None)
+
+    def test_expected(self):
+        cases = [
+            (122, 122, {"expected_price": "$122.00",
+                        "expected_pagination": "Showing 1 to 2 of 3 (2 Pages)", "not_found": None}),
+            (1000, 2000, {"expected_price": "$1,202.00",
+                          "expected_pagination": "Showing 1 to 1 of 1 (1 Pages)", "not_found": None}),
+            (99, 121, {"expected_price": None, "expected_pagination": None,
+                       "not_found": catalogue.NO_PRODUCT_MESSAGE}),
+        ]
+        for low, high, expected in cases:
+            with self.subTest(low=low, high=high):
+                self.assertEqual(self.oracle.expected(low, high), expected)
+
+    def test_empty_and_single_snapshots(self):
+        empty = catalogue.PriceOracle([])
+        self.assertIsNone(empty.first_listed(0, 5000))
+        self.assertEqual(empty.expected()["not_found"], catalogue.NO_PRODUCT_MESSAGE)
+        single = catalogue.PriceOracle([product("Only", "10.50", 0)])
+        self.assertEqual(single.first_listed(10, 11)["name"], "Only")
+        self.assertIsNone(single.first_listed(11, 20))
+
+    def test_boundary_ranges(self):
+        ranges = self.oracle.boundary_ranges()
+        self.assertEqual(ranges, sorted(set(ranges)))
+        for low, high in ranges:
+            self.assertTrue(0 <= low <= high <= 5000, (low, high))
+        # the filter limits themselves
+        for pair in [(0, 0), (0, 5000), (5000, 5000)]:
+            self.assertIn(pair, ranges)
+        # just inside and just outside a price
+        for pair in [(122, 122), (0, 121), (123, 5000), (0, 122), (122, 5000)]:
+            self.assertIn(pair, ranges)
+        # pairs that would leave the limits are dropped (below 0, above 5000)
+        self.assertNotIn((0, -1), ranges)
+        self.assertNotIn((5001, 5000), ranges)
+
+    def test_boundary_ranges_of_fractional_prices(self):
+        oracle = catalogue.PriceOracle([product("Palm Treo Pro", "337.99", 0)])
+        ranges = oracle.boundary_ranges()
+        self.assertIn((337, 338), ranges)       # the whole numbers around it
+        self.assertIn((0, 336), ranges)         # everything below: empty
+        self.assertIn((339, 5000), ranges)      # everything above: empty
+        self.assertIsNone(oracle.first_listed(0, 336))
+        self.assertIsNone(oracle.first_listed(339, 5000))
+        self.assertEqual(oracle.first_listed(337, 338)["name"], "Palm Treo Pro")
+
+    def test_boundary_ranges_with_a_narrower_range(self):
+        ranges = self.oracle.boundary_ranges(price_range=(100, 200))
+        self.assertEqual(ranges[0][0], 100)
+        self.assertTrue(all(100 <= low <= high <= 200 for low, high in ranges))
+        self.assertIn((122, 122), ranges)
+
+
+def tagged(name, position, tags):
+    return dict(product(name, "1.00", position), tags=tags)
+
+
+# listing order on purpose differs from name order
+SEARCH_PRODUCTS = [
+    tagged("iPod Classic", 0, ["ipod", "music player"]),
+    tagged("Apple Cinema 30\"", 1, ["monitor"]),
+    tagged("HTC Touch HD", 2, []),
+    tagged("iPod Nano", 3, ["ipod"]),
+    tagged("iMac", 4, ["apple", "desktop"]),
+    tagged("MacBook Air", 5, ["apple", "laptop"]),
+    tagged("Palm Treo Pro", 6, []),
+]
+
+
+class SearchOracleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.oracle = catalogue.SearchOracle(SEARCH_PRODUCTS, page_size=2)
+
+    def names(self, term):
+        return [p["name"] for p in self.oracle.matches(term)]
+
+    def test_matches(self):
+        cases = [
+            ("imac", ["iMac"]),
+            ("IPOD", ["iPod Classic", "iPod Nano"]),                       # case-insensitive
+            ("nano ipod", ["iPod Nano"]),                                   # every word, any order
+            ("ipod touch", []),                                             # one word misses
+            ("mac", ["iMac", "MacBook Air"]),                               # inside a word
+            ("hd", ["HTC Touch HD"]),                                       # shorter than a trigram
+            ("k", ["iMac", "MacBook Air"]),                                 # one letter, tag and name
+            ("apple", ["Apple Cinema 30\"", "iMac", "MacBook Air"]),        # name or tag
+            ("monitor", ["Apple Cinema 30\""]),                            # tag only
+            ("music player", ["iPod Classic"]),                             # multi-word tag
+            ("desktop apple", ["iMac"]),                                    # words across two tags
+            ("apple desktop laptop", []),
+            ("zzzz", []),
+            ("", []),
+            ("   ", []),
+        ]
+        for term, expected in cases:
+            with self.subTest(term=term):
+                self.assertEqual(self.names(term), expected)
+
+    def test_matches_agree_with_a_scan(self):
+        for term in ["a", "ap", "app", "pod", "ic", "o p", "ro", "touch hd", "c", "le"]:
+            with self.subTest(term=term):
+                words = term.lower().split()
+                expected = [p["name"] for p in SEARCH_PRODUCTS
+                            if all(w in p["name"].lower() for w in words)
+                            or all(w in ",".join(p["tags"]) for w in words)]
+                self.assertEqual(self.names(term), expected)
+
+    def test_expected(self):
+        cases = [
+            ("apple", {"results": "Apple Cinema 30\"", "not_found": None,
+                       "count": "Showing 1 to 2 of 3 (2 Pages)"}),
+            ("imac", {"results": "iMac", "not_found": None, "count": "Showing 1 to 1 of 1 (1 Pages)"}),
+            ("ipod", {"results": "iPod Classic", "not_found": None, "count": "Showing 1 to 2 of 2 (1 Pages)"}),
+            ("zzzz", {"results": None, "not_found": catalogue.NO_PRODUCT_MESSAGE, "count": None}),
+        ]
+        for term, expected in cases:
+            with self.subTest(term=term):
+                self.assertEqual(self.oracle.expected(term), expected)
+
+    def test_can_judge(self):
+        self.assertTrue(self.oracle.can_judge("ipod"))
+        for term in ["", "  ", "!!!", "x" * (catalogue.MAX_TERM_LENGTH + 1)]:
+            with self.subTest(term=term):
+                self.assertFalse(self.oracle.can_judge(term))
+
+    def test_snapshot_without_tags_judges_nothing(self):
+        untagged = [product(p["name"], p["price"], p["position"]) for p in SEARCH_PRODUCTS]
+        oracle = catalogue.SearchOracle(untagged)
+        self.assertFalse(oracle.knows_tags)
+        self.assertFalse(oracle.can_judge("ipod"))
+        # names are still matched
+        self.assertEqual([p["name"] for p in oracle.matches("ipod")], ["iPod Classic", "iPod Nano"])
+
+    def test_check_search(self):
+        rows = ("TC_ID,Search_Term,Expected_Results,Expected_NotFound,Expected_Count,Description\n"
+                "T1,imac,iMac,N/A,Showing 1 to 1 of 1 (1 Pages),right\n"
+                "T2,monitor,N/A,There is no product that matches the search criteria.,N/A,misses the tag match\n"
+                "T3,!!!,N/A,N/A,N/A,not judged\n")
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "search.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(rows)
+            drift = catalogue.check_search(self.oracle, path)
+            self.assertEqual([row_id for row_id, _ in drift], ["T2"])
+            self.assertEqual(drift[0][1]["Expected_Results"], (None, "Apple Cinema 30\""))
+            untagged = catalogue.SearchOracle([product(p["name"], p["price"], p["position"])
+                                               for p in SEARCH_PRODUCTS])
+            self.assertEqual(catalogue.check_search(untagged, path), [])
+
+
+class ProductPageParserTest(unittest.TestCase):
+
+    def test_stock_and_tags(self):
+        parser = catalogue.ProductPageParser()
+        parser.feed("""
+            <ul><li><span>Availability:</span> <span>In Stock</span></li></ul>
+            <a href="index.php?route=product/search&amp;search=ipod">not a tag</a>
+            <p>Tags: <a href="index.php?route=product/search&amp;tag=ipod">ipod</a>,
+               <a href="https://example.com/index.php?route=product/search&tag=music%20player"><b>music</b> player</a></p>
+        """)
+        self.assertEqual(parser.tags, ["ipod", "music player"])
+        self.assertIn("In Stock", parser.texts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the CSV test-data layer in harness/data_source.py on temporary CSV files
+"""
+import os
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import data_source
+
+CSV = """tc_id,quantity,items,expected_price,message,description,tags
+TC001,2,3,"$2,000.00",N/A,Two of them,smoke
+TC002,abc,0,$98.00,Invalid quantity,Letters,negative;ui
+TC003,,1,$0.50,N/A,Blank quantity,ui
+LOGIN-BVA-001,-1,5,N/A,Too few,Below the minimum,
+"""
+
+TYPES = {"quantity": "int_or_text", "items": "int", "expected_price": "price"}
+
+
+class CoercionTest(unittest.TestCase):
+
+    def test_converters(self):
+        cases = [
+            (data_source.to_int_or_text, "5", 5),
+            (data_source.to_int_or_text, "-1", -1),
+            (data_source.to_int_or_text, "abc", "abc"),
+            (data_source.to_int_or_text, "", ""),
+            (data_source.to_int, "12", 12),
+            (data_source.to_price, "$2,000.00", Decimal("2000.00")),
+            (data_source.to_price, "98", Decimal("98")),
+            (data_source.to_price, "-$5.25", Decimal("-5.25")),
+        ]
+        for converter, cell, expected in cases:
+            with self.subTest(converter=converter.__name__, cell=cell):
+                value = converter(cell)
+                self.assertEqual(value, expected)
+                self.assertIs(type(value), type(expected))
+
+    def test_bad_cells(self):
+        for converter, cell in [(data_source.to_int, "abc"), (data_source.to_price, "free"),
+                                (data_source.to_price, "")]:
+            with self.subTest(converter=converter.__name__, cell=cell):
+                with self.assertRaises(ValueError):
+                    converter(cell)
+
+
+class LoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = self.write("data.csv", CSV)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop(data_source.IDS_ENV, None)
+        os.environ.pop(data_source.TAGS_ENV, None)
+
+    def write(self, name, text):
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def load(self, **kwargs):
+        return data_source.load(self.path, "tc_id", **dict({"types": TYPES}, **kwargs))
+
+    def ids(self, **kwargs):
+        return [row.id for row in self.load(**kwargs)]
+
+    def test_typed_rows(self):
+        first, second, third, fourth = self.load(description_column="description")
+        self.assertEqual(first, {"tc_id": "TC001", "quantity": 2, "items": 3, "expected_price": Decimal("2000.00"),
+                                 "message": None, "description": "Two of them", "tags": "smoke"})
+        self.assertEqual(second["quantity"], "abc")         # deliberately invalid input stays text
+        self.assertEqual(third["quantity"], "")
+        self.assertIsNone(fourth["expected_price"])         # N/A -> None, never coerced
+        self.assertEqual((first.__name__, first.__doc__, first.tags), ("TC001", "Two of them", {"smoke"}))
+        self.assertEqual(second.tags, {"negative", "ui"})
+        self.assertEqual(fourth.tags, frozenset())
+
+    def test_untyped_columns_stay_text(self):
+        first = self.load(types=None)[0]
+        self.assertEqual((first["quantity"], first["expected_price"], first["message"]), ("2", "$2,000.00", None))
+
+    def test_bad_cell_names_file_line_and_column(self):
+        with self.assertRaises(ValueError) as caught:
+            self.load(types={"quantity": "int"})
+        self.assertIn(f"{self.path}:3: column 'quantity'", str(caught.exception))
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            self.load(types={"quantity": "float"})
+
+    def test_missing_file(self):
+        missing = os.path.join(self.folder.name, "generated.csv")
+        self.assertEqual(data_source.load(missing, "tc_id", optional=True), [])
+        with self.assertRaises(FileNotFoundError):
+            data_source.load(missing, "tc_id")
+
+    def test_id_and_tag_filters(self):
+        cases = [
+            # (TEST_IDS, TEST_TAGS, rows)
+            ("", "", ["TC001", "TC002", "TC003", "LOGIN-BVA-001"]),
+            ("TC002", "", ["TC002"]),
+            ("TC00*, LOGIN-BVA-001", "", ["TC001", "TC002", "TC003", "LOGIN-BVA-001"]),
+            ("tc001", "", []),                              # IDs are case-sensitive
+            ("", "ui", ["TC002", "TC003"]),
+            ("", "smoke,negative", ["TC001", "TC002"]),
+            ("TC00*", "ui", ["TC002", "TC003"]),
+            ("LOGIN*", "smoke", []),
+        ]
+        for ids, tags, expected in cases:
+            with self.subTest(ids=ids, tags=tags):
+                os.environ[data_source.IDS_ENV] = ids
+                os.environ[data_source.TAGS_ENV] = tags
+                self.assertEqual(self.ids(), expected)
+
+    def test_arguments_override_the_environment(self):
+        os.environ[data_source.IDS_ENV] = "TC002"
+        os.environ[data_source.TAGS_ENV] = "smoke"
+        self.assertEqual(self.ids(ids=["TC003"], tags=()), ["TC003"])
+        self.assertEqual(self.ids(ids=(), tags=["ui"]), ["TC002", "TC003"])
+
+    def test_filtered_out_rows_are_not_coerced(self):
+        # TC002's 'abc' would fail an int column, but only TC001 is loaded
+        self.assertEqual(self.ids(types={"quantity": "int"}, ids=["TC001"]), ["TC001"])
+
+    def test_cache_until_the_file_changes(self):
+        with mock.patch.object(data_source, "_parse", wraps=data_source._parse) as parse:
+            first = self.load()
+            first.pop()                                     # callers get their own list
+            self.assertEqual(len(self.load()), 4)
+            self.assertEqual(parse.call_count, 1)
+
+            self.load(ids=["TC001"])                        # other arguments, other entry
+            self.assertEqual(parse.call_count, 2)
+
+            stat = os.stat(self.path)
+            self.write("data.csv", CSV + "TC004,1,1,$1.00,N/A,Added,\n")
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+            self.assertEqual(self.ids()[-1], "TC004")
+            self.assertEqual(parse.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the SQLite test history in harness/history.py, on a temporary database
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import history
+
+
+def result(test_id, status, duration):
+    return {"test_id": test_id, "status": status, "duration": duration}
+
+
+class HistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = os.path.join(self.folder.name, "history.sqlite")
+
+    def record(self, *runs):
+        for records in runs:
+            history.record_run(records, workers=2, path=self.path)
+
+    def test_missing_database(self):
+        self.assertEqual(history.durations(self.path), {})
+        self.assertEqual(history.last_failed(self.path), set())
+        self.assertEqual(history.wait_samples(5, self.path), {})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_durations_average_the_latest_runs(self):
+        self.record(*[[result("a", "passed", seconds), result("b", "passed", 1.0)]
+                      for seconds in (100.0, 2.0, 4.0, 6.0, 8.0, 10.0)])
+        durations = history.durations(self.path)
+        self.assertEqual(durations["a"], 6.0)         # last 5 runs: the 100s run has dropped out
+        self.assertEqual(durations["b"], 1.0)
+        self.assertEqual(history.durations(self.path, window=2), {"a": 9.0, "b": 1.0})
+
+    def test_skipped_runs_do_not_count(self):
+        self.record([result("a", "passed", 4.0)], [result("a", "skipped", 0.0)],
+                    [result("a", "failed", 2.0)], [result("only_skipped", "skipped", 0.0)])
+        self.assertEqual(history.durations(self.path), {"a": 3.0})
+
+    def test_last_failed_looks_at_each_tests_latest_result(self):
+        self.record(
+            [result("fixed", "failed", 1.0), result("broken", "passed", 1.0), result("old", "errors", 1.0)],
+            [result("fixed", "passed", 1.0), result("broken", "failed", 1.0), result("error", "errors", 1.0)],
+        )
+        # "old" was not run since its error, so it still counts as failed
+        self.assertEqual(history.last_failed(self.path), {"broken", "error", "old"})
+
+    def test_wait_samples_keep_the_latest(self):
+        history.record_waits([("login:username", n / 10) for n in range(1, 8)] + [("search:box", 0.5)], self.path)
+        samples = history.wait_samples(3, self.path)
+        self.assertEqual(sorted(samples["login:username"]), [0.5, 0.6, 0.7])
+        self.assertEqual(samples["search:box"], [0.5])
+
+    def test_database_path_from_environment(self):
+        os.environ[history.DB_ENV] = self.path
+        self.addCleanup(os.environ.pop, history.DB_ENV)
+        self.record([result("a", "failed", 3.0)])
+        self.assertEqual(history.durations(), {"a": 3.0})
+        self.assertEqual(history.last_failed(), {"a"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the streaming reporter in harness/reporter.py and its use of the result sink
+Every test must end up with exactly one record per row (or one for the whole test when
+it reports no rows), whether it is timed or not.
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from xml.etree import ElementTree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import reporter, results, runner, timing
+
+
+def sample_suite():
+    """Rows reported with and without timing, and a test without rows (built here, so it isn't collected)"""
+
+    class Rows(unittest.TestCase):
+
+        def test_untimed_row(self):
+            results.report("UntimedRows", "ROW-1", "passed")
+
+        def test_timed_row(self):
+            self.timing = timing.start(self.id(), "ROW-2")
+            self.timing.step("search")
+            results.report("TimedRows", "ROW-2", "passed")
+            timing.finish(self.timing, "passed")
+
+        def test_untimed_failed_row(self):
+            results.report("UntimedRows", "ROW-3", "failed", "wrong count")
+            self.fail("wrong count")
+
+        def test_without_rows(self):
+            pass
+
+    return unittest.TestLoader().loadTestsFromTestCase(Rows)
+
+
+class ReporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        environ = mock.patch.dict(os.environ, {
+            results.RESULTS_DIR_ENV: self.folder.name,
+            results.RUN_ENV: f"reporter-{self._testMethodName}",
+            results.WORKER_ENV: "1",
+        })
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.suite = sample_suite()
+
+    def records(self):
+        results.close()
+        return results.load_run()
+
+    def check(self, records):
+        by_test = {}
+        for record in records:
+            by_test.setdefault(record["test"].rsplit(".", 1)[-1], []).append(
+                (record["suite"], record["test_id"], record["status"]))
+        self.assertEqual(by_test, {
+            "test_untimed_row": [("UntimedRows", "ROW-1", "passed")],
+            "test_timed_row": [("TimedRows", "ROW-2", "passed")],
+            "test_untimed_failed_row": [("UntimedRows", "ROW-3", "failed")],
+            "test_without_rows": [("Rows", "test_without_rows", "passed")],
+        })
+
+    def test_streaming_result_records_every_row_once(self):
+        runner_ = unittest.TextTestRunner(stream=io.StringIO(), resultclass=reporter.StreamingResult)
+        runner_.run(self.suite)
+        self.check(self.records())
+
+    def test_shard_result_records_every_row_once(self):
+        self.suite.run(runner.ShardResult())
+        self.check(self.records())
+
+    def test_timed_row_keeps_its_phases(self):
+        self.suite.run(runner.ShardResult())
+        (timed,) = [record for record in self.records() if record["test_id"] == "ROW-2"]
+        self.assertIn("search", timed["phases"])
+        self.assertIsNotNone(timed["duration"])
+
+    def test_junit_counts_each_row_once(self):
+        self.suite.run(runner.ShardResult())
+        self.records()
+        root = ElementTree.parse(reporter.convert(results.run_dir())).getroot()
+        self.assertEqual((root.get("tests"), root.get("failures")), ("4", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
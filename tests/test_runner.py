@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the sharded runner in harness/runner.py: shard scheduling on made-up test
+references, and shard runs on throwaway suite files
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import results, runner
+
+FIXTURE_LOG_ENV = "RUNNER_TEST_FIXTURE_LOG"
+
+# every class fixture appends a line to the file named by FIXTURE_LOG_ENV
+SUITE_TEMPLATE = """
+import os
+import unittest
+
+
+def log(line):
+    with open(os.environ["{env}"], "a", encoding="utf-8") as f:
+        f.write(line + "\\n")
+
+
+{classes}
+"""
+
+CLASS_TEMPLATE = """
+class {name}(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        log("setup {name}")
+
+    @classmethod
+    def tearDownClass(cls):
+        log("teardown {name}")
+
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        pass
+"""
+
+
+class RunShardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.fixture_log = os.path.join(self.folder.name, "fixtures.log")
+        environ = mock.patch.dict(os.environ, {
+            FIXTURE_LOG_ENV: self.fixture_log,
+            results.RESULTS_DIR_ENV: os.path.join(self.folder.name, "results"),
+            results.RUN_ENV: "runner-test",
+            results.WORKER_ENV: "1",
+        })
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.addCleanup(results.close)
+        self.modules = []
+        self.addCleanup(lambda: [sys.modules.pop(name, None) for name in self.modules])
+
+    def write_suite(self, feature, module, *classes):
+        folder = os.path.join(self.folder.name, "level-2", feature)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{module}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(SUITE_TEMPLATE.format(env=FIXTURE_LOG_ENV, classes="\n".join(
+                CLASS_TEMPLATE.format(name=name) for name in classes)))
+        self.modules.append(module)
+        return path
+
+    def run_shard(self, refs):
+        records = runner.run_shard(1, refs, os.path.join(self.folder.name, "logs"))
+        with open(self.fixture_log, "r", encoding="utf-8") as f:
+            return records, [line.strip() for line in f]
+
+    def test_class_fixtures_run_once_per_shard(self):
+        first = self.write_suite("First", "runner_fixture_first", "FirstA", "FirstB")
+        second = self.write_suite("Second", "runner_fixture_second", "Second")
+        # what failed-first ordering can produce: one file's classes split by another file
+        refs = [
+            runner.TestRef(first, "FirstB", "test_one"),
+            runner.TestRef(first, "FirstB", "test_two"),
+            runner.TestRef(second, "Second", "test_one"),
+            runner.TestRef(second, "Second", "test_two"),
+            runner.TestRef(first, "FirstA", "test_one"),
+            runner.TestRef(first, "FirstA", "test_two"),
+        ]
+        records, fixtures = self.run_shard(refs)
+        self.assertEqual(fixtures, [
+            "setup FirstB", "teardown FirstB",
+            "setup Second", "teardown Second",
+            "setup FirstA", "teardown FirstA",
+        ])
+        self.assertEqual([record["status"] for record in records], ["passed"] * 6)
+
+    def test_shard_order_keeps_classes_whole(self):
+        path = self.write_suite("First", "runner_fixture_order", "OrderA", "OrderB")
+        refs = [runner.TestRef(path, name, method)
+                for name in ("OrderA", "OrderB") for method in ("test_one", "test_two")]
+        failed = {runner.test_id(runner.TestRef(path, "OrderB", "test_two"))}
+        (ordered,) = runner.shard(refs, 1, failed=failed)
+        records, fixtures = self.run_shard(ordered)
+        self.assertEqual(fixtures, ["setup OrderB", "teardown OrderB", "setup OrderA", "teardown OrderA"])
+        self.assertEqual(len(records), 4)
+
+
+def ref(feature, class_name, method, module=None):
+    module = module or feature.lower().replace(" ", "_") + "_level2"
+    return runner.TestRef(os.path.join(runner.PROJECT_ROOT, "level-2", feature, f"{module}.py"), class_name, method)
+
+
+class ShardTest(unittest.TestCase):
+
+    def keys(self, shards):
+        return [[f"{r.class_name}.{r.method}" for r in s] for s in shards]
+
+    def test_longest_first_onto_the_lightest_shard(self):
+        refs = [ref("Search", "Search", f"test_{n}") for n in range(5)]
+        durations = {runner.test_id(r): seconds for r, seconds in zip(refs, [4, 8, 5, 7, 6])}
+        # LPT: 8 -> A, 7 -> B, 6 -> B (7 < 8), 5 -> A (8 < 13), 4 -> A (13 = 13, first wins)
+        shards = runner.shard(refs, 2, durations)
+        self.assertEqual(self.keys(shards), [
+            ["Search.test_0", "Search.test_1", "Search.test_2"],     # discovery order within a shard
+            ["Search.test_3", "Search.test_4"],
+        ])
+        self.assertEqual([runner.estimate(s, durations) for s in shards], [17, 13])
+
+    def test_without_history_every_test_counts_the_same(self):
+        refs = [ref("Search", "Search", f"test_{n}") for n in range(6)]
+        self.assertEqual([len(s) for s in runner.shard(refs, 3)], [2, 2, 2])
+        self.assertEqual(runner.default_duration({}), runner.DEFAULT_DURATION)
+
+    def test_unknown_tests_get_the_median_duration(self):
+        refs = [ref("Search", "Search", f"test_{n}") for n in range(4)]
+        durations = {runner.test_id(refs[0]): 1.0, runner.test_id(refs[1]): 3.0, runner.test_id(refs[2]): 20.0}
+        self.assertEqual(runner.default_duration(durations), 3.0)
+        self.assertEqual(runner.estimate(refs, durations), 1.0 + 3.0 + 20.0 + 3.0)
+
+    def test_isolation_groups_stay_in_one_shard(self):
+        refs = ([ref("Add to cart", "AddToCart", f"test_{n}") for n in range(3)]
+                + [ref("Remove from cart", "RemoveFromCart", f"test_{n}") for n in range(3)]
+                + [ref("Change password", "ChangePassword", f"test_{n}") for n in range(2)]
+                + [ref("Search", "Search", f"test_{n}") for n in range(4)])
+        shards = runner.shard(refs, 4)
+        for feature, group in [("cart", {"AddToCart", "RemoveFromCart"}), ("account", {"ChangePassword"})]:
+            with self.subTest(group=feature):
+                holding = [i for i, s in enumerate(shards) if group & {r.class_name for r in s}]
+                self.assertEqual(len(holding), 1)
+                self.assertEqual(sum(r.class_name in group for r in shards[holding[0]]),
+                                 sum(r.class_name in group for r in refs))
+        self.assertEqual(sorted(r for s in shards for r in s), sorted(refs))
+
+    def test_more_workers_than_units(self):
+        refs = [ref("Add to cart", "AddToCart", "test_0"), ref("Remove from cart", "RemoveFromCart", "test_0")]
+        self.assertEqual(len(runner.shard(refs, 8)), 1)
+        self.assertEqual(runner.shard([], 4), [])
+
+    def test_failed_classes_run_first_and_whole(self):
+        refs = ([ref("Search", "SearchA", f"test_{n}", "search_level2") for n in range(2)]
+                + [ref("Search", "SearchB", f"test_{n}", "search_level2") for n in range(3)]
+                + [ref("Login", "Login", f"test_{n}") for n in range(2)])
+        failed = {runner.test_id(refs[3]), runner.test_id(refs[6])}     # SearchB.test_1, Login.test_1
+        (ordered,) = runner.shard(refs, 1, failed=failed)
+        self.assertEqual(self.keys([ordered]), [[
+            "SearchB.test_0", "SearchB.test_1", "SearchB.test_2",
+            "Login.test_0", "Login.test_1",
+            "SearchA.test_0", "SearchA.test_1",
+        ]])
+        # without failures the shard keeps discovery order
+        self.assertEqual(runner.shard(refs, 1), [refs])
+
+
+if __name__ == "__main__":
+    unittest.main()